@@ -1,2 +1,2 @@
 # Package initializer for Week-7-ai-volume-forecaster
-# Enables importing forecast_system as a module for Week 8 code.
+# Installed as quant_forecast.week7 (see pyproject.toml at the repo root).
@@ -2,10 +2,9 @@
 # Quantitative AI Statistical Forecasting System - Part 1 
 import pandas as pd 
 import numpy as np 
-import matplotlib.pyplot as plt 
 # from statsmodels.seasonal import seasonal_decompose  # Disabled for quick run (Option A)
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score 
-from scipy import stats 
+# matplotlib, scipy and sklearn are imported inside the methods that use 
+# them, so a plain statistical forecast only pays for pandas and numpy 
 import warnings 
 warnings.filterwarnings('ignore') 
  
@@ -16,11 +15,18 @@ class QuantitativeForecaster:
     Focuses on mathematical modeling and statistical inference 
     """ 
      
-    def __init__(self, data_path): 
-        """Initialize with numerical historical data""" 
-        self.df = pd.read_csv(data_path) 
-        self.df['date'] = pd.to_datetime(self.df['date']) 
-        self.df.set_index('date', inplace=True) 
+    def __init__(self, data_path=None, data=None): 
+        """ 
+        Initialize with numerical historical data 
+        data: an already-loaded date-indexed frame to share instead of reading 
+        data_path (held as a shallow copy, so added columns stay local) 
+        """ 
+        if data is not None: 
+            self.df = data.copy(deep=False) 
+        else: 
+            self.df = pd.read_csv(data_path) 
+            self.df['date'] = pd.to_datetime(self.df['date']) 
+            self.df.set_index('date', inplace=True) 
          
         # American flag colors for visualizations 
         self.colors = { 
@@ -37,6 +43,7 @@ class QuantitativeForecaster:
          
     def quantitative_analysis(self): 
         """Perform comprehensive quantitative analysis""" 
+        from scipy import stats 
         print("\n\033[96m🔍 QUANTITATIVE PATTERN ANALYSIS...\033[0m") 
          
         # Calculate statistical moments 
@@ -88,6 +95,7 @@ class QuantitativeForecaster:
      
     def exponential_smoothing(self, alpha=0.3): 
         """Exponential smoothing forecast""" 
+        from sklearn.metrics import mean_absolute_error 
         print(f"\n\033[95m📊 EXPONENTIAL SMOOTHING (α={alpha})\033[0m") 
          
         # Initialize 
@@ -114,6 +122,31 @@ class QuantitativeForecaster:
          
         return next_forecast, mae 
      
+    def backtest_forecasts(self, origins, horizon, window=7, alpha=0.3): 
+        """ 
+        Moving average and exponential smoothing forecasts made at each origin 
+        Both methods forecast flat, so each origin's value fills its row 
+        Returns {method: array of shape (origins, horizon)} 
+        """ 
+        from scipy.signal import lfilter 
+        volume = self.df['volume'].to_numpy(dtype=np.float64) 
+        origins = np.asarray(origins) 
+         
+        # Moving average of the window before each origin via cumulative sums 
+        cumsum = np.concatenate([[0.0], np.cumsum(volume)]) 
+        ma = (cumsum[origins] - cumsum[origins - window]) / window 
+         
+        # Same recursion as exponential_smoothing, run as a linear filter: 
+        # smoothed[i] = alpha * volume[i] + (1 - alpha) * smoothed[i-1] 
+        smoothed, _ = lfilter([alpha], [1.0, alpha - 1.0], volume, 
+                              zi=[(1 - alpha) * volume[0]]) 
+        es = smoothed[origins - 1] 
+         
+        return { 
+            'moving_average': np.repeat(ma[:, None], horizon, axis=1), 
+            'exponential_smoothing': np.repeat(es[:, None], horizon, axis=1) 
+        } 
+     
     def decompose_time_series(self): 
         """Stub decomposition (statsmodels not installed - Option A quick run)""" 
         print("\n\033[92m🔧 DECOMPOSING TIME SERIES (skipped - statsmodels not installed)...\033[0m") 
@@ -125,6 +158,7 @@ class QuantitativeForecaster:
      
     def create_visualizations(self): 
         """Create analysis visualizations""" 
+        import matplotlib.pyplot as plt 
         print("\n\033[94m📊 CREATING VISUALIZATIONS...\033[0m") 
          
         fig, axes = plt.subplots(3, 1, figsize=(12, 10)) 
@@ -0,0 +1,46 @@
+# quant_forecast package (Week 8 folder; Week 7 is quant_forecast.week7)
+# Quantitative AI - Lazy Package Exports
+"""
+Install once from the repo root with `pip install -e .`, then
+`from quant_forecast import EnsembleForecaster`
+
+Names and submodules are resolved on first attribute access, so importing
+the package costs nothing and each forecast only imports what it runs
+"""
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'QuantitativeForecaster': 'week7.forecast_system',
+    'QuantitativeMLForecaster': 'ml_forecast',
+    'EnsembleForecaster': 'ensemble_forecast',
+    'EnsembleWeights': 'ensemble_weights',
+    'ForecastResult': 'forecast_result',
+    'ForecastService': 'forecast_service',
+    'Hierarchy': 'reconciliation',
+    'reconcile': 'reconciliation',
+    'ScenarioEngine': 'scenario_engine',
+    'ModelRegistry': 'model_registry',
+    'Instrumentation': 'instrumentation',
+    'load_volume_data': 'shared_data',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+    else:
+        try:
+            value = importlib.import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as error:
+            if error.name != f'{__name__}.{name}':
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
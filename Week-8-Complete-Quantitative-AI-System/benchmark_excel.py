@@ -0,0 +1,70 @@
+# benchmark_excel.py
+# Wall time and peak memory of the Excel export backends on a panel-scale forecast
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from quant_forecast.ensemble_forecast import EnsembleForecaster
+from quant_forecast.instrumentation import peak_rss_mb
+from quant_forecast.shared_data import DEFAULT_DATA
+
+BACKENDS = ('openpyxl', 'streaming', 'xlsxwriter')
+
+
+def synthetic_panel(rows, horizon=390, seed=0):
+    """Forecast frame shaped like forecast_future's, stacked for many series"""
+    rng = np.random.default_rng(seed)
+    n_series = -(-rows // horizon)
+    dates = pd.date_range('2025-01-01', periods=horizon, freq='D')
+    base = rng.uniform(500, 1500, size=(n_series, 1)) + 50 * np.sin(np.arange(horizon) / 7)
+    frame = pd.DataFrame({
+        'series': np.repeat([f'S{i:05d}' for i in range(n_series)], horizon),
+        'date': np.tile(dates, n_series),
+        'linear': (base + rng.normal(0, 20, base.shape)).ravel(),
+        'rf': (base + rng.normal(0, 20, base.shape)).ravel(),
+        'xgb': (base + rng.normal(0, 20, base.shape)).ravel(),
+        'weighted_ensemble': base.ravel()
+    }).iloc[:rows]
+    frame['lower_bound'] = frame['weighted_ensemble'] - 80
+    frame['upper_bound'] = frame['weighted_ensemble'] + 80
+    return frame
+
+
+def run_backend(backend, rows, path):
+    """Export in a fresh process so peak RSS belongs to this backend alone"""
+    forecast_df = synthetic_panel(rows)
+    ensemble = EnsembleForecaster(DEFAULT_DATA)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    ensemble.create_excel_workbook(forecast_df, backend=backend, path=path)
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_rss_mb() - baseline, os.path.getsize(path) / 1024**2
+
+
+def main(rows=1_000_000, backends=BACKENDS):
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    📊 EXCEL EXPORT BENCHMARK")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+    print(f"\n{rows:,} daily rows")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            path = os.path.join(tmp, f'{backend}.xlsx')
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                results[backend] = pool.submit(run_backend, backend, rows, path).result()
+
+    print(f"\n{'Backend':<12}{'Time (s)':>10}{'Rows/s':>12}{'Peak RSS +MB':>14}{'File MB':>10}")
+    for backend, (elapsed, rss, size) in results.items():
+        print(f"{backend:<12}{elapsed:>10.1f}{rows / elapsed:>12,.0f}{rss:>14.0f}{size:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Excel export backends")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    args = parser.parse_args()
+    main(args.rows, args.backends)
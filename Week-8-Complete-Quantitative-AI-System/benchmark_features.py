@@ -0,0 +1,96 @@
+# benchmark_features.py
+# Compare the old pandas feature frame with the compact float32 feature matrix
+import time
+import numpy as np
+import pandas as pd
+from quant_forecast.ml_forecast import QuantitativeMLForecaster
+from quant_forecast.feature_builder import FeatureBuilder
+from quant_forecast.training_scheduler import TrainingScheduler
+
+
+def synthetic_volumes(years=10, seed=42):
+    """Daily volume series with the Week 7 trend/seasonal/weekly/monthly pattern"""
+    dates = pd.date_range('2014-01-01', periods=int(365.25 * years), freq='D')
+    n_days = len(dates)
+    rng = np.random.default_rng(seed)
+    volume = (np.linspace(1000, 2500, n_days)
+              + 200 * np.sin(2 * np.pi * np.arange(n_days) / 365)
+              + np.where(dates.dayofweek < 5, 150, 50)
+              + np.where(dates.day > 25, 100, 0)
+              + rng.normal(0, 50, n_days))
+    return pd.DataFrame({'volume': np.maximum(volume, 0).round()}, index=dates)
+
+
+def legacy_feature_frame(data, window=30):
+    """The previous engineer_quantitative_features: float64 columns added one by one"""
+    df = data.copy()
+    for i in range(1, window + 1):
+        df[f'lag_{i}'] = df['volume'].shift(i)
+    df['rolling_mean_7'] = df['volume'].rolling(7).mean()
+    df['rolling_mean_30'] = df['volume'].rolling(30).mean()
+    df['rolling_std_7'] = df['volume'].rolling(7).std()
+    df['rolling_std_30'] = df['volume'].rolling(30).std()
+    df['rolling_min_7'] = df['volume'].rolling(7).min()
+    df['rolling_max_7'] = df['volume'].rolling(7).max()
+    df['log_volume'] = np.log1p(df['volume'])
+    df['sqrt_volume'] = np.sqrt(df['volume'])
+    df['volume_squared'] = df['volume'] ** 2
+    df['day_of_week'] = df.index.dayofweek
+    df['day_of_month'] = df.index.day
+    df['month'] = df.index.month
+    df['quarter'] = df.index.quarter
+    df['year'] = df.index.year
+    df['day_sin'] = np.sin(2 * np.pi * df.index.dayofyear / 365)
+    df['day_cos'] = np.cos(2 * np.pi * df.index.dayofyear / 365)
+    df['is_weekend'] = (df['day_of_week'] >= 5).astype(int)
+    df['is_month_end'] = (df.index.day > 25).astype(int)
+    df['time_index'] = range(len(df))
+    return df.dropna()
+
+
+def train_seconds(forecaster, X, y, test_size=90):
+    """Sequential wall time to fit all three models"""
+    scheduler = TrainingScheduler(parallel=False)
+    split = len(y) - test_size
+    scheduler.run(forecaster.model_specs(), X[:split], y[:split], X[split:], y[split:])
+    return scheduler.timings
+
+
+def main():
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    ⏱️  FEATURE MATRIX BENCHMARK (10 years daily)")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+
+    data = synthetic_volumes(years=10)
+    forecaster = QuantitativeMLForecaster(data)
+
+    # Before: pandas frame with target-derived columns
+    start = time.perf_counter()
+    legacy = legacy_feature_frame(data)
+    legacy_build = time.perf_counter() - start
+    feature_cols = [col for col in legacy.columns if col != 'volume']
+    legacy_bytes = legacy.memory_usage(deep=True).sum()
+    legacy_times = train_seconds(forecaster, legacy[feature_cols], legacy['volume'])
+
+    # After: single contiguous float32 array without leakage columns
+    start = time.perf_counter()
+    matrix = FeatureBuilder().build(data['volume'])
+    matrix_build = time.perf_counter() - start
+    matrix_times = train_seconds(forecaster, matrix.values, matrix.target)
+
+    rows = [
+        ('Rows x features', f"{len(legacy)} x {len(feature_cols)}",
+         f"{matrix.shape[0]} x {matrix.shape[1]}"),
+        ('Memory footprint', f"{legacy_bytes / 1024**2:.2f} MB", f"{matrix.nbytes / 1024**2:.2f} MB"),
+        ('Feature build', f"{legacy_build:.3f}s", f"{matrix_build:.3f}s")
+    ]
+    for name in ('linear', 'rf', 'xgb', 'total'):
+        rows.append((f"Train {name}", f"{legacy_times[name]:.2f}s", f"{matrix_times[name]:.2f}s"))
+
+    print(f"\n{'':<20}{'Before':>16}{'After':>16}")
+    for label, before, after in rows:
+        print(f"{label:<20}{before:>16}{after:>16}")
+
+
+if __name__ == "__main__":
+    main()
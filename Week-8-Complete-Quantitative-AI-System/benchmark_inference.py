@@ -0,0 +1,47 @@
+# benchmark_inference.py
+# Per-row latency of model.predict versus the compiled tree arrays
+import time
+import numpy as np
+from quant_forecast.ml_forecast import QuantitativeMLForecaster
+from quant_forecast.shared_data import DEFAULT_DATA, load_volume_data
+
+
+def per_row_us(predict, X, repeats):
+    """Microseconds per row when predict is called repeatedly on X"""
+    predict(X)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(X)
+    return (time.perf_counter() - start) / (repeats * len(X)) * 1e6
+
+
+def main():
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    ⚡ TREE INFERENCE BENCHMARK")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+
+    data = load_volume_data(DEFAULT_DATA)
+    forecaster = QuantitativeMLForecaster(data)
+    forecaster.train_models()
+    compiled = forecaster.compiled_models()
+    X = forecaster.feature_matrix.values
+
+    print(f"\n{'Model':<8}{'Rows':>7}{'predict (µs/row)':>20}{'compiled (µs/row)':>20}{'speed-up':>10}")
+    for rows, repeats in ((1, 200), (64, 50), (len(X), 5)):
+        batch = X[-rows:]
+        for name, model in forecaster.models.items():
+            assert np.array_equal(model.predict(batch), compiled[name].predict(batch))
+            before = per_row_us(model.predict, batch, repeats)
+            after = per_row_us(compiled[name].predict, batch, repeats)
+            print(f"{name:<8}{rows:>7}{before:>20.2f}{after:>20.2f}{before / after:>9.1f}x")
+
+    # The recursive 13-month forecast end to end
+    observed = len(data)
+    for label, flag in (('predict', False), ('compiled', True)):
+        start = time.perf_counter()
+        forecaster.recursive_forecast([observed], 13 * 30, compiled=flag)
+        print(f"\n390-step recursive forecast ({label}): {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
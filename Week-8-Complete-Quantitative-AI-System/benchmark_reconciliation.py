@@ -0,0 +1,86 @@
+# benchmark_reconciliation.py
+# Sparse hierarchical reconciliation on a synthetic store/region/total panel
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from quant_forecast.reconciliation import Hierarchy, reconcile, METHODS
+
+
+def synthetic_hierarchy(n_regions, stores_per_region, horizon, history=90, seed=0):
+    """
+    Truth, noisy independent base forecasts for every node and in-sample
+    residuals; aggregate forecasts are noisier in absolute terms but not
+    the sum of the store forecasts
+    """
+    rng = np.random.default_rng(seed)
+    n_bottom = n_regions * stores_per_region
+    keys = pd.DataFrame({'region': [f'R{i // stores_per_region:03d}' for i in range(n_bottom)]},
+                        index=[f'S{i:05d}' for i in range(n_bottom)])
+    hierarchy = Hierarchy(keys, levels=['region'])
+
+    level = rng.uniform(50, 150, n_bottom)
+    season = 1 + 0.2 * np.sin(2 * np.pi * np.arange(horizon) / 7)
+    truth = hierarchy.S @ (level[:, None] * season)
+
+    # Errors share a region-level component, so bottom errors are correlated
+    n = len(hierarchy.labels)
+    scale = np.sqrt(np.asarray(hierarchy.S.sum(axis=1)).ravel()) * 8
+    region = np.r_[np.zeros(hierarchy.n_aggregate, dtype=np.int64),
+                   pd.factorize(keys['region'], sort=True)[0]]
+
+    def errors(T):
+        common = rng.normal(size=(T, n_regions))[:, region]
+        return (0.6 * common + 0.8 * rng.normal(size=(T, n))) * scale
+
+    base = truth + errors(horizon).T
+    residuals = errors(history)
+    return hierarchy, truth, base, residuals
+
+
+def dense_mint(hierarchy, base, residuals):
+    """Textbook MinT-shrink with explicit n x n matrices (small problems only)"""
+    from quant_forecast.reconciliation import shrinkage_covariance
+    variances, E, lam = shrinkage_covariance(residuals)
+    W = lam * np.diag(variances) + (1 - lam) * E.T @ E / len(E)
+    S = hierarchy.S.toarray()
+    Winv = np.linalg.inv(W)
+    G = np.linalg.solve(S.T @ Winv @ S, S.T @ Winv)
+    return S @ G @ base
+
+
+def main(n_regions=60, stores_per_region=50, horizon=390):
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    🧮 HIERARCHICAL RECONCILIATION BENCHMARK")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+
+    # Sparse solve agrees with the dense formula on a small hierarchy
+    small = synthetic_hierarchy(4, 5, 30, seed=1)
+    gap = np.abs(reconcile(small[0], small[2], 'mint_shrink', small[3]) - dense_mint(small[0], small[2], small[3])).max()
+    print(f"\nSparse vs dense MinT-shrink (25 nodes): max difference {gap:.2e}")
+
+    hierarchy, truth, base, residuals = synthetic_hierarchy(n_regions, stores_per_region, horizon)
+    print(f"\n{len(hierarchy.labels):,} nodes ({hierarchy.n_bottom:,} bottom), horizon {horizon}, "
+          f"S has {hierarchy.S.nnz:,} non-zeros")
+    print(f"Base forecasts: RMSE {np.sqrt(np.mean((base - truth) ** 2)):.2f}, "
+          f"total RMSE {np.sqrt(np.mean((base[0] - truth[0]) ** 2)):.2f}, "
+          f"incoherence {hierarchy.incoherence(base):,.1f}")
+
+    print(f"\n{'Method':<14}{'Time (s)':>10}{'RMSE':>10}{'Total RMSE':>12}{'Incoherence':>14}")
+    for method in METHODS:
+        start = time.perf_counter()
+        reconciled = reconcile(hierarchy, base, method, residuals)
+        elapsed = time.perf_counter() - start
+        rmse = np.sqrt(np.mean((reconciled - truth) ** 2))
+        total_rmse = np.sqrt(np.mean((reconciled[0] - truth[0]) ** 2))
+        print(f"{method:<14}{elapsed:>10.3f}{rmse:>10.2f}{total_rmse:>12.2f}"
+              f"{hierarchy.incoherence(reconciled):>14.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hierarchical reconciliation")
+    parser.add_argument('--regions', type=int, default=60)
+    parser.add_argument('--stores', type=int, default=50, help="stores per region")
+    parser.add_argument('--horizon', type=int, default=390)
+    args = parser.parse_args()
+    main(args.regions, args.stores, args.horizon)
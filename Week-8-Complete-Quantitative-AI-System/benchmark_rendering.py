@@ -0,0 +1,50 @@
+# benchmark_rendering.py
+# Charts per second for per-series forecast reports: serial vs process pool, with and without LTTB
+import argparse
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from quant_forecast.benchmark_excel import synthetic_panel
+from quant_forecast.report_rendering import render_series_reports
+
+
+def synthetic_history(n_series, days=3650, seed=1):
+    """Ten years of daily history per series (long enough for LTTB to matter)"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end='2024-12-31', periods=days, freq='D')
+    level = rng.uniform(500, 1500, size=(n_series, 1))
+    volume = level + 50 * np.sin(np.arange(days) / 7) + rng.normal(0, 40, (n_series, days))
+    return pd.DataFrame({
+        'series': np.repeat([f'S{i:05d}' for i in range(n_series)], days),
+        'date': np.tile(dates, n_series),
+        'volume': volume.ravel()
+    })
+
+
+def main(n_series=24, history_days=3650):
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    🖼️  REPORT RENDERING BENCHMARK")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+    print(f"\n{n_series} series, {history_days} history days + 390 forecast days each")
+
+    panel = synthetic_panel(n_series * 390)
+    history = synthetic_history(n_series, history_days)
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, workers, max_points in (('serial, full resolution', 1, None),
+                                           ('serial, LTTB 500 points', 1, 500),
+                                           (f'{cores} workers, LTTB 500 points', cores, 500)):
+            print(f"\n{label}:")
+            render_series_reports(panel, os.path.join(tmp, label.replace(' ', '_')),
+                                  history_df=history, history_days=history_days,
+                                  n_workers=workers, max_points=max_points)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark per-series report rendering")
+    parser.add_argument('--series', type=int, default=24)
+    parser.add_argument('--history-days', type=int, default=3650)
+    args = parser.parse_args()
+    main(args.series, args.history_days)
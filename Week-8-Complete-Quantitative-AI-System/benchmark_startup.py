@@ -0,0 +1,74 @@
+# benchmark_startup.py
+# Time-to-first-forecast and import cost (python -X importtime) of the forecasting package
+import argparse
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+
+DATA = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Week-7-ai-volume-forecaster',
+                                    'data', 'historical_volumes.csv'))
+HEAVY = ['pandas', 'scipy', 'sklearn', 'xgboost', 'joblib', 'matplotlib', 'openpyxl']
+
+SCENARIOS = {
+    'statistical': ("from quant_forecast import QuantitativeForecaster\n"
+                    "QuantitativeForecaster({data!r}).moving_average_forecast()"),
+    'ensemble': ("from quant_forecast import EnsembleForecaster\n"
+                 "EnsembleForecaster({data!r}, registry_path={registry!r}).create_ensemble_forecast()"),
+}
+
+
+def parse_importtime(stderr):
+    """Total import time and the time spent in each heavy package's modules, in ms"""
+    total, heavy = 0.0, {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        total += int(self_us)
+        package = name.strip().split('.')[0]
+        if package in HEAVY:
+            heavy[package] = heavy.get(package, 0.0) + int(self_us) / 1000
+    return total / 1000, heavy
+
+
+def run(code, repeats):
+    """Median wall time, import time and heavy package costs over fresh interpreters"""
+    walls, imports, heavy = [], [], {}
+    for _ in range(repeats):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.splitlines()[-1])
+        total, heavy = parse_importtime(proc.stderr)
+        imports.append(total)
+    return np.median(walls), np.median(imports), heavy
+
+
+def main(scenarios, repeats=5, registry='model_registry'):
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    ⏱️  TIME-TO-FIRST-FORECAST BENCHMARK")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+
+    for name in scenarios:
+        code = SCENARIOS[name].format(data=DATA, registry=registry)
+        if name == 'ensemble':
+            # Fit and register the models once so every timed run loads them
+            run(code, 1)
+        wall, imports, heavy = run(code, repeats)
+        print(f"\n{name}: first forecast {wall:.2f}s, imports {imports:,.0f} ms")
+        for package in HEAVY:
+            loaded = f"{heavy[package]:>8,.0f} ms" if package in heavy else "   not imported"
+            print(f"  {package:<12}{loaded}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark package startup")
+    parser.add_argument('scenarios', nargs='*', help=f"any of {list(SCENARIOS)} (default: all)")
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--registry', default='model_registry')
+    args = parser.parse_args()
+    main(args.scenarios or list(SCENARIOS), args.repeats, args.registry)
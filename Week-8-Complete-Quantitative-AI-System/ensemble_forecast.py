@@ -2,22 +2,39 @@
 # Ensemble Forecasting System 
 import pandas as pd 
 import numpy as np 
-import matplotlib.pyplot as plt 
-import sys
-import os
+import argparse 
+import json 
+from functools import partial 
 
-# Add parent directory to path for cross-week imports
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-from week7_ai_volume_forecaster.forecast_system import QuantitativeForecaster 
-from ml_forecast import QuantitativeMLForecaster 
-import openpyxl 
-from openpyxl import Workbook 
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side 
-from openpyxl.chart import LineChart, Reference 
-from openpyxl.utils.dataframe import dataframe_to_rows 
+# Forecasting path only; Excel (openpyxl), charts (matplotlib) and 
+# reconciliation (scipy.sparse) are imported by the methods that use them 
+from quant_forecast.week7.forecast_system import QuantitativeForecaster 
+from quant_forecast.ml_forecast import QuantitativeMLForecaster 
+from quant_forecast.model_registry import ModelRegistry 
+from quant_forecast.ensemble_weights import EnsembleWeights, DEFAULT_HORIZON_BUCKETS 
+from quant_forecast.execution_graph import ExecutionGraph 
+from quant_forecast.hyperparameter_search import data_fingerprint 
+from quant_forecast.instrumentation import Instrumentation, instrumented 
+from quant_forecast.shared_data import DEFAULT_DATA, load_volume_data, shared_view 
+from quant_forecast.forecast_result import ForecastResult 
+ 
+# Component forecasters in weight order, with their workbook labels 
+COMPONENTS = { 
+    'moving_average': 'Moving Average', 
+    'exponential_smoothing': 'Exponential Smoothing', 
+    'linear_regression': 'Linear Regression', 
+    'random_forest': 'Random Forest', 
+    'xgboost': 'XGBoost' 
+} 
+ 
+# Ensemble component name -> column of the ML forecaster 
+ML_COMPONENTS = {'linear_regression': 'linear', 'random_forest': 'rf', 'xgboost': 'xgb'} 
+ 
+ 
+def run_statistical_method(forecaster, method, **params): 
+    """Run one statistical forecaster method (process pool entry point)""" 
+    forecast, _ = getattr(forecaster, method)(**params) 
+    return forecast 
  
 class EnsembleForecaster: 
     """ 
@@ -25,66 +42,215 @@ class EnsembleForecaster:
     Implements ensemble concepts from Chapter 18 
     """ 
      
-    def __init__(self, data_path): 
+    def __init__(self, data_path=None, registry_path='model_registry', instrumentation=None, 
+                 horizon_weights=True, n_workers=None, data=None): 
         """Initialize ensemble system""" 
         # American flag themed output 
         print("\033[91m" + "="*70)  # Red 
         print("\033[97m" + "       🇺🇸 ENSEMBLE AI FORECASTING SYSTEM 🇺🇸")  # White 
         print("\033[94m" + "="*70 + "\033[0m")  # Blue 
          
-        # Load data 
-        self.data = pd.read_csv(data_path, index_col='date', parse_dates=True) 
+        self.instrumentation = instrumentation or Instrumentation() 
+         
+        # Load data once (or take an already-loaded frame); components get 
+        # copy-on-write views of it rather than their own parsed copies 
+        self.instrumentation.memory_checkpoint('before_load') 
+        self.data = load_volume_data(data_path) if data is None else data 
+        self.instrumentation.memory_checkpoint('after_load') 
          
         # Initialize component forecasters 
-        self.stat_forecaster = QuantitativeForecaster(data_path) 
-        self.ml_forecaster = QuantitativeMLForecaster(self.data) 
-         
-        # Ensemble weights (can be optimized) 
-        self.weights = { 
-            'moving_average': 0.15, 
-            'exponential_smoothing': 0.15, 
-            'linear_regression': 0.20, 
-            'random_forest': 0.25, 
-            'xgboost': 0.25 
+        self.stat_forecaster = QuantitativeForecaster(data=shared_view(self.data)) 
+        self.ml_forecaster = QuantitativeMLForecaster(shared_view(self.data), 
+                                                      instrumentation=self.instrumentation) 
+        self.registry = ModelRegistry(registry_path) if registry_path else None 
+         
+        # Ensemble weights, fitted on backtest predictions by fit_weights 
+        buckets = DEFAULT_HORIZON_BUCKETS if horizon_weights else None 
+        self.weight_model = EnsembleWeights(COMPONENTS, horizon_buckets=buckets) 
+        self.weights = None 
+         
+        # Component execution graph (outputs cached by input fingerprint) 
+        self.graph = self.build_graph(n_workers) 
+         
+    def build_graph(self, n_workers=None): 
+        """ 
+        Component graph: the statistical and ML branches are independent, 
+        so they run concurrently and only join to fit weights and combine 
+        """ 
+        graph = ExecutionGraph(n_workers=n_workers, instrumentation=self.instrumentation) 
+        stat_data = lambda: data_fingerprint(self.stat_forecaster.df['volume'].to_numpy()) 
+         
+        # Pure-Python statistical methods go to the process pool 
+        graph.add('moving_average', 
+                  partial(run_statistical_method, self.stat_forecaster, 'moving_average_forecast', window=7), 
+                  executor='process', fingerprint=lambda: (stat_data(), 7)) 
+        graph.add('exponential_smoothing', 
+                  partial(run_statistical_method, self.stat_forecaster, 'exponential_smoothing', alpha=0.3), 
+                  executor='process', fingerprint=lambda: (stat_data(), 0.3)) 
+         
+        # Tree libraries release the GIL, and the fitted models stay in 
+        # self.ml_forecaster, so the ML branch runs on threads 
+        graph.add('ml_models', self._ml_models_node, fingerprint=self._ml_fingerprint) 
+        graph.add('backtest', self._backtest_node, deps=['ml_models']) 
+        graph.add('ml_forecast', self._ml_forecast_node, deps=['backtest']) 
+        graph.add('weights', self._weights_node, deps=['backtest'], fingerprint=stat_data) 
+        graph.add('ensemble', self._ensemble_node, 
+                  deps=['moving_average', 'exponential_smoothing', 'ml_forecast', 'weights']) 
+        return graph 
+     
+    def _ml_fingerprint(self): 
+        """Inputs of the ML models: data, feature config and hyperparameters""" 
+        if self.registry is not None: 
+            return self.registry.fingerprint(self.ml_forecaster, 90) 
+        settings = json.dumps([self.ml_forecaster.feature_config, self.ml_forecaster.model_params], 
+                              sort_keys=True, default=str) 
+        return (data_fingerprint(self.ml_forecaster.data['volume'].to_numpy()), settings) 
+     
+    def _ml_models_node(self): 
+        """Train ML models (or reuse registered ones)""" 
+        if self.registry is None: 
+            self.ml_forecaster.train_models() 
+            return False 
+        loaded = self.ml_forecaster.load_or_train(self.registry) 
+        if not loaded: 
+            self.registry.save(self.ml_forecaster, self.ml_forecaster.test_size) 
+        return loaded 
+     
+    def _backtest_node(self, ml_models): 
+        """Recursive backtest shared by the intervals and the weight fit""" 
+        with self.instrumentation.stage('backtest'): 
+            return self.ml_forecaster.backtest_predictions() 
+     
+    def _ml_forecast_node(self, backtest): 
+        return self.ml_forecaster.forecast_future() 
+     
+    def _weights_node(self, backtest): 
+        return self.fit_weights() 
+     
+    def _ensemble_node(self, moving_average, exponential_smoothing, ml_forecast, weights): 
+        """ 
+        Combine forecasts with (horizon-dependent) weights; the statistical 
+        methods forecast flat, so their next-period value fills the horizon 
+        The weights are fitted on backtests of weight_model.horizon steps; 
+        later steps reuse the last bucket's weights, an extrapolation the 
+        backtest never checked (a flat MA/ES level a year out included) 
+        """ 
+        periods = len(ml_forecast) 
+        components = { 
+            'moving_average': np.full(periods, moving_average), 
+            'exponential_smoothing': np.full(periods, exponential_smoothing) 
         } 
-         
+        for name, column in ML_COMPONENTS.items(): 
+            components[name] = ml_forecast[column].to_numpy() 
+        ensemble_daily = ml_forecast.copy() 
+        ensemble_daily['weighted_ensemble'] = self.weight_model.combine(components) 
+         
+        # Keep the conformal bounds centred on the weighted forecast 
+        shift = ensemble_daily['weighted_ensemble'] - ml_forecast['ensemble'] 
+        ensemble_daily['lower_bound'] += shift 
+        ensemble_daily['upper_bound'] += shift 
+        return ensemble_daily 
+     
+    @instrumented('create_ensemble_forecast') 
     def create_ensemble_forecast(self): 
-        """Generate ensemble forecast combining all methods""" 
+        """Generate ensemble forecast combining all methods (as a ForecastResult)""" 
         print("\n\033[93m🎯 CREATING ENSEMBLE FORECAST...\033[0m") 
          
-        # Get statistical forecasts 
-        ma_forecast, _ = self.stat_forecaster.moving_average_forecast() 
-        exp_forecast, _ = self.stat_forecaster.exponential_smoothing() 
-         
-        # Train ML models and get forecasts 
-        self.ml_forecaster.train_models() 
-        ml_forecasts = self.ml_forecaster.forecast_future() 
-         
-        # Combine forecasts with weights 
-        ensemble_daily = ml_forecasts.copy() 
-        ensemble_daily['weighted_ensemble'] = ( 
-            self.weights['linear_regression'] * ml_forecasts['linear'] + 
-            self.weights['random_forest'] * ml_forecasts['rf'] + 
-            self.weights['xgboost'] * ml_forecasts['xgb'] 
-        ) 
-         
-        # Add statistical adjustments for first 30 days 
-        stat_adjustment = (self.weights['moving_average'] * ma_forecast +  
-                          self.weights['exponential_smoothing'] * exp_forecast) 
-        ensemble_daily.loc[:30, 'weighted_ensemble'] = ( 
-            0.7 * ensemble_daily.loc[:30, 'weighted_ensemble'] + 
-            0.3 * stat_adjustment 
-        ) 
+        # Run the component graph; unchanged branches come from its cache 
+        results = self.graph.run() 
+        # Consumers share one result object and its memoized rollups 
+        forecast = ForecastResult(results['ensemble']) 
+        self.weights = results['weights'] 
          
         print(f"✓ Created weighted ensemble forecast") 
-        print(f"✓ Weights: {self.weights}") 
+        print(f"✓ Weights: { {name: round(w, 3) for name, w in self.weights.items()} }") 
+        if len(forecast) > self.weight_model.horizon: 
+            print(f"⚠️  Weights backtested to {self.weight_model.horizon} days; " 
+                  f"days {self.weight_model.horizon + 1}-{len(forecast)} reuse the last bucket") 
+        self.graph.print_timings() 
          
-        return ensemble_daily 
+        return forecast 
+     
+    @instrumented('reconcile_panel') 
+    def reconcile_panel(self, panel_df, hierarchy, method='mint_shrink', residuals=None): 
+        """ 
+        Optional final stage: make a stacked panel of independently produced 
+        node forecasts (total, aggregates and bottom series in its 'series' 
+        column) coherent with the hierarchy in one sparse solve 
+        residuals: DataFrame of in-sample errors with one column per node 
+        """ 
+        from quant_forecast.reconciliation import reconcile 
+        print(f"\n\033[95m🧮 RECONCILING {len(hierarchy.labels)} NODES ({method})...\033[0m") 
+         
+        base, dates = hierarchy.stack(panel_df) 
+        if residuals is not None: 
+            residuals = residuals[hierarchy.labels].to_numpy(dtype=np.float64) 
+        before = hierarchy.incoherence(base) 
+        reconciled = reconcile(hierarchy, base, method, residuals) 
+         
+        # Long format again, bounds moved by the same adjustment as the forecast 
+        adjustment = pd.DataFrame({ 
+            'series': np.repeat(hierarchy.labels, len(dates)), 
+            'date': np.tile(dates, len(hierarchy.labels)), 
+            'adjustment': (reconciled - base).ravel() 
+        }) 
+        result = panel_df.merge(adjustment, on=['series', 'date'], how='left') 
+        for column in ('weighted_ensemble', 'lower_bound', 'upper_bound'): 
+            if column in result.columns: 
+                result[column] = result[column] + result['adjustment'] 
+        result = result.drop(columns='adjustment') 
+         
+        print(f"✓ Max incoherence {before:,.1f} → {hierarchy.incoherence(reconciled):.2e}") 
+        return result 
      
-    def create_excel_workbook(self, forecast_df): 
-        """Create professional Excel deliverable""" 
+    @instrumented('fit_weights') 
+    def fit_weights(self): 
+        """ 
+        Fit non-negative, sum-to-one ensemble weights on stacked backtest 
+        predictions of every component from the ML test window origins 
+        """ 
+        origins, ml_predictions, actual = self.ml_forecaster.backtest_predictions() 
+        predictions = self.stat_forecaster.backtest_forecasts(origins, actual.shape[1]) 
+        for name, column in ML_COMPONENTS.items(): 
+            predictions[name] = ml_predictions[column] 
+         
+        self.weight_model.fit(predictions, actual) 
+        self.weights = self.weight_model.as_dict() 
+        self.weight_model.print_weights() 
+        return self.weights 
+     
+    @instrumented('create_excel_workbook') 
+    def create_excel_workbook(self, forecast, backend='openpyxl', path='volume_forecast_13months.xlsx'): 
+        """ 
+        Create professional Excel deliverable 
+        backend: 'openpyxl' (styled in-memory workbook), 'streaming' (openpyxl 
+        write-only) or 'xlsxwriter' (constant memory) for panel-scale exports 
+        """ 
+        from openpyxl import Workbook 
+        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side 
+        from openpyxl.chart import LineChart, Reference 
+        from quant_forecast.excel_export import (daily_columns, daily_rows, monthly_rows, 
+                                                 write_openpyxl_streaming, write_xlsxwriter) 
         print("\n\033[94m📊 CREATING EXCEL WORKBOOK...\033[0m") 
          
+        # Monthly aggregation (memoized on the forecast result; a stacked 
+        # panel is totalled across series for the dashboard) 
+        forecast_df = forecast.frame if isinstance(forecast, ForecastResult) else forecast 
+        if 'series' in forecast_df.columns: 
+            totals = forecast_df.groupby('date', sort=True)[['weighted_ensemble', 'lower_bound', 'upper_bound']].sum() 
+            forecast = ForecastResult(totals.reset_index()) 
+        monthly = ForecastResult.wrap(forecast).monthly(['weighted_ensemble', 'lower_bound', 'upper_bound']) 
+        models_data = self.performance_rows() 
+         
+        if backend == 'streaming': 
+            wb = write_openpyxl_streaming(path, forecast_df, monthly, models_data) 
+            print(f"✓ Excel workbook streamed (openpyxl write-only): {path}") 
+            return wb 
+        if backend == 'xlsxwriter': 
+            wb = write_xlsxwriter(path, forecast_df, monthly, models_data) 
+            print(f"✓ Excel workbook streamed (xlsxwriter constant memory): {path}") 
+            return wb 
+         
         # Create workbook 
         wb = Workbook() 
          
@@ -118,13 +284,6 @@ class EnsembleForecaster:
         ws1['B4'] = "13-Month Forecast Summary" 
         ws1['B4'].font = Font(bold=True, size=14) 
          
-        # Monthly aggregation 
-        monthly = forecast_df.set_index('date').resample('M').agg({ 
-            'weighted_ensemble': 'sum', 
-            'lower_bound': 'sum', 
-            'upper_bound': 'sum' 
-        }) 
-         
         # Headers with patriotic styling 
         headers = ['Month', 'Forecast', 'Lower Bound', 'Upper Bound', 'Confidence'] 
         for col, header in enumerate(headers, start=2): 
@@ -136,12 +295,9 @@ class EnsembleForecaster:
             cell.border = thin_border 
          
         # Data rows with alternating red/white stripes 
-        for row_idx, (index, row) in enumerate(monthly.iterrows(), start=7): 
-            ws1.cell(row=row_idx, column=2).value = index.strftime('%b %Y') 
-            ws1.cell(row=row_idx, column=3).value = round(row['weighted_ensemble']) 
-            ws1.cell(row=row_idx, column=4).value = round(row['lower_bound']) 
-            ws1.cell(row=row_idx, column=5).value = round(row['upper_bound']) 
-            ws1.cell(row=row_idx, column=6).value = "95%" 
+        for row_idx, row in enumerate(monthly_rows(monthly), start=7): 
+            for col_idx, value in enumerate(row, start=2): 
+                ws1.cell(row=row_idx, column=col_idx).value = value 
              
             # Alternating row colors 
             fill = red_fill if row_idx % 2 == 0 else white_fill 
@@ -173,7 +329,8 @@ class EnsembleForecaster:
         ws2 = wb.create_sheet("📈 Daily Forecasts") 
          
         # Add daily forecast data 
-        daily_headers = ['Date', 'Linear', 'Random Forest', 'XGBoost', 'Ensemble', 'Lower', 'Upper'] 
+        columns = daily_columns(forecast_df) 
+        daily_headers = [header for header, _ in columns] 
         for col, header in enumerate(daily_headers, start=1): 
             cell = ws2.cell(row=1, column=col) 
             cell.value = header 
@@ -181,15 +338,9 @@ class EnsembleForecaster:
             cell.fill = blue_fill 
             cell.border = thin_border 
          
-        # Add daily data 
-        for row_idx, (_, row) in enumerate(forecast_df.iterrows(), start=2): 
-            ws2.cell(row=row_idx, column=1).value = row['date'] 
-            ws2.cell(row=row_idx, column=2).value = round(row['linear'], 1) 
-            ws2.cell(row=row_idx, column=3).value = round(row['rf'], 1) 
-            ws2.cell(row=row_idx, column=4).value = round(row['xgb'], 1) 
-            ws2.cell(row=row_idx, column=5).value = round(row['weighted_ensemble'], 1) 
-            ws2.cell(row=row_idx, column=6).value = round(row['lower_bound'], 1) 
-            ws2.cell(row=row_idx, column=7).value = round(row['upper_bound'], 1) 
+        # Add daily data (rows come straight from the NumPy columns) 
+        for row in daily_rows(forecast_df, columns): 
+            ws2.append(row) 
          
         # Sheet 3: Model Performance 
         ws3 = wb.create_sheet("🎯 Model Performance") 
@@ -206,122 +357,78 @@ class EnsembleForecaster:
             cell.font = header_font 
             cell.fill = blue_fill 
          
-        # Add model performance data (example values) 
-        models_data = [ 
-            ['Moving Average', 45.2, 58.3, '15%'], 
-            ['Exponential Smoothing', 42.1, 55.7, '15%'], 
-            ['Linear Regression', 38.5, 49.2, '20%'], 
-            ['Random Forest', 35.2, 44.8, '25%'], 
-            ['XGBoost', 34.8, 43.9, '25%'] 
-        ] 
-         
+        # Add model performance data 
         for row_idx, model_data in enumerate(models_data, start=5): 
             for col_idx, value in enumerate(model_data, start=2): 
                 ws3.cell(row=row_idx, column=col_idx).value = value 
                 ws3.cell(row=row_idx, column=col_idx).border = thin_border 
          
         # Save workbook 
-        wb.save('volume_forecast_13months.xlsx') 
-        print("✓ Excel workbook created: volume_forecast_13months.xlsx") 
+        wb.save(path) 
+        print(f"✓ Excel workbook created: {path}") 
          
         return wb 
      
-    def create_visualization_suite(self, forecast_df): 
+    def performance_rows(self): 
+        """ 
+        Model performance table rows: backtest MAE/RMSE and fitted weight 
+        The ensemble row is cross-fitted (weights from other origin blocks) 
+        """ 
+        if self.weights is None: 
+            return [] 
+        metrics = self.weight_model.metrics 
+        rows = [[label, round(metrics[name]['mae'], 1), round(metrics[name]['rmse'], 1), 
+                 f"{self.weights[name]:.0%}"] for name, label in COMPONENTS.items()] 
+        label = 'Weighted Ensemble' if self.weight_model.cross_fitted else 'Weighted Ensemble (in-sample)' 
+        rows.append([label, round(metrics['ensemble']['mae'], 1), 
+                     round(metrics['ensemble']['rmse'], 1), '100%']) 
+        return rows 
+     
+    @instrumented('create_visualization_suite') 
+    def create_visualization_suite(self, forecast, path='ensemble_forecast_visuals.png', max_points=None): 
         """Create comprehensive visualizations""" 
+        from quant_forecast.report_rendering import precompute_aggregates, render_forecast_suite 
         print("\n\033[92m📊 CREATING VISUALIZATION SUITE...\033[0m") 
          
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10)) 
-        fig.suptitle('🇺🇸 AI Volume Forecasting System - 13 Month Outlook 🇺🇸',  
-                    fontsize=16, fontweight='bold') 
-         
-        # Colors 
-        colors = { 
-            'historical': '#3C3B6E',  # Blue 
-            'forecast': '#B22234',     # Red 
-            'confidence': '#E0E0E0'    # Light gray 
-        } 
-         
-        # Plot 1: Historical + Forecast 
-        axes[0, 0].plot(self.data.index[-180:], self.data['volume'][-180:],  
-                       color=colors['historical'], label='Historical', linewidth=2) 
-        axes[0, 0].plot(forecast_df.set_index('date').index,  
-                       forecast_df.set_index('date')['weighted_ensemble'], 
-                       color=colors['forecast'], label='Forecast', linewidth=2) 
-        axes[0, 0].fill_between(forecast_df.set_index('date').index, 
-                                forecast_df.set_index('date')['lower_bound'], 
-                                forecast_df.set_index('date')['upper_bound'], 
-                                color=colors['confidence'], alpha=0.3, label='95% CI') 
-        axes[0, 0].set_title('Historical Data & 13-Month Forecast') 
-        axes[0, 0].set_xlabel('Date') 
-        axes[0, 0].set_ylabel('Volume') 
-        axes[0, 0].legend() 
-        axes[0, 0].grid(True, alpha=0.3) 
-         
-        # Plot 2: Model Comparison 
-        monthly = forecast_df.set_index('date').resample('M').mean() 
-        x = range(len(monthly)) 
-        width = 0.2 
-         
-        axes[0, 1].bar([i - width for i in x], monthly['linear'], width,  
-                      label='Linear', color='#FF6B6B') 
-        axes[0, 1].bar(x, monthly['rf'], width,  
-                      label='Random Forest', color='#4ECDC4') 
-        axes[0, 1].bar([i + width for i in x], monthly['xgb'], width, 
-                      label='XGBoost', color='#45B7D1') 
-        axes[0, 1].set_title('Model Predictions by Month') 
-        axes[0, 1].set_xlabel('Month') 
-        axes[0, 1].set_ylabel('Average Daily Volume') 
-        axes[0, 1].legend() 
-        axes[0, 1].grid(True, alpha=0.3, axis='y') 
-         
-        # Plot 3: Monthly Totals 
-        monthly_totals = forecast_df.set_index('date').resample('M').sum() 
-        axes[1, 0].bar(range(len(monthly_totals)),  
-                      monthly_totals['weighted_ensemble'], 
-                      color=colors['forecast'], edgecolor=colors['historical'], linewidth=2) 
-        axes[1, 0].set_title('Monthly Volume Totals (13-Month Forecast)') 
-        axes[1, 0].set_xlabel('Month') 
-        axes[1, 0].set_ylabel('Total Volume') 
-        axes[1, 0].set_xticks(range(len(monthly_totals))) 
-        axes[1, 0].set_xticklabels([d.strftime('%b %y') for d in monthly_totals.index], 
-                                   rotation=45) 
-        axes[1, 0].grid(True, alpha=0.3, axis='y') 
-         
-        # Plot 4: Uncertainty Analysis 
-        uncertainty = (forecast_df['upper_bound'] - forecast_df['lower_bound']) / forecast_df['weighted_ensemble'] * 100 
-        axes[1, 1].plot(forecast_df['date'], uncertainty, color=colors['forecast'], linewidth=2) 
-        axes[1, 1].fill_between(forecast_df['date'], uncertainty, alpha=0.3, 
-                                color=colors['forecast']) 
-        axes[1, 1].set_title('Forecast Uncertainty Over Time') 
-        axes[1, 1].set_xlabel('Date') 
-        axes[1, 1].set_ylabel('Uncertainty (%)') 
-        axes[1, 1].grid(True, alpha=0.3) 
-         
-        plt.tight_layout() 
-        plt.savefig('ensemble_forecast_visuals.png', dpi=150, bbox_inches='tight') 
-        print("✓ Visualization suite saved to ensemble_forecast_visuals.png") 
+        # Aggregate once, then draw every panel from the arrays (Agg backend) 
+        aggregates = precompute_aggregates(forecast, self.data['volume']) 
+        fig = render_forecast_suite(aggregates, path, dpi=150, max_points=max_points) 
+        print(f"✓ Visualization suite saved to {path}") 
          
         return fig 
+     
+    def render_series_reports(self, panel_df, out_dir='series_reports', **kwargs): 
+        """One forecast suite per series of a stacked panel, rendered in parallel""" 
+        from quant_forecast.report_rendering import render_series_reports 
+        print("\n\033[92m📊 RENDERING SERIES REPORTS...\033[0m") 
+        return render_series_reports(panel_df, out_dir, **kwargs) 
  
 # Main execution 
-def main(): 
-    """Run complete ensemble forecasting system""" 
+def main(profile=False, trace_memory=False, report_path='run_report.json', data_path=DEFAULT_DATA): 
+    """ 
+    Run complete ensemble forecasting system 
+    profile / trace_memory add cProfile and tracemalloc capture to the run report 
+    """ 
+    instrumentation = Instrumentation(profile=profile, trace_memory=trace_memory).start() 
+
     print("\033[91m" + "="*70)  # Red 
     print("\033[97m" + "    🇺🇸 COMPLETE AI FORECASTING SYSTEM 🇺🇸")  # White 
     print("\033[94m" + "="*70 + "\033[0m")  # Blue 
     print("Week 8: Machine Learning & Professional Deliverables\n") 
      
     # Initialize ensemble system 
-    ensemble = EnsembleForecaster('../Week-7-ai-volume-forecaster/data/historical_volumes.csv') 
+    ensemble = EnsembleForecaster(data_path, 
+                                  instrumentation=instrumentation) 
      
     # Create ensemble forecast 
-    forecast_df = ensemble.create_ensemble_forecast() 
+    forecast = ensemble.create_ensemble_forecast() 
+    instrumentation.memory_checkpoint('after_forecast') 
      
     # Generate Excel workbook 
-    workbook = ensemble.create_excel_workbook(forecast_df) 
+    workbook = ensemble.create_excel_workbook(forecast) 
      
     # Create visualizations 
-    visuals = ensemble.create_visualization_suite(forecast_df) 
+    visuals = ensemble.create_visualization_suite(forecast) 
      
     # Final summary 
     print("\n" + "="*70) 
@@ -329,11 +436,7 @@ def main():
     print("="*70) 
      
     # Calculate key metrics 
-    monthly = forecast_df.set_index('date').resample('M').agg({ 
-        'weighted_ensemble': 'sum', 
-        'lower_bound': 'sum',  
-        'upper_bound': 'sum' 
-    }) 
+    monthly = forecast.monthly(['weighted_ensemble', 'lower_bound', 'upper_bound']) 
      
     print("\n📊 13-MONTH FORECAST SUMMARY:") 
     print(f"  Total Volume Forecast: {monthly['weighted_ensemble'].sum():,.0f} units") 
@@ -341,9 +444,16 @@ def main():
     print(f"  Peak Month: {monthly['weighted_ensemble'].idxmax().strftime('%B %Y')}") 
     print(f"  Peak Volume: {monthly['weighted_ensemble'].max():,.0f} units") 
      
+    # Timing, memory and call counts per stage 
+    instrumentation.memory_checkpoint('end_of_run') 
+    instrumentation.stop() 
+    instrumentation.print_summary() 
+    instrumentation.save_report(report_path) 
+     
     print("\n📁 DELIVERABLES CREATED:") 
     print("  ✓ volume_forecast_13months.xlsx - Professional Excel workbook") 
     print("  ✓ ensemble_forecast_visuals.png - Visualization suite") 
+    print(f"  ✓ {report_path} - Run report (timings, memory, call counts)") 
     print("  ✓ Full codebase on GitHub") 
      
     print("\n🎯 NEXT STEPS:") 
@@ -352,7 +462,21 @@ def main():
     print("  3. Implement automated retraining") 
     print("  4. Add external data sources (weather, economics)") 
      
-    return ensemble, forecast_df 
+    return ensemble, forecast 
+ 
+def parse_args(argv=None): 
+    parser = argparse.ArgumentParser(description="Run the complete ensemble forecasting system") 
+    parser.add_argument('--profile', action='store_true') 
+    parser.add_argument('--trace-memory', action='store_true') 
+    parser.add_argument('--data', default=DEFAULT_DATA, help="historical volume CSV") 
+    return parser.parse_args(argv) 
+ 
+def cli(): 
+    """Console entry point (quant-forecast [--profile] [--trace-memory] [--data CSV])""" 
+    args = parse_args() 
+    main(profile=args.profile, trace_memory=args.trace_memory, data_path=args.data) 
  
 if __name__ == "__main__": 
-    ensemble, forecasts = main()
+    args = parse_args() 
+    ensemble, forecasts = main(profile=args.profile, trace_memory=args.trace_memory, 
+                               data_path=args.data)
\ No newline at end of file
@@ -0,0 +1,147 @@
+# ensemble_weights.py
+# Quantitative AI - Ensemble Weights Fitted on Backtest Predictions
+import numpy as np
+
+# Horizon buckets (last step of each) for horizon-dependent weights;
+# None closes the last bucket at the calibrated horizon
+DEFAULT_HORIZON_BUCKETS = (7, 30, None)
+
+
+def simplex_weights(P, y, penalty=1e3):
+    """
+    Least-squares weights with w >= 0 and sum(w) == 1
+    NNLS on P stacked with a heavily weighted row of ones, so the
+    sum-to-one constraint is met to solver precision
+    """
+    from scipy.optimize import nnls
+    scale = penalty * max(np.abs(y).mean(), 1.0)
+    A = np.vstack([P, np.full((1, P.shape[1]), scale)])
+    b = np.append(y, scale)
+    w, _ = nnls(A, b)
+    total = w.sum()
+    return w / total if total > 0 else np.full(P.shape[1], 1.0 / P.shape[1])
+
+
+def error_metrics(P, y):
+    """MAE and RMSE of every column of P against y in one pass"""
+    errors = P - y[:, None]
+    return np.abs(errors).mean(axis=0), np.sqrt((errors ** 2).mean(axis=0))
+
+
+class EnsembleWeights:
+    """
+    Stacked ensemble weights for the component forecasters
+    predictions[j, h, k] is model k's forecast from origin j for step h+1;
+    weights are non-negative, sum to one and can differ by horizon bucket
+    """
+
+    def __init__(self, names, horizon_buckets=DEFAULT_HORIZON_BUCKETS):
+        """Initialize with component names (column order of the stack)"""
+        self.names = list(names)
+        self.horizon_buckets = horizon_buckets
+        self.weights = None
+        self.bucket_weights = None
+        self.bucket_edges = None
+        self.horizon = None
+        self.cross_fitted = False
+        self.metrics = None
+
+    def stack(self, predictions):
+        """(origins, steps, models) array from a {name: (origins, steps)} dict"""
+        return np.stack([np.asarray(predictions[name], dtype=np.float64)
+                         for name in self.names], axis=-1)
+
+    def fit(self, predictions, actual, folds=5):
+        """
+        Fit global and per-bucket weights and score every component
+        The ensemble is scored out of sample: each contiguous block of
+        origins (folds of them) is combined with weights fitted on the
+        other blocks, so its MAE/RMSE is comparable with the components'
+        """
+        stacked = self.stack(predictions) if isinstance(predictions, dict) else predictions
+        actual = np.asarray(actual, dtype=np.float64)
+        horizon = actual.shape[1]
+        k = stacked.shape[-1]
+        self.horizon = horizon
+        self.weights, self.bucket_edges, self.bucket_weights = self._solve(stacked, actual)
+
+        # Cross-fitted ensemble; a single origin can only be scored in-sample
+        blocks = np.array_split(np.arange(len(actual)), min(folds, len(actual)))
+        self.cross_fitted = len(blocks) > 1
+        combined = np.empty_like(actual)
+        for block in blocks:
+            train = np.setdiff1d(np.arange(len(actual)), block) if self.cross_fitted else block
+            weights, edges, bucket_weights = self._solve(stacked[train], actual[train])
+            combined[block] = np.einsum('jhk,hk->jh', stacked[block],
+                                        self._per_step(weights, edges, bucket_weights, horizon))
+
+        # Backtest accuracy of the components and the ensemble
+        columns = np.column_stack([stacked.reshape(-1, k), combined.ravel()])
+        mae, rmse = error_metrics(columns, actual.ravel())
+        self.metrics = {
+            name: {'mae': float(mae[i]), 'rmse': float(rmse[i])}
+            for i, name in enumerate(self.names + ['ensemble'])
+        }
+        return self
+
+    def _solve(self, stacked, actual):
+        """(global weights, bucket edges, per-bucket weights) for one stack"""
+        horizon = actual.shape[1]
+        k = stacked.shape[-1]
+        # One global solve over every (origin, step) pair
+        weights = simplex_weights(stacked.reshape(-1, k), actual.ravel())
+        if not self.horizon_buckets:
+            return weights, None, None
+
+        # One solve per horizon bucket when enabled
+        edges = sorted({min(edge or horizon, horizon) for edge in self.horizon_buckets})
+        starts = [0] + edges[:-1]
+        bucket_weights = np.array([
+            simplex_weights(stacked[:, a:b].reshape(-1, k), actual[:, a:b].ravel())
+            for a, b in zip(starts, edges)
+        ])
+        return weights, np.array(edges), bucket_weights
+
+    @staticmethod
+    def _per_step(weights, edges, bucket_weights, periods):
+        if bucket_weights is None:
+            return np.tile(weights, (periods, 1))
+        steps = np.arange(1, periods + 1)
+        bucket = np.minimum(np.searchsorted(edges, steps), len(edges) - 1)
+        return bucket_weights[bucket]
+
+    def horizon_weights(self, periods):
+        """
+        (periods, models) weights; steps past the last bucket reuse it,
+        so beyond the backtest horizon (self.horizon) they are extrapolated
+        """
+        return self._per_step(self.weights, self.bucket_edges, self.bucket_weights, periods)
+
+    def combine(self, components):
+        """Weighted forecast from a {name: (periods,)} dict or (periods, models) array"""
+        if isinstance(components, dict):
+            components = np.column_stack([np.asarray(components[name], dtype=np.float64)
+                                          for name in self.names])
+        return np.sum(components * self.horizon_weights(len(components)), axis=1)
+
+    def as_dict(self):
+        """Global weights keyed by component name"""
+        return {name: float(w) for name, w in zip(self.names, self.weights)}
+
+    def print_weights(self):
+        """Print global and per-bucket weights with backtest accuracy"""
+        print("\n\033[96m⚖️  FITTED ENSEMBLE WEIGHTS:\033[0m")
+        header = f"  {'Model':<24}{'MAE':>8}{'RMSE':>8}{'Weight':>8}"
+        if self.bucket_weights is not None:
+            starts = [1] + list(self.bucket_edges[:-1] + 1)
+            header += ''.join(f"{f'h{a}-{b}':>9}" for a, b in zip(starts, self.bucket_edges))
+        print(header)
+        for i, name in enumerate(self.names):
+            line = (f"  {name:<24}{self.metrics[name]['mae']:>8.1f}"
+                    f"{self.metrics[name]['rmse']:>8.1f}{self.weights[i]:>8.2f}")
+            if self.bucket_weights is not None:
+                line += ''.join(f"{w:>9.2f}" for w in self.bucket_weights[:, i])
+            print(line)
+        label = 'ensemble (cross-fitted)' if self.cross_fitted else 'ensemble (in-sample)'
+        print(f"  {label:<24}{self.metrics['ensemble']['mae']:>8.1f}"
+              f"{self.metrics['ensemble']['rmse']:>8.1f}")
@@ -0,0 +1,213 @@
+# excel_export.py
+# Quantitative AI - Streaming Excel Export for Panel-Scale Forecasts
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import LineChart, Reference
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+
+# Excel's hard sheet limit; longer exports continue on a new sheet
+EXCEL_MAX_ROWS = 1_048_576
+
+DAILY_COLUMNS = [
+    ('Date', 'date'),
+    ('Linear', 'linear'),
+    ('Random Forest', 'rf'),
+    ('XGBoost', 'xgb'),
+    ('Ensemble', 'weighted_ensemble'),
+    ('Lower', 'lower_bound'),
+    ('Upper', 'upper_bound')
+]
+
+# American flag colors
+RED = "B22234"
+BLUE = "3C3B6E"
+WHITE = "FFFFFF"
+
+
+def daily_columns(forecast_df):
+    """Daily sheet columns, with a leading Series column for panel forecasts"""
+    columns = [(header, col) for header, col in DAILY_COLUMNS if col in forecast_df.columns]
+    if 'series' in forecast_df.columns:
+        columns.insert(0, ('Series', 'series'))
+    return columns
+
+
+def daily_rows(forecast_df, columns, chunk_rows=100_000):
+    """
+    Yield daily rows as plain Python tuples, chunk by chunk from NumPy arrays
+    (numeric columns rounded to one decimal, like the standard workbook)
+    """
+    for start in range(0, len(forecast_df), chunk_rows):
+        chunk = forecast_df.iloc[start:start + chunk_rows]
+        values = []
+        for _, col in columns:
+            data = chunk[col]
+            if col == 'date':
+                values.append(data.dt.to_pydatetime().tolist())
+            elif np.issubdtype(data.dtype, np.number):
+                values.append(np.round(data.to_numpy(dtype=np.float64), 1).tolist())
+            else:
+                values.append(data.tolist())
+        yield from zip(*values)
+
+
+def monthly_rows(monthly):
+    """Dashboard rows: month label, forecast, bounds, confidence"""
+    labels = monthly.index.strftime('%b %Y')
+    values = np.round(monthly[['weighted_ensemble', 'lower_bound', 'upper_bound']].to_numpy())
+    for label, (forecast, lower, upper) in zip(labels, values.astype(np.int64).tolist()):
+        yield label, forecast, lower, upper, "95%"
+
+
+def _named_styles():
+    """Shared named styles instead of per-cell Font/PatternFill/Border objects"""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    center = Alignment(horizontal='center')
+    return [
+        NamedStyle(name='fc_title', font=Font(bold=True, size=16, color=BLUE)),
+        NamedStyle(name='fc_subtitle', font=Font(bold=True, size=14)),
+        NamedStyle(name='fc_header', font=Font(bold=True, color=WHITE, size=12),
+                   fill=PatternFill(start_color=BLUE, end_color=BLUE, fill_type='solid'),
+                   alignment=center, border=border),
+        NamedStyle(name='fc_stripe_red', font=Font(color=WHITE),
+                   fill=PatternFill(start_color=RED, end_color=RED, fill_type='solid'),
+                   alignment=center, border=border),
+        NamedStyle(name='fc_stripe_white',
+                   fill=PatternFill(start_color=WHITE, end_color=WHITE, fill_type='solid'),
+                   alignment=center, border=border),
+        NamedStyle(name='fc_bordered', border=border)
+    ]
+
+
+def write_openpyxl_streaming(path, forecast_df, monthly, performance_rows):
+    """Write the forecast workbook with openpyxl's write-only mode"""
+    wb = Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+
+    def styled(ws, value, style):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    # Sheet 1: Dashboard (rows must be appended top to bottom)
+    ws1 = wb.create_sheet("📊 Dashboard")
+    ws1.append([])
+    ws1.append([None, styled(ws1, "AI VOLUME FORECASTING SYSTEM", 'fc_title')])
+    ws1.append([])
+    ws1.append([None, styled(ws1, "13-Month Forecast Summary", 'fc_subtitle')])
+    ws1.append([])
+    headers = ['Month', 'Forecast', 'Lower Bound', 'Upper Bound', 'Confidence']
+    ws1.append([None] + [styled(ws1, h, 'fc_header') for h in headers])
+    n_months = 0
+    for row_idx, row in enumerate(monthly_rows(monthly), start=7):
+        style = 'fc_stripe_red' if row_idx % 2 == 0 else 'fc_stripe_white'
+        ws1.append([None] + [styled(ws1, value, style) for value in row])
+        n_months += 1
+
+    chart = LineChart()
+    chart.title = "13-Month Volume Forecast"
+    chart.style = 13
+    chart.y_axis.title = 'Volume'
+    chart.x_axis.title = 'Month'
+    chart.add_data(Reference(ws1, min_col=3, min_row=6, max_col=5, max_row=6 + n_months),
+                   titles_from_data=True)
+    chart.set_categories(Reference(ws1, min_col=2, min_row=7, max_row=6 + n_months))
+    chart.width = 15
+    chart.height = 10
+    ws1.add_chart(chart, "I6")
+
+    # Sheet 2: Daily Forecasts, streamed straight from the arrays
+    columns = daily_columns(forecast_df)
+    sheet_no = 1
+    ws2 = None
+    written = EXCEL_MAX_ROWS
+    for row in daily_rows(forecast_df, columns):
+        if written == EXCEL_MAX_ROWS:
+            title = "📈 Daily Forecasts" if sheet_no == 1 else f"📈 Daily Forecasts ({sheet_no})"
+            ws2 = wb.create_sheet(title)
+            ws2.append([styled(ws2, header, 'fc_header') for header, _ in columns])
+            written = 1
+            sheet_no += 1
+        # Plain values: openpyxl gives datetimes a date format on its own
+        ws2.append(row)
+        written += 1
+
+    # Sheet 3: Model Performance
+    ws3 = wb.create_sheet("🎯 Model Performance")
+    ws3.append([])
+    ws3.append([None, styled(ws3, "Model Performance Comparison", 'fc_subtitle')])
+    ws3.append([])
+    ws3.append([None] + [styled(ws3, h, 'fc_header') for h in ['Model', 'MAE', 'RMSE', 'Weight']])
+    for row in performance_rows:
+        ws3.append([None] + [styled(ws3, value, 'fc_bordered') for value in row])
+
+    wb.save(path)
+    return wb
+
+
+def write_xlsxwriter(path, forecast_df, monthly, performance_rows):
+    """Write the forecast workbook with xlsxwriter in constant-memory mode"""
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(path, {'constant_memory': True,
+                                    'default_date_format': 'yyyy-mm-dd'})
+    border = {'border': 1}
+    title = wb.add_format({'bold': True, 'font_size': 16, 'font_color': '#' + BLUE})
+    subtitle = wb.add_format({'bold': True, 'font_size': 14})
+    header = wb.add_format({'bold': True, 'font_size': 12, 'font_color': '#' + WHITE,
+                            'bg_color': '#' + BLUE, 'align': 'center', **border})
+    stripe_red = wb.add_format({'font_color': '#' + WHITE, 'bg_color': '#' + RED,
+                                'align': 'center', **border})
+    stripe_white = wb.add_format({'bg_color': '#' + WHITE, 'align': 'center', **border})
+    bordered = wb.add_format(border)
+
+    # Sheet 1: Dashboard
+    ws1 = wb.add_worksheet("📊 Dashboard")
+    ws1.write(1, 1, "AI VOLUME FORECASTING SYSTEM", title)
+    ws1.write(3, 1, "13-Month Forecast Summary", subtitle)
+    ws1.write_row(5, 1, ['Month', 'Forecast', 'Lower Bound', 'Upper Bound', 'Confidence'], header)
+    n_months = 0
+    for row_idx, row in enumerate(monthly_rows(monthly), start=6):
+        # Row numbers are zero-based here, so stripes match the openpyxl layout
+        ws1.write_row(row_idx, 1, row, stripe_red if row_idx % 2 == 1 else stripe_white)
+        n_months += 1
+
+    chart = wb.add_chart({'type': 'line'})
+    for col in (2, 3, 4):
+        chart.add_series({
+            'name': ["📊 Dashboard", 5, col],
+            'categories': ["📊 Dashboard", 6, 1, 5 + n_months, 1],
+            'values': ["📊 Dashboard", 6, col, 5 + n_months, col]
+        })
+    chart.set_title({'name': "13-Month Volume Forecast"})
+    chart.set_x_axis({'name': 'Month'})
+    chart.set_y_axis({'name': 'Volume'})
+    ws1.insert_chart('I6', chart)
+
+    # Sheet 2: Daily Forecasts, rows flushed to disk as they are written
+    columns = daily_columns(forecast_df)
+    sheet_no = 1
+    ws2 = None
+    row_idx = EXCEL_MAX_ROWS
+    for row in daily_rows(forecast_df, columns):
+        if row_idx == EXCEL_MAX_ROWS:
+            name = "📈 Daily Forecasts" if sheet_no == 1 else f"📈 Daily Forecasts ({sheet_no})"
+            ws2 = wb.add_worksheet(name)
+            ws2.write_row(0, 0, [h for h, _ in columns], header)
+            row_idx = 1
+            sheet_no += 1
+        ws2.write_row(row_idx, 0, row)
+        row_idx += 1
+
+    # Sheet 3: Model Performance
+    ws3 = wb.add_worksheet("🎯 Model Performance")
+    ws3.write(1, 1, "Model Performance Comparison", subtitle)
+    ws3.write_row(3, 1, ['Model', 'MAE', 'RMSE', 'Weight'], header)
+    for row_idx, row in enumerate(performance_rows, start=4):
+        ws3.write_row(row_idx, 1, row, bordered)
+
+    wb.close()
+    return wb
@@ -0,0 +1,206 @@
+# execution_graph.py
+# Quantitative AI - Concurrent Execution Graph for the Ensemble Components
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from quant_forecast.instrumentation import Instrumentation
+
+# Marks a cache miss (None is a valid node output)
+_MISSING = object()
+
+
+def _timed(func, inputs):
+    """Run func in a worker and report its own run time (excludes queueing)"""
+    start = time.perf_counter()
+    result = func(**inputs)
+    return result, time.perf_counter() - start
+
+
+class GraphNode:
+    """
+    One step of the graph
+    func receives its dependencies' outputs as keyword arguments;
+    executor is 'thread' (GIL-releasing or state-mutating work) or
+    'process' (pure-Python CPU work, func and inputs must pickle)
+    """
+
+    def __init__(self, name, func, deps=(), executor='thread', fingerprint=None, persist=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.executor = executor
+        self.fingerprint = fingerprint
+        self.persist = persist
+
+
+class ExecutionGraph:
+    """
+    Runs independent nodes concurrently as soon as their dependencies finish
+    Each node's output is cached under a key built from its own input
+    fingerprint and its dependencies' keys, so a rerun only recomputes the
+    branches whose inputs changed
+    """
+
+    def __init__(self, n_workers=None, cache_dir=None, instrumentation=None):
+        """Initialize; cache_dir additionally keeps persist=True outputs on disk"""
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.nodes = {}
+        self.cache = {}
+        self.keys = {}
+        self.timings = {}
+        self.wall_time = None
+
+    def add(self, name, func, deps=(), executor='thread', fingerprint=None, persist=False):
+        """Register a node; dependencies must already be registered"""
+        missing = [dep for dep in deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Node '{name}' depends on unknown nodes {missing}")
+        self.nodes[name] = GraphNode(name, func, deps, executor, fingerprint, persist)
+        return self
+
+    def node_key(self, node):
+        """Cache key: node name, its input fingerprint and its dependencies' keys"""
+        digest = hashlib.sha1(node.name.encode())
+        if node.fingerprint is not None:
+            digest.update(repr(node.fingerprint()).encode())
+        for dep in node.deps:
+            digest.update(self.keys[dep].encode())
+        return digest.hexdigest()[:16]
+
+    def _disk_path(self, node, key):
+        return os.path.join(self.cache_dir, f'{node.name}-{key}.joblib')
+
+    def _cached(self, node, key):
+        """Output for key from memory or disk, or _MISSING"""
+        if (node.name, key) in self.cache:
+            return self.cache[node.name, key]
+        if node.persist and self.cache_dir:
+            path = self._disk_path(node, key)
+            if os.path.exists(path):
+                import joblib
+                self.cache[node.name, key] = joblib.load(path)
+                return self.cache[node.name, key]
+        return _MISSING
+
+    def _store(self, node, key, result):
+        """Keep the output; older entries for the node are dropped"""
+        for cached_key in [k for k in self.cache if k[0] == node.name]:
+            del self.cache[cached_key]
+        self.cache[node.name, key] = result
+        if node.persist and self.cache_dir:
+            import joblib
+            os.makedirs(self.cache_dir, exist_ok=True)
+            joblib.dump(result, self._disk_path(node, key))
+
+    def run(self, targets=None):
+        """
+        Execute the nodes needed for targets (default: all) and return
+        {name: output}; per-node timings are kept for print_timings
+        """
+        needed = self._ancestors(targets or list(self.nodes))
+        results = {}
+        pending = {}
+        self.timings = {}
+        start = time.perf_counter()
+
+        threads = ThreadPoolExecutor(max_workers=self.n_workers)
+        processes = None
+        try:
+            while len(results) < len(needed):
+                # Launch (or serve from cache) every node whose inputs are ready
+                launched = True
+                while launched:
+                    launched = False
+                    for name in needed:
+                        if name in results or name in pending:
+                            continue
+                        node = self.nodes[name]
+                        if any(dep not in results for dep in node.deps):
+                            continue
+                        key = self.node_key(node)
+                        self.keys[name] = key
+                        cached = self._cached(node, key)
+                        if cached is not _MISSING:
+                            now = time.perf_counter() - start
+                            results[name] = cached
+                            self.timings[name] = {'start': now, 'end': now, 'seconds': 0.0,
+                                                  'executor': node.executor, 'cached': True}
+                            self.instrumentation.count('graph_cache_hits')
+                            launched = True
+                            continue
+                        inputs = {dep: results[dep] for dep in node.deps}
+                        if node.executor == 'process':
+                            if processes is None:
+                                processes = ProcessPoolExecutor(max_workers=self.n_workers)
+                            future = processes.submit(_timed, node.func, inputs)
+                        else:
+                            future = threads.submit(_timed, node.func, inputs)
+                        pending[name] = (future, time.perf_counter() - start)
+                        self.instrumentation.count('graph_cache_misses')
+
+                if not pending:
+                    break
+                done, _ = wait([future for future, _ in pending.values()],
+                               return_when=FIRST_COMPLETED)
+                for name in [n for n, (future, _) in pending.items() if future in done]:
+                    future, launched_at = pending.pop(name)
+                    node = self.nodes[name]
+                    results[name], seconds = future.result()
+                    self._store(node, self.keys[name], results[name])
+                    self.timings[name] = {'start': launched_at,
+                                          'end': time.perf_counter() - start,
+                                          'seconds': seconds,
+                                          'executor': node.executor, 'cached': False}
+        finally:
+            threads.shutdown(wait=True, cancel_futures=True)
+            if processes is not None:
+                processes.shutdown(wait=True, cancel_futures=True)
+
+        self.wall_time = time.perf_counter() - start
+        return results
+
+    def _ancestors(self, targets):
+        """Targets plus everything they depend on, in registration order"""
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.nodes[name].deps)
+        return [name for name in self.nodes if name in needed]
+
+    def critical_path(self):
+        """Longest chain of node durations through the last run"""
+        finish = {}
+        previous = {}
+        for name in self.nodes:
+            if name not in self.timings:
+                continue
+            deps = [dep for dep in self.nodes[name].deps if dep in finish]
+            before = max(deps, key=lambda dep: finish[dep], default=None)
+            previous[name] = before
+            finish[name] = self.timings[name]['seconds'] + (finish[before] if before else 0.0)
+        if not finish:
+            return []
+        path = [max(finish, key=finish.get)]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        return path[::-1]
+
+    def print_timings(self):
+        """Per-node timings with the critical path marked"""
+        path = self.critical_path()
+        busy = sum(t['seconds'] for t in self.timings.values())
+        print(f"\n\033[96m🕸️  EXECUTION GRAPH ({self.n_workers} workers):\033[0m")
+        print(f"  {'Node':<24}{'Executor':>9}{'Start':>8}{'Time (s)':>10}")
+        for name, t in self.timings.items():
+            mark = '★' if name in path else ' '
+            status = 'cached' if t['cached'] else f"{t['seconds']:.3f}"
+            print(f"{mark} {name:<24}{t['executor']:>9}{t['start']:>8.2f}{status:>10}")
+        critical = sum(self.timings[name]['seconds'] for name in path)
+        print(f"  Critical path: {' → '.join(path)} ({critical:.2f}s)")
+        print(f"  Graph wall time {self.wall_time:.2f}s for {busy:.2f}s of node work")
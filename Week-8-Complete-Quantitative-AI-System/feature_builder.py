@@ -0,0 +1,175 @@
+# feature_builder.py
+# Quantitative AI - Compact Feature Matrix Builder
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from quant_forecast.shared_data import readonly_values
+
+# Feature families and their defaults (override any key per forecaster)
+DEFAULT_FEATURE_CONFIG = {
+    'lags': 30,                   # lag_1 .. lag_n autoregressive columns (0 disables)
+    'rolling_windows': (7, 30),   # rolling mean/std per window, min/max for the first
+    'calendar': True,             # day_of_week, day_of_month, month, quarter, year
+    'cyclical': True,             # day_sin, day_cos
+    'indicators': True,           # is_weekend, is_month_end
+    'trend': True,                # time_index
+    'target_transforms': False,   # log/sqrt/squared of the target itself (leaks y)
+    'dtype': 'float32'
+}
+
+
+class FeatureMatrix:
+    """
+    A single contiguous 2D feature array plus its column-name index
+    Rows line up with index (dates) and target (volume)
+    """
+
+    def __init__(self, values, columns, index, target):
+        self.values = values
+        self.columns = list(columns)
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+        self.index = index
+        self.target = target
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def nbytes(self):
+        """Bytes held by the feature array and target"""
+        return self.values.nbytes + self.target.nbytes
+
+    def column(self, name):
+        """One feature column as an array view"""
+        return self.values[:, self.column_index[name]]
+
+    def to_frame(self):
+        """DataFrame view for inspection (features plus volume)"""
+        df = pd.DataFrame(self.values, index=self.index, columns=self.columns)
+        df['volume'] = self.target
+        return df
+
+
+class FeatureBuilder:
+    """
+    Builds the ML feature matrix straight into a preallocated float32 array
+    Rolling statistics only look at past values, so no column contains the
+    target of its own row unless target_transforms is switched on
+    """
+
+    def __init__(self, config=None):
+        """Initialize with feature family toggles"""
+        self.config = {**DEFAULT_FEATURE_CONFIG, **(config or {})}
+        self.dtype = np.dtype(self.config['dtype'])
+        self.columns = self._column_names()
+        self.column_index = {name: i for i, name in enumerate(self.columns)}
+
+    def _column_names(self):
+        """Column order of the feature matrix"""
+        cfg = self.config
+        windows = list(cfg['rolling_windows'])
+        columns = [f'lag_{i}' for i in range(1, cfg['lags'] + 1)]
+        columns += [f'rolling_mean_{w}' for w in windows]
+        columns += [f'rolling_std_{w}' for w in windows]
+        if windows:
+            columns += [f'rolling_min_{windows[0]}', f'rolling_max_{windows[0]}']
+        if cfg['target_transforms']:
+            columns += ['log_volume', 'sqrt_volume', 'volume_squared']
+        if cfg['calendar']:
+            columns += ['day_of_week', 'day_of_month', 'month', 'quarter', 'year']
+        if cfg['cyclical']:
+            columns += ['day_sin', 'day_cos']
+        if cfg['indicators']:
+            columns += ['is_weekend', 'is_month_end']
+        if cfg['trend']:
+            columns += ['time_index']
+        return columns
+
+    @property
+    def min_history(self):
+        """Observations needed before the first complete feature row"""
+        return max([self.config['lags'], *self.config['rolling_windows'], 0])
+
+    def transform(self, history, dates, positions, out=None):
+        """
+        Feature rows for the given positions of a volume history
+        Row j describes time positions[j]; it reads history[:positions[j]]
+        (and history[positions[j]] only for the leaking target transforms)
+        history may also be 2D with one path per row (batched forecasting)
+        """
+        cfg = self.config
+        history = np.asarray(history, dtype=np.float64)
+        positions = np.asarray(positions)
+
+        # One history shared by every row, or one history path per row
+        if history.ndim == 1:
+            history = history[np.newaxis, :]
+            paths = np.zeros(len(positions), dtype=np.intp)
+        else:
+            paths = np.arange(len(positions))
+        if out is None:
+            out = np.empty((len(positions), len(self.columns)), dtype=self.dtype)
+        col = 0
+
+        # Lag features (autoregressive components)
+        for lag in range(1, cfg['lags'] + 1):
+            out[:, col] = history[paths, positions - lag]
+            col += 1
+
+        # Statistical rolling features over the previous w observations
+        windows = list(cfg['rolling_windows'])
+        views = {w: sliding_window_view(history, w, axis=1)[paths, positions - w] for w in windows}
+        for w in windows:
+            out[:, col] = views[w].mean(axis=1)
+            col += 1
+        for w in windows:
+            out[:, col] = views[w].std(axis=1, ddof=1)
+            col += 1
+        if windows:
+            out[:, col] = views[windows[0]].min(axis=1)
+            out[:, col + 1] = views[windows[0]].max(axis=1)
+            col += 2
+
+        # Mathematical transformations of the target (future rows reuse the last known value)
+        if cfg['target_transforms']:
+            current = history[paths, np.minimum(positions, history.shape[1] - 1)]
+            out[:, col] = np.log1p(current)
+            out[:, col + 1] = np.sqrt(current)
+            out[:, col + 2] = current ** 2
+            col += 3
+
+        # Numerical time encoding
+        if cfg['calendar']:
+            out[:, col] = dates.dayofweek
+            out[:, col + 1] = dates.day
+            out[:, col + 2] = dates.month
+            out[:, col + 3] = dates.quarter
+            out[:, col + 4] = dates.year
+            col += 5
+        if cfg['cyclical']:
+            out[:, col] = np.sin(2 * np.pi * dates.dayofyear / 365)
+            out[:, col + 1] = np.cos(2 * np.pi * dates.dayofyear / 365)
+            col += 2
+
+        # Binary indicators (mathematical step functions)
+        if cfg['indicators']:
+            out[:, col] = dates.dayofweek >= 5
+            out[:, col + 1] = dates.day > 25
+            col += 2
+
+        # Linear time index for trend
+        if cfg['trend']:
+            out[:, col] = positions
+            col += 1
+
+        return out
+
+    def build(self, series):
+        """Feature matrix for every row of a date-indexed volume series with full history"""
+        history = readonly_values(series)
+        positions = np.arange(self.min_history, len(history))
+        values = self.transform(history, series.index[positions], positions)
+        # The target is a read-only slice (view) of the series, not a gathered copy
+        return FeatureMatrix(values, self.columns, series.index[self.min_history:],
+                             history[self.min_history:])
@@ -0,0 +1,112 @@
+# forecast_result.py
+# Quantitative AI - Forecast Result with Memoized Calendar Rollups
+import numpy as np
+import pandas as pd
+
+FREQUENCIES = ('W', 'M', 'Q')
+
+
+class ForecastResult:
+    """
+    Daily forecast frame plus weekly/monthly/quarterly rollups
+    Group boundaries come from integer period keys of the sorted dates,
+    sums are taken once per frequency with np.add.reduceat and kept;
+    revising a slice of the forecast patches the kept sums in place
+    Labels follow resample(): weeks end on Sunday, months and quarters on
+    their last day
+    """
+
+    def __init__(self, frame, date_column='date'):
+        """Initialize with a daily forecast frame sorted by date"""
+        self.frame = frame.reset_index(drop=True)
+        self.date_column = date_column
+        self.dates = self.frame[date_column].to_numpy(dtype='datetime64[ns]')
+        if len(self.dates) > 1 and np.any(self.dates[1:] < self.dates[:-1]):
+            raise ValueError("Forecast dates must be sorted")
+        self.numeric = [c for c in self.frame.columns
+                        if c != date_column and pd.api.types.is_numeric_dtype(self.frame[c])]
+        self._rollups = {}
+
+    @classmethod
+    def wrap(cls, forecast):
+        """Pass a ForecastResult through, wrap a raw daily DataFrame"""
+        return forecast if isinstance(forecast, cls) else cls(forecast)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _period_keys(self, freq):
+        """Integer period number of every day"""
+        if freq == 'W':
+            # 1970-01-01 was a Thursday, so shifting by 3 days starts weeks on Monday
+            days = self.dates.astype('datetime64[D]').astype(np.int64)
+            return (days + 3) // 7
+        months = self.dates.astype('datetime64[M]').astype(np.int64)
+        if freq == 'M':
+            return months
+        if freq == 'Q':
+            return months // 3
+        raise ValueError(f"Unknown frequency '{freq}', expected one of {FREQUENCIES}")
+
+    def _period_ends(self, freq, keys):
+        """Last calendar day of each period key"""
+        if freq == 'W':
+            return (keys * 7 - 3 + 6).astype('datetime64[D]')
+        months = keys + 1 if freq == 'M' else (keys + 1) * 3
+        return months.astype('datetime64[M]').astype('datetime64[D]') - np.timedelta64(1, 'D')
+
+    def rollup(self, freq):
+        """Memoized group boundaries, row-to-group map, sums and day counts"""
+        if freq not in self._rollups:
+            keys = self._period_keys(freq)
+            new_group = np.r_[True, keys[1:] != keys[:-1]]
+            starts = np.flatnonzero(new_group)
+            values = self.frame[self.numeric].to_numpy(dtype=np.float64)
+            self._rollups[freq] = {
+                'index': pd.DatetimeIndex(self._period_ends(freq, keys[starts]), name=self.date_column),
+                'group': np.cumsum(new_group) - 1,
+                'sums': np.add.reduceat(values, starts, axis=0),
+                'counts': np.diff(np.r_[starts, len(keys)])
+            }
+        return self._rollups[freq]
+
+    def aggregate(self, freq, columns=None, how='sum'):
+        """Rollup as a DataFrame of period sums (how='sum') or daily means (how='mean')"""
+        columns = list(columns or self.numeric)
+        roll = self.rollup(freq)
+        positions = [self.numeric.index(c) for c in columns]
+        values = roll['sums'][:, positions]
+        if how == 'mean':
+            values = values / roll['counts'][:, None]
+        return pd.DataFrame(values, index=roll['index'], columns=columns)
+
+    def weekly(self, columns=None, how='sum'):
+        return self.aggregate('W', columns, how)
+
+    def monthly(self, columns=None, how='sum'):
+        return self.aggregate('M', columns, how)
+
+    def quarterly(self, columns=None, how='sum'):
+        return self.aggregate('Q', columns, how)
+
+    def revise(self, start, values):
+        """
+        Replace rows [start, start + n) of the given columns
+        Kept rollups are patched by adding the per-row change to each
+        affected group, instead of being recomputed
+        """
+        for column, new in values.items():
+            if column not in self.numeric:
+                raise ValueError(f"Cannot revise non-numeric column '{column}'")
+            new = np.asarray(new, dtype=np.float64)
+            stop = start + len(new)
+            if start < 0 or stop > len(self.frame):
+                raise ValueError(f"Revision rows {start}:{stop} outside the forecast")
+            col = self.frame.columns.get_loc(column)
+            delta = new - self.frame[column].to_numpy(dtype=np.float64)[start:stop]
+            self.frame.iloc[start:stop, col] = new
+
+            j = self.numeric.index(column)
+            for roll in self._rollups.values():
+                np.add.at(roll['sums'][:, j], roll['group'][start:stop], delta)
+        return self
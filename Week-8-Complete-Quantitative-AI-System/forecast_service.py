@@ -0,0 +1,250 @@
+# forecast_service.py
+# Quantitative AI - HTTP Forecast Service with Cached, Coalesced and Micro-Batched Requests
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+import pandas as pd
+from quant_forecast.ensemble_forecast import EnsembleForecaster, ML_COMPONENTS
+from quant_forecast.forecast_result import ForecastResult
+from quant_forecast.hyperparameter_search import data_fingerprint
+from quant_forecast.shared_data import DEFAULT_DATA
+
+LEVELS = {'daily': None, 'weekly': 'W', 'monthly': 'M', 'quarterly': 'Q'}
+MAX_HORIZON = 3 * 365
+
+
+class ForecastService:
+    """
+    On-demand forecasts from a fitted EnsembleForecaster
+    Responses are cached (LRU) by data version and parameters, identical
+    in-flight requests share one computation, and distinct requests that
+    arrive within batch_window are answered by a single multi-origin
+    recursive forecast
+    """
+
+    def __init__(self, ensemble, cache_size=256, batch_window=0.01, max_batch=64):
+        """Initialize with an ensemble; fits (or loads registered) models once"""
+        self.ensemble = ensemble
+        self.forecast = ensemble.create_ensemble_forecast()
+        self.ml = ensemble.ml_forecaster
+        self.observed = self.ml.data['volume'].to_numpy(dtype=np.float64)
+        self.dates = self.ml.data.index
+        self.data_version = data_fingerprint(self.observed, self.dates.asi8)
+
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0,
+                      'batches': 0, 'batched_requests': 0, 'computed': 0}
+
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.batcher = threading.Thread(target=self._batch_loop, daemon=True)
+        self.batcher.start()
+
+    def parse(self, params):
+        """Validate query parameters into (origin position, horizon, level)"""
+        horizon = int(params.get('horizon', 390))
+        if not 1 <= horizon <= MAX_HORIZON:
+            raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+        level = params.get('level', 'daily')
+        if level not in LEVELS:
+            raise ValueError(f"level must be one of {list(LEVELS)}")
+        origin = len(self.observed)
+        if params.get('as_of'):
+            # Forecast from the day after as_of, using only data up to it
+            origin = int(self.dates.searchsorted(pd.Timestamp(params['as_of']), side='right'))
+            if origin <= self.ml.feature_builder.min_history:
+                raise ValueError("as_of leaves too little history for the features")
+        return origin, horizon, level
+
+    def get(self, params):
+        """Forecast payload for the request (dict) and whether it came from cache"""
+        origin, horizon, level = self.parse(params)
+        key = (self.data_version, origin, horizon, level)
+
+        with self.lock:
+            self.stats['requests'] += 1
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.stats['cache_hits'] += 1
+                return self.cache[key], True
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.stats['coalesced'] += 1
+                owner = False
+            else:
+                future = Future()
+                self.in_flight[key] = future
+                owner = True
+
+        if owner:
+            self.requests.put((origin, horizon, level, key, future))
+        payload = future.result()
+        return payload, False
+
+    def _batch_loop(self):
+        """Collect requests for batch_window seconds, then answer them together"""
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            # A failure must reach every waiting request, and never stop this thread
+            try:
+                self._run_batch(batch)
+            except Exception as error:
+                self._fail(batch, error)
+
+    def _fail(self, batch, error):
+        """
+        Fail every request of a batch, coalesced waiters included (they
+        share its futures); wrapped so callers can tell it from a bad request
+        """
+        failure = RuntimeError(f"forecast failed: {error}")
+        failure.__cause__ = error
+        with self.lock:
+            for *_, key, _ in batch:
+                self.in_flight.pop(key, None)
+        for *_, future in batch:
+            if not future.done():
+                future.set_exception(failure)
+
+    def _run_batch(self, batch):
+        """One vectorized forecast for every distinct origin in the batch"""
+        origins = np.array(sorted({origin for origin, *_ in batch}))
+        periods = max(horizon for _, horizon, *_ in batch)
+        paths = self.daily_paths(origins, periods)
+        row = {origin: i for i, origin in enumerate(origins)}
+        payloads = [self.payload(paths, row[origin], origin, horizon, level)
+                    for origin, horizon, level, _, _ in batch]
+
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['batched_requests'] += len(batch)
+            self.stats['computed'] += len(batch)
+            for payload, (*_, key, future) in zip(payloads, batch):
+                self.cache[key] = payload
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+                self.in_flight.pop(key, None)
+        for payload, (*_, future) in zip(payloads, batch):
+            future.set_result(payload)
+
+    def daily_paths(self, origins, periods):
+        """
+        Weighted ensemble and conformal bounds, (origins x periods) each,
+        from a single recursive forecast over all origins
+        """
+        predictions, _ = self.ml.recursive_forecast(origins, periods)
+        components = self.ensemble.stat_forecaster.backtest_forecasts(origins, periods)
+        for name, column in ML_COMPONENTS.items():
+            components[name] = predictions[column]
+        weight_model = self.ensemble.weight_model
+        stacked = weight_model.stack(components)
+        weighted = np.einsum('ohk,hk->oh', stacked, weight_model.horizon_weights(periods))
+        width = self.ml.conformal.horizon_widths(periods)
+        return {'forecast': weighted, 'lower': weighted - width, 'upper': weighted + width}
+
+    def payload(self, paths, row, origin, horizon, level):
+        """JSON-ready forecast for one request, rolled up to its level"""
+        start = self.dates[origin - 1] + pd.Timedelta(days=1)
+        frame = pd.DataFrame({
+            'date': pd.date_range(start, periods=horizon, freq='D'),
+            'forecast': paths['forecast'][row, :horizon],
+            'lower': paths['lower'][row, :horizon],
+            'upper': paths['upper'][row, :horizon]
+        })
+        if LEVELS[level] is not None:
+            frame = ForecastResult(frame).aggregate(LEVELS[level]).reset_index()
+        frame['date'] = frame['date'].dt.strftime('%Y-%m-%d')
+        return {
+            'data_version': self.data_version,
+            'as_of': self.dates[origin - 1].strftime('%Y-%m-%d'),
+            'horizon': horizon,
+            'level': level,
+            'forecast': frame.round(1).to_dict(orient='records')
+        }
+
+
+class ForecastHandler(BaseHTTPRequestHandler):
+    """GET /forecast?horizon=&level=&as_of=, /stats and /health"""
+
+    service = None
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self.send_json(200, {'status': 'ok', 'data_version': self.service.data_version})
+        elif url.path == '/stats':
+            with self.service.lock:
+                self.send_json(200, dict(self.service.stats, cached=len(self.service.cache)))
+        elif url.path == '/forecast':
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                payload, cached = self.service.get(params)
+            except ValueError as error:
+                self.send_json(400, {'error': str(error)})
+                return
+            except Exception as error:
+                self.send_json(500, {'error': str(error)})
+                return
+            self.send_json(200, dict(payload, cached=cached))
+        else:
+            self.send_json(404, {'error': f'unknown path {url.path}'})
+
+    def log_message(self, format, *args):
+        """Keep request logging off the console"""
+
+
+def serve(service, host='127.0.0.1', port=8000):
+    """HTTP server bound to the service (call serve_forever to run it)"""
+    handler = type('BoundForecastHandler', (ForecastHandler,), {'service': service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve ensemble forecasts over HTTP")
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--cache-size', type=int, default=256)
+    parser.add_argument('--batch-window-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    service = ForecastService(EnsembleForecaster(args.data), cache_size=args.cache_size,
+                              batch_window=args.batch_window_ms / 1000)
+    server = serve(service, args.host, args.port)
+    print(f"\n\033[92m🌐 Forecast service on http://{args.host}:{server.server_port}/forecast\033[0m")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
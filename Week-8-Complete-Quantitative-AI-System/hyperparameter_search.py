@@ -0,0 +1,308 @@
+# hyperparameter_search.py
+# Quantitative AI - Hyperparameter Search for the ML Forecaster
+import hashlib
+import json
+import math
+import os
+import time
+import numpy as np
+import xgboost as xgb
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import TimeSeriesSplit
+from quant_forecast.xgb_matrix_cache import XGBMatrixCache
+
+# Search spaces: a list means "pick one", a tuple means (distribution, low, high)
+DEFAULT_SEARCH_SPACE = {
+    'rf': {
+        'max_depth': [4, 6, 8, 10, 14, 20, None],
+        'min_samples_leaf': [1, 2, 4, 8],
+        'max_features': [1.0, 0.7, 0.5, 'sqrt']
+    },
+    'xgb': {
+        'max_depth': [3, 4, 5, 6, 8],
+        'learning_rate': ('loguniform', 0.01, 0.3),
+        'subsample': ('uniform', 0.6, 1.0),
+        'colsample_bytree': ('uniform', 0.5, 1.0),
+        'min_child_weight': [1, 3, 5, 10],
+        'reg_lambda': ('loguniform', 0.1, 10.0)
+    }
+}
+
+# Boosting rounds without improvement before a fold stops early
+EARLY_STOPPING_ROUNDS = 20
+
+
+def data_fingerprint(*arrays):
+    """Short SHA-1 of the raw bytes, shape and dtype of the given arrays"""
+    digest = hashlib.sha1()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.shape, array.dtype.str)).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def sample_params(space, rng):
+    """Draw one configuration from a search space"""
+    params = {}
+    for name, spec in space.items():
+        if isinstance(spec, list):
+            value = spec[rng.integers(len(spec))]
+        else:
+            dist, low, high = spec
+            if dist == 'loguniform':
+                value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            elif dist == 'randint':
+                value = int(rng.integers(low, high + 1))
+            else:
+                value = float(rng.uniform(low, high))
+        # Keep values JSON-friendly for the trial history
+        if isinstance(value, np.generic):
+            value = value.item()
+        params[name] = value
+    return params
+
+
+# Worker state: the feature matrix is shipped once per process, not per trial
+_WORKER = {}
+
+
+def _init_worker(X, y, folds):
+    """Process pool initializer holding the shared feature matrix"""
+    _WORKER['X'] = X
+    _WORKER['y'] = y
+    _WORKER['folds'] = folds
+    _WORKER['cache'] = None
+
+
+def _fold_dmatrices(k):
+    """Train/validation matrices for fold k from the worker's XGBoost matrix cache"""
+    if _WORKER['cache'] is None:
+        _WORKER['cache'] = XGBMatrixCache(_WORKER['X'], _WORKER['y'], n_threads=1)
+    train_idx, val_idx = _WORKER['folds'][k]
+    cache = _WORKER['cache']
+    # Time-series folds are contiguous row ranges
+    train_rows = (train_idx[0], train_idx[-1] + 1)
+    return (cache.matrix(*train_rows),
+            cache.matrix(val_idx[0], val_idx[-1] + 1, train_rows=train_rows))
+
+
+def _evaluate_trial(model_name, params, budget, boosters=None):
+    """
+    Score one configuration on every time-series fold
+    budget is the number of trees (forest) or boosting rounds (XGBoost);
+    XGBoost trials continue from the boosters of their previous rung
+    """
+    X, y = _WORKER['X'], _WORKER['y']
+    fold_scores = []
+    n_estimators = []
+    new_boosters = []
+
+    for k, (train_idx, val_idx) in enumerate(_WORKER['folds']):
+        if model_name == 'xgb':
+            dtrain, dval = _fold_dmatrices(k)
+            previous = None
+            done_rounds = 0
+            if boosters is not None:
+                previous = xgb.Booster()
+                previous.load_model(bytearray(boosters[k]))
+                done_rounds = previous.num_boosted_rounds()
+            booster = xgb.train(
+                {**params, 'objective': 'reg:squarederror', 'tree_method': 'hist',
+                 'nthread': 1, 'seed': 42},
+                dtrain,
+                num_boost_round=max(budget - done_rounds, 1),
+                evals=[(dval, 'val')],
+                early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                xgb_model=previous,
+                verbose_eval=False
+            )
+            best_round = booster.best_iteration + 1
+            pred = booster.predict(dval, iteration_range=(0, best_round))
+            n_estimators.append(best_round)
+            new_boosters.append(bytes(booster.save_raw(raw_format='ubj')))
+        else:
+            model = RandomForestRegressor(n_estimators=budget, random_state=42,
+                                          n_jobs=1, **params)
+            model.fit(X[train_idx], y[train_idx])
+            pred = model.predict(X[val_idx])
+            n_estimators.append(budget)
+        fold_scores.append(float(mean_absolute_error(y[val_idx], pred)))
+
+    return {
+        'score': float(np.mean(fold_scores)),
+        'fold_scores': fold_scores,
+        'n_estimators': int(round(np.mean(n_estimators))),
+        'boosters': new_boosters or None
+    }
+
+
+class HyperparameterSearch:
+    """
+    Random, successive-halving and Hyperband search over the ML models
+    Candidates are scored by mean MAE on expanding time-series folds in a
+    process pool; every trial is saved so a resumed search skips it
+    """
+
+    def __init__(self, X, y, n_splits=4, history_path='search_history.json',
+                 n_workers=None, eta=3, min_budget=25, max_budget=400,
+                 search_space=None, seed=42):
+        """Initialize with the cached feature matrix and target"""
+        self.X = np.ascontiguousarray(X)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.folds = list(TimeSeriesSplit(n_splits=n_splits).split(self.X))
+        self.n_splits = n_splits
+        self.history_path = history_path
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.eta = eta
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.search_space = search_space or DEFAULT_SEARCH_SPACE
+        self.rng = np.random.default_rng(seed)
+        self.fingerprint = data_fingerprint(self.X, self.y)
+        self.history = self.load_history()
+
+        print("\n\033[96m🔎 HYPERPARAMETER SEARCH\033[0m")
+        print(f"  {len(self.folds)} time-series folds, {self.n_workers} workers")
+        print(f"  {len(self.history)} trials loaded from {history_path}")
+
+    def load_history(self):
+        """Load previous trials for this exact feature matrix"""
+        if not self.history_path or not os.path.exists(self.history_path):
+            return {}
+        with open(self.history_path) as f:
+            saved = json.load(f)
+        return saved.get('trials', {}) if saved.get('fingerprint') == self.fingerprint else {}
+
+    def save_history(self):
+        """Persist every trial so far"""
+        if not self.history_path:
+            return
+        with open(self.history_path, 'w') as f:
+            json.dump({'fingerprint': self.fingerprint, 'trials': self.history}, f, indent=2)
+
+    def trial_key(self, model_name, params, budget):
+        """Stable identifier of a (model, params, budget) trial"""
+        payload = json.dumps([model_name, params, budget, self.n_splits, self.fingerprint],
+                             sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+    def _run_rung(self, pool, model_name, configs, budget, boosters=None):
+        """Evaluate configs at one budget, reusing saved trials where possible"""
+        boosters = boosters or [None] * len(configs)
+        results = [None] * len(configs)
+        pending = {}
+
+        for i, params in enumerate(configs):
+            key = self.trial_key(model_name, params, budget)
+            if key in self.history:
+                results[i] = dict(self.history[key], boosters=None)
+            else:
+                pending[i] = (key, pool.submit(_evaluate_trial, model_name, params,
+                                               budget, boosters[i]))
+
+        for i, (key, future) in pending.items():
+            result = future.result()
+            self.history[key] = {
+                'model': model_name,
+                'params': configs[i],
+                'budget': budget,
+                'score': result['score'],
+                'fold_scores': result['fold_scores'],
+                'n_estimators': result['n_estimators']
+            }
+            results[i] = result
+
+        self.save_history()
+        print(f"  {model_name} budget={budget:<4} evaluated {len(pending)}, "
+              f"reused {len(configs) - len(pending)}, "
+              f"best MAE {min(r['score'] for r in results):.2f}")
+        return results
+
+    def _pool(self):
+        """Process pool with the feature matrix preloaded in each worker"""
+        return ProcessPoolExecutor(max_workers=self.n_workers, initializer=_init_worker,
+                                   initargs=(self.X, self.y, self.folds))
+
+    def random_search(self, model_name, n_trials=20, budget=None):
+        """Evaluate n_trials random configurations at a single budget"""
+        budget = budget or self.max_budget
+        configs = [sample_params(self.search_space[model_name], self.rng)
+                   for _ in range(n_trials)]
+        with self._pool() as pool:
+            self._run_rung(pool, model_name, configs, budget)
+        return self.best(model_name)
+
+    def successive_halving(self, model_name, n_trials=27, min_budget=None,
+                           max_budget=None, configs=None):
+        """
+        Start many configurations on a small budget, keep the best 1/eta
+        and grow their budget by eta; rungs are spaced back from max_budget
+        so the survivors always finish there, where best() compares them
+        """
+        min_budget = min_budget or self.min_budget
+        max_budget = max_budget or self.max_budget
+        configs = configs or [sample_params(self.search_space[model_name], self.rng)
+                              for _ in range(n_trials)]
+        n_rungs = int(math.log(max_budget / min_budget, self.eta) + 1e-9)
+        budgets = [int(round(max_budget * self.eta ** -k)) for k in range(n_rungs, -1, -1)]
+        boosters = None
+
+        with self._pool() as pool:
+            for rung, budget in enumerate(budgets):
+                if rung:
+                    # Prune: only the top 1/eta survive (a last one keeps going)
+                    keep = max(len(configs) // self.eta, 1)
+                    order = np.argsort([r['score'] for r in results])[:keep]
+                    configs = [configs[i] for i in order]
+                    boosters = [results[i]['boosters'] for i in order]
+                results = self._run_rung(pool, model_name, configs, budget, boosters)
+
+        return self.best(model_name)
+
+    def hyperband(self, model_name, n_trials=None):
+        """
+        Successive halving brackets trading trial count against budget
+        n_trials sets the total configurations over all brackets; each
+        bracket keeps its standard share of them (at least one)
+        """
+        s_max = int(math.log(self.max_budget / self.min_budget, self.eta) + 1e-9)
+        brackets = list(range(s_max, -1, -1))
+        sizes = [(s_max + 1) / (s + 1) * self.eta ** s for s in brackets]
+        scale = n_trials / sum(sizes) if n_trials else 1.0
+        for s, size in zip(brackets, sizes):
+            n_configs = max(int(math.ceil(size * scale)), 1)
+            min_budget = int(round(self.max_budget * self.eta ** -s))
+            print(f"\n  Bracket s={s}: {n_configs} trials from budget {min_budget}")
+            self.successive_halving(model_name, n_trials=n_configs, min_budget=min_budget)
+        return self.best(model_name)
+
+    def best(self, model_name):
+        """Best trial so far at the largest budget evaluated for the model"""
+        trials = [t for t in self.history.values() if t['model'] == model_name]
+        if not trials:
+            return None
+        top_budget = max(t['budget'] for t in trials)
+        return min((t for t in trials if t['budget'] == top_budget),
+                   key=lambda t: t['score'])
+
+    def run(self, models=('rf', 'xgb'), schedule='hyperband', n_trials=20):
+        """Search every model and return the best params per model"""
+        start = time.perf_counter()
+        best = {}
+        for model_name in models:
+            print(f"\n\033[93m🔧 Tuning {model_name} ({schedule})\033[0m")
+            if schedule == 'random':
+                trial = self.random_search(model_name, n_trials=n_trials)
+            elif schedule == 'halving':
+                trial = self.successive_halving(model_name, n_trials=n_trials)
+            elif schedule == 'hyperband':
+                trial = self.hyperband(model_name, n_trials=n_trials)
+            else:
+                raise ValueError(f"Unknown schedule '{schedule}', expected random, halving or hyperband")
+            best[model_name] = dict(trial['params'], n_estimators=trial['n_estimators'])
+            print(f"  ✓ Best {model_name}: MAE {trial['score']:.2f} {best[model_name]}")
+        print(f"\n✓ Search finished in {time.perf_counter() - start:.1f}s")
+        return best
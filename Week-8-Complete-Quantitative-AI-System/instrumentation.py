@@ -0,0 +1,195 @@
+# instrumentation.py
+# Quantitative AI - Timers, Counters and Run Reports for the Forecasting Pipeline
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None when unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB (None when unavailable)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 1024**2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def instrumented(name):
+    """Method decorator timing each call as a stage of self.instrumentation"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class Instrumentation:
+    """
+    Context-manager stage timers and counters for a forecasting run
+    Optional cProfile and tracemalloc capture; everything ends up in a
+    machine-readable JSON report
+    """
+
+    def __init__(self, enabled=True, profile=False, trace_memory=False):
+        """Initialize; enabled=False turns every stage into a no-op"""
+        self.enabled = enabled
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.counters = {}
+        self.memory = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.profiler = None
+        self.started = None
+
+    def start(self):
+        """Begin the run clock and any optional capture"""
+        self.started = time.perf_counter()
+        self.started_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profile:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return self
+
+    def stop(self):
+        """Stop optional capture and the run clock"""
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.wall_time = time.perf_counter() - self.started if self.started else None
+
+    def _stack(self):
+        """Open stages of the current thread (threads time their own fits)"""
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block and count its calls under name"""
+        if not self.enabled:
+            yield
+            return
+
+        stack = self._stack()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # Hand the peak so far to the enclosing stages before resetting it
+            peak = tracemalloc.get_traced_memory()[1]
+            for entry in stack:
+                entry['peak'] = max(entry['peak'], peak)
+            tracemalloc.reset_peak()
+        entry = {'peak': 0}
+        stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                entry['peak'] = max(entry['peak'], peak)
+                for parent in stack:
+                    parent['peak'] = max(parent['peak'], peak)
+
+            with self.lock:
+                stats = self.stages.setdefault(name, {
+                    'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'peak_traced_mb': None
+                })
+                stats['calls'] += 1
+                stats['total_s'] += elapsed
+                stats['max_s'] = max(stats['max_s'], elapsed)
+                if tracing:
+                    stats['peak_traced_mb'] = max(stats['peak_traced_mb'] or 0.0,
+                                                  entry['peak'] / 1024**2)
+
+    def count(self, name, n=1):
+        """Add n to a named counter"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def memory_checkpoint(self, label):
+        """Record current and peak RSS at a named point of the run"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.memory[label] = {'rss_mb': current_rss_mb(), 'peak_rss_mb': peak_rss_mb()}
+
+    def profile_top(self, limit=15):
+        """Top functions by cumulative time from the cProfile capture"""
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        top = []
+        for (filename, line, func), (_, nc, tt, ct, _) in stats.stats.items():
+            top.append({'function': f'{filename}:{line}({func})', 'calls': nc,
+                        'tottime_s': tt, 'cumtime_s': ct})
+        return sorted(top, key=lambda row: row['cumtime_s'], reverse=True)[:limit]
+
+    def report(self):
+        """Run report as a JSON-serialisable dict"""
+        stages = {}
+        for name, stats in self.stages.items():
+            stages[name] = dict(stats, mean_s=stats['total_s'] / stats['calls'])
+        return {
+            'started': getattr(self, 'started_at', None),
+            'wall_time_s': getattr(self, 'wall_time', None),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': stages,
+            'counters': dict(self.counters),
+            'memory': dict(self.memory),
+            'profile_top': self.profile_top()
+        }
+
+    def save_report(self, path='run_report.json', profile_path='run_profile.prof'):
+        """Write the JSON report (and raw cProfile stats when profiling)"""
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        if self.profiler is not None:
+            self.profiler.dump_stats(profile_path)
+        return path
+
+    def print_summary(self):
+        """Print stages sorted by total time"""
+        print("\n\033[96m⏱️  RUN PROFILE:\033[0m")
+        print(f"  {'Stage':<28}{'Calls':>7}{'Total (s)':>11}{'Mean (ms)':>11}")
+        for name, stats in sorted(self.stages.items(), key=lambda kv: -kv[1]['total_s']):
+            mean_ms = stats['total_s'] / stats['calls'] * 1000
+            print(f"  {name:<28}{stats['calls']:>7}{stats['total_s']:>11.3f}{mean_ms:>11.2f}")
+        for label, snapshot in self.memory.items():
+            if snapshot['rss_mb'] is not None:
+                print(f"  RSS {label:<22} {snapshot['rss_mb']:8.1f} MB "
+                      f"(peak {snapshot['peak_rss_mb']:.1f} MB)")
+        rss = peak_rss_mb()
+        if rss is not None:
+            print(f"  Peak RSS: {rss:.1f} MB")
@@ -0,0 +1,74 @@
+# load_test_service.py
+# Local load test for forecast_service: throughput, latency percentiles and cache/batch counters
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import urlopen
+import numpy as np
+
+
+def fetch(url):
+    """Latency in ms of one GET"""
+    start = time.perf_counter()
+    with urlopen(url) as response:
+        json.loads(response.read())
+    return (time.perf_counter() - start) * 1000
+
+
+def request_mix(base, n_requests, n_distinct, seed=0):
+    """URLs drawn from n_distinct parameter sets, so repeats hit the cache or coalesce"""
+    rng = np.random.default_rng(seed)
+    levels = ['daily', 'weekly', 'monthly', 'quarterly']
+    as_of = [f'2023-{m:02d}-15' for m in range(1, 13)] + ['']
+    choices = [f"{base}/forecast?horizon={int(rng.integers(7, 391))}"
+               f"&level={levels[rng.integers(4)]}&as_of={as_of[rng.integers(len(as_of))]}"
+               for _ in range(n_distinct)]
+    return [choices[i] for i in rng.integers(n_distinct, size=n_requests)]
+
+
+def main(url=None, n_requests=500, concurrency=16, n_distinct=60):
+    print("\033[91m" + "="*60)  # Red
+    print("\033[97m" + "    🌐 FORECAST SERVICE LOAD TEST")  # White
+    print("\033[94m" + "="*60 + "\033[0m")  # Blue
+
+    server = None
+    if url is None:
+        # No URL given: start the service in this process on a free port
+        from quant_forecast.ensemble_forecast import EnsembleForecaster
+        from quant_forecast.forecast_service import ForecastService, serve
+        from quant_forecast.shared_data import DEFAULT_DATA
+        service = ForecastService(EnsembleForecaster(DEFAULT_DATA))
+        server = serve(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}"
+
+    urls = request_mix(url, n_requests, n_distinct)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(fetch, urls)))
+    elapsed = time.perf_counter() - start
+
+    with urlopen(f"{url}/stats") as response:
+        stats = json.loads(response.read())
+
+    print(f"\n{n_requests} requests ({n_distinct} distinct), concurrency {concurrency}")
+    print(f"  Throughput: {n_requests / elapsed:,.0f} req/s")
+    print(f"  Latency p50 {np.percentile(latencies, 50):.1f} ms, "
+          f"p95 {np.percentile(latencies, 95):.1f} ms, max {latencies.max():.1f} ms")
+    print(f"  Cache hits {stats['cache_hits']}, coalesced {stats['coalesced']}, "
+          f"computed {stats['computed']} in {stats['batches']} batches")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the forecast service")
+    parser.add_argument('--url', help="running service (default: start one in-process)")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--distinct', type=int, default=60)
+    args = parser.parse_args()
+    main(args.url, args.requests, args.concurrency, args.distinct)
@@ -4,9 +4,15 @@ import pandas as pd
 import numpy as np 
 from sklearn.ensemble import RandomForestRegressor 
 from sklearn.linear_model import LinearRegression 
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score 
-from scipy import stats 
 import xgboost as xgb 
+from quant_forecast.training_scheduler import TrainingScheduler
+from quant_forecast.hyperparameter_search import HyperparameterSearch
+from quant_forecast.feature_builder import FeatureBuilder, DEFAULT_FEATURE_CONFIG
+from quant_forecast.prediction_intervals import ConformalIntervals, QuantileIntervals, coverage
+from quant_forecast.tree_compiler import compile_models
+from quant_forecast.xgb_matrix_cache import XGBMatrixCache, BoosterRegressor
+from quant_forecast.instrumentation import Instrumentation, instrumented
+from quant_forecast.forecast_result import ForecastResult
 import warnings 
 warnings.filterwarnings('ignore') 
 class QuantitativeMLForecaster: 
@@ -16,127 +22,178 @@ class QuantitativeMLForecaster:
     Focus on numerical feature engineering and statistical validation 
     """ 
      
-    def __init__(self, data): 
+    def __init__(self, data, feature_config=None, instrumentation=None): 
         """Initialize with quantitative dataset""" 
         self.data = data 
+        self.instrumentation = instrumentation or Instrumentation() 
+        self.feature_config = {**DEFAULT_FEATURE_CONFIG, **(feature_config or {})} 
+        self.feature_matrix = None 
+        self.quantile_model = None 
+        self.quantile_alpha = None 
+        self.quantile_correction = 0.0 
         self.models = {} 
         self.predictions = {} 
         self.metrics = {} 
          
+        # Model hyperparameters (defaults, replaced by tune_hyperparameters) 
+        self.model_params = { 
+            'rf': {'n_estimators': 100, 'max_depth': 10}, 
+            'xgb': {'n_estimators': 100, 'max_depth': 5, 'learning_rate': 0.1} 
+        } 
+         
         # Quantitative AI banner 
         print("\033[91m" + "="*60)  # Red 
         print("\033[97m" + "    🤖 QUANTITATIVE ML FORECASTER 🤖")  # White 
         print("\033[94m" + "="*60 + "\033[0m")  # Blue 
          
-    def engineer_quantitative_features(self, window=30): 
-        """Create numerical features using mathematical transformations""" 
+    @instrumented('engineer_features') 
+    def engineer_quantitative_features(self, window=None): 
+        """Create numerical features as one contiguous float32 matrix""" 
         print("\n\033[96m📊 ENGINEERING QUANTITATIVE FEATURES...\033[0m") 
          
-        df = self.data.copy() 
-         
-        # Lag features (autoregressive components) 
-        for i in range(1, window + 1): 
-            df[f'lag_{i}'] = df['volume'].shift(i) 
-         
-        # Statistical rolling features 
-        df['rolling_mean_7'] = df['volume'].rolling(7).mean() 
-        df['rolling_mean_30'] = df['volume'].rolling(30).mean() 
-        df['rolling_std_7'] = df['volume'].rolling(7).std() 
-        df['rolling_std_30'] = df['volume'].rolling(30).std() 
-        df['rolling_min_7'] = df['volume'].rolling(7).min() 
-        df['rolling_max_7'] = df['volume'].rolling(7).max() 
-         
-        # Mathematical transformations 
-        df['log_volume'] = np.log1p(df['volume'])  # Log transformation 
-        df['sqrt_volume'] = np.sqrt(df['volume'])  # Square root transformation 
-        df['volume_squared'] = df['volume'] ** 2  # Polynomial feature 
-         
-        # Numerical time encoding 
-        df['day_of_week'] = df.index.dayofweek 
-        df['day_of_month'] = df.index.day 
-        df['month'] = df.index.month 
-        df['quarter'] = df.index.quarter 
-        df['year'] = df.index.year 
-        df['day_sin'] = np.sin(2 * np.pi * df.index.dayofyear / 365) 
-        df['day_cos'] = np.cos(2 * np.pi * df.index.dayofyear / 365) 
-         
-        # Binary indicators (mathematical step functions) 
-        df['is_weekend'] = (df['day_of_week'] >= 5).astype(int) 
-        df['is_month_end'] = (df.index.day > 25).astype(int) 
-         
-        # Linear time index for trend 
-        df['time_index'] = range(len(df)) 
-         
-        # Drop NaN rows from lag features 
-        df = df.dropna() 
-         
-        print(f"✓ Engineered {len(df.columns)-1} quantitative features") 
-        print(f"✓ Feature dimensionality: {df.shape[1]-1}") 
-        print(f"✓ Sample size: {len(df)} observations") 
-         
-        return df 
+        # window overrides the number of lag features for this build 
+        config = dict(self.feature_config) 
+        if window is not None: 
+            config['lags'] = window 
+        self.feature_builder = FeatureBuilder(config) 
+        matrix = self.feature_builder.build(self.data['volume']) 
+         
+        print(f"✓ Engineered {matrix.shape[1]} quantitative features") 
+        print(f"✓ Feature dimensionality: {matrix.shape[1]} ({matrix.values.dtype})") 
+        print(f"✓ Sample size: {matrix.shape[0]} observations") 
+        print(f"✓ Memory footprint: {matrix.nbytes / 1024:.1f} KB") 
+         
+        return matrix 
     
     def prepare_ml_features(self):
         """Prepare features for training and forecasting."""
-        try:
-            # If features already engineered and cached
-            if hasattr(self, 'feature_df') and self.feature_df is not None:
-                return self.feature_df
-        except AttributeError:
-            pass
-        # Engineer features and cache
-        self.feature_df = self.engineer_quantitative_features()
-        return self.feature_df
+        # Engineer features once and cache the matrix
+        if self.feature_matrix is None:
+            self.feature_matrix = self.engineer_quantitative_features()
+        return self.feature_matrix
      
-    def train_models(self, test_size=90): 
-        """Train multiple ML models""" 
+    def xgb_matrix_cache(self, train_rows=None): 
+        """ 
+        XGBoost matrices over the cached feature array, built once per 
+        feature matrix and training window (whose rows alone set the bins) 
+        """ 
+        matrix = self.prepare_ml_features() 
+        cached_for = getattr(self, '_xgb_cache_for', (None, None)) 
+        if cached_for[0] is not matrix or cached_for[1] != train_rows: 
+            self.xgb_cache = XGBMatrixCache(matrix.values, matrix.target, train_rows=train_rows) 
+            self._xgb_cache_for = (matrix, train_rows) 
+        return self.xgb_cache 
+     
+    def model_specs(self, train_rows=None): 
+        """ 
+        Model factories keyed by name, each taking a thread budget 
+        With train_rows, XGBoost trains natively on the cached hist matrix 
+        """ 
+        if train_rows is not None: 
+            cache = self.xgb_matrix_cache(train_rows) 
+            xgb_factory = lambda n_threads: BoosterRegressor( 
+                self.model_params['xgb'], cache, train_rows, n_threads 
+            ) 
+        else: 
+            xgb_factory = lambda n_threads: xgb.XGBRegressor( 
+                **self.model_params['xgb'], 
+                random_state=42, 
+                n_jobs=n_threads 
+            ) 
+        return { 
+            # 1. Linear Regression (baseline ML) - cheap, one core is enough 
+            'linear': { 
+                'label': '📈 Linear Regression', 
+                'factory': lambda n_threads: LinearRegression(), 
+                'weight': 0 
+            }, 
+            # 2. Random Forest (ensemble method from Ch 18) 
+            'rf': { 
+                'label': '🌲 Random Forest', 
+                'factory': lambda n_threads: RandomForestRegressor( 
+                    **self.model_params['rf'], 
+                    random_state=42, 
+                    n_jobs=n_threads 
+                ), 
+                'weight': 1 
+            }, 
+            # 3. XGBoost (gradient boosting) 
+            'xgb': { 
+                'label': '🚀 XGBoost', 
+                'factory': xgb_factory, 
+                'weight': 1 
+            } 
+        } 
+     
+    @instrumented('tune_hyperparameters') 
+    def tune_hyperparameters(self, schedule='hyperband', n_trials=20, test_size=90, 
+                             history_path='search_history.json', n_workers=None): 
+        """ 
+        Search RF/XGBoost hyperparameters on the training period only 
+        n_trials: configurations per model (split across Hyperband brackets) 
+        """ 
+        matrix = self.prepare_ml_features() 
+         
+        # Hold out the same test window train_models scores on 
+        train_size = len(matrix.target) - test_size 
+        search = HyperparameterSearch( 
+            matrix.values[:train_size], 
+            matrix.target[:train_size], 
+            history_path=history_path, 
+            n_workers=n_workers 
+        ) 
+        best = search.run(schedule=schedule, n_trials=n_trials) 
+        self.model_params.update(best) 
+        return best 
+     
+    @instrumented('train_models') 
+    def train_models(self, test_size=90, parallel=True, n_cores=None, xgb_cache=True): 
+        """ 
+        Train multiple ML models (concurrently under a core budget) 
+        xgb_cache trains XGBoost on the reusable hist matrix instead of 
+        letting XGBRegressor rebuild its matrix from the arrays 
+        """ 
         print("\n\033[93m🎓 TRAINING ML MODELS...\033[0m") 
          
         # Prepare features 
-        df = self.prepare_ml_features() 
+        matrix = self.prepare_ml_features() 
          
         # Split features and target 
-        feature_cols = [col for col in df.columns if col != 'volume'] 
-        X = df[feature_cols] 
-        y = df['volume'] 
+        feature_cols = matrix.columns 
+        X = matrix.values 
+        y = matrix.target 
          
         # Time series split (no shuffle!) 
         train_size = len(X) - test_size 
         X_train, X_test = X[:train_size], X[train_size:] 
         y_train, y_test = y[:train_size], y[train_size:] 
-         
-        # 1. Linear Regression (baseline ML) 
-        print("\n  📈 Training Linear Regression...") 
-        self.models['linear'] = LinearRegression() 
-        self.models['linear'].fit(X_train, y_train) 
-        linear_pred = self.models['linear'].predict(X_test) 
-        linear_mae = mean_absolute_error(y_test, linear_pred) 
-        print(f"     MAE: {linear_mae:.2f}") 
-         
-        # 2. Random Forest (ensemble method from Ch 18) 
-        print("\n  🌲 Training Random Forest...") 
-        self.models['rf'] = RandomForestRegressor( 
-            n_estimators=100,  
-            max_depth=10, 
-            random_state=42 
-        ) 
-        self.models['rf'].fit(X_train, y_train) 
-        rf_pred = self.models['rf'].predict(X_test) 
-        rf_mae = mean_absolute_error(y_test, rf_pred) 
-        print(f"     MAE: {rf_mae:.2f}") 
-         
-        # 3. XGBoost (gradient boosting) 
-        print("\n  🚀 Training XGBoost...") 
-        self.models['xgb'] = xgb.XGBRegressor( 
-            n_estimators=100, 
-            max_depth=5, 
-            learning_rate=0.1, 
-            random_state=42 
-        ) 
-        self.models['xgb'].fit(X_train, y_train) 
-        xgb_pred = self.models['xgb'].predict(X_test) 
-        xgb_mae = mean_absolute_error(y_test, xgb_pred) 
-        print(f"     MAE: {xgb_mae:.2f}") 
+        self.test_size = test_size 
+         
+        # Fresh point models invalidate any quantile model fitted before 
+        self.quantile_model = None 
+         
+        # Fit all models through the scheduler 
+        specs = self.model_specs(train_rows=(0, train_size) if xgb_cache else None) 
+        self.scheduler = TrainingScheduler(n_cores=n_cores, parallel=parallel, 
+                                           instrumentation=self.instrumentation) 
+        results = self.scheduler.run(specs, X_train, y_train, X_test, y_test) 
+         
+        for name, result in results.items(): 
+            self.models[name] = result['model'] 
+            self.metrics[name] = { 
+                'mae': result['mae'], 
+                'rmse': result['rmse'], 
+                'r2': result['r2'], 
+                'fit_time': result['fit_time'], 
+                'threads': result['threads'] 
+            } 
+            print(f"\n  {specs[name]['label']} ({result['threads']} threads)") 
+            print(f"     MAE: {result['mae']:.2f}") 
+        self.scheduler.print_timings() 
+         
+        linear_pred = results['linear']['predictions'] 
+        rf_pred = results['rf']['predictions'] 
+        xgb_pred = results['xgb']['predictions'] 
          
         # Store test predictions 
         self.test_predictions = { 
@@ -159,82 +216,177 @@ class QuantitativeMLForecaster:
          
         return self.models 
      
+    @instrumented('load_or_train') 
+    def load_or_train(self, registry, test_size=90, **train_kwargs): 
+        """ 
+        Load fitted models from the registry when data and config are unchanged, 
+        otherwise train them. Returns True when the models were loaded 
+        """ 
+        self.prepare_ml_features() 
+        if registry.load(self, test_size): 
+            return True 
+        self.train_models(test_size=test_size, **train_kwargs) 
+        return False 
+     
+    def compiled_models(self): 
+        """Flattened-array predictors for the fitted models (rebuilt when models change)""" 
+        key = tuple(id(model) for model in self.models.values()) 
+        if getattr(self, '_compiled_key', None) != key: 
+            self._compiled = compile_models(self.models) 
+            self._compiled_key = key 
+        return self._compiled 
+     
+    def recursive_forecast(self, origins, periods, compiled=True): 
+        """ 
+        Roll the models forward from several origins at once 
+        Each origin is a position in the observed series; every step builds 
+        one feature row per origin and predicts them in a single batch 
+        (through the compiled tree arrays unless compiled=False) 
+        """ 
+        predictors = self.compiled_models() if compiled else self.models 
+        builder = self.feature_builder 
+        observed = self.data['volume'].to_numpy(dtype=np.float64) 
+        origins = np.asarray(origins) 
+         
+        # One volume path per origin, predictions overwrite from the origin on 
+        paths = np.empty((len(origins), origins.max() + periods)) 
+        paths[:, :len(observed)] = observed[:paths.shape[1]] 
+         
+        predictions = {name: np.empty((len(origins), periods)) for name in self.models} 
+        rows = np.empty((periods, len(origins), len(builder.columns)), dtype=builder.dtype) 
+        start_date = self.data.index[0] 
+         
+        for step in range(periods): 
+            positions = origins + step 
+            dates = start_date + pd.to_timedelta(positions, unit='D') 
+            builder.transform(paths, dates, positions, out=rows[step]) 
+             
+            for model_name, model in predictors.items(): 
+                with self.instrumentation.stage(f'predict.{model_name}'): 
+                    predictions[model_name][:, step] = model.predict(rows[step]) 
+            self.instrumentation.count('forecast_rows', len(origins)) 
+             
+            # Feed the ensemble prediction back as the newest observation 
+            paths[np.arange(len(origins)), positions] = np.mean( 
+                [predictions[name][:, step] for name in self.models], axis=0) 
+         
+        return predictions, rows 
+     
+    @instrumented('backtest_predictions') 
+    def backtest_predictions(self, horizon=None): 
+        """ 
+        Out-of-sample recursive forecasts from every origin in the test window 
+        Returns origins, per-model predictions and actuals (origins x steps), 
+        cached until the models or the horizon change 
+        """ 
+        horizon = horizon or self.test_size // 2 
+        key = (horizon, self.test_size) + tuple(id(model) for model in self.models.values()) 
+        if getattr(self, '_backtest_key', None) != key: 
+            observed = self.data['volume'].to_numpy(dtype=np.float64) 
+            first = len(observed) - self.test_size 
+            origins = np.arange(first, len(observed) - horizon + 1) 
+            predictions, _ = self.recursive_forecast(origins, horizon) 
+            actual = observed[origins[:, None] + np.arange(horizon)] 
+            self._backtest = (origins, predictions, actual) 
+            self._backtest_key = key 
+        return self._backtest 
+     
+    def backtest_residuals(self, horizon=None): 
+        """ 
+        Recursive forecast errors on the held-out test window 
+        Returns residuals with one row per origin and one column per step 
+        """ 
+        _, predictions, actual = self.backtest_predictions(horizon) 
+        ensemble = np.mean([predictions[name] for name in self.models], axis=0) 
+        return actual - ensemble 
+     
+    @instrumented('estimate_intervals') 
+    def estimate_intervals(self, future_rows, ensemble, alpha=0.05): 
+        """Conformal and quantile intervals for every horizon step in one pass""" 
+        print("\n\033[96m📏 ESTIMATING PREDICTION INTERVALS...\033[0m") 
+        matrix = self.prepare_ml_features() 
+        train_size = len(matrix.target) - self.test_size 
+        X_train, y_train = matrix.values[:train_size], matrix.target[:train_size] 
+        X_test, y_test = matrix.values[train_size:], matrix.target[train_size:] 
+         
+        # Split-conformal widths per horizon from backtest residuals 
+        residuals = self.backtest_residuals() 
+        self.conformal = ConformalIntervals(alpha).fit(residuals) 
+        lower, upper = self.conformal.bounds(ensemble) 
+         
+        # Quantile regression: pinball-loss XGBoost and per-tree forest quantiles 
+        # (conformal correction calibrated on a block as long as the test window) 
+        self.quantile_intervals = QuantileIntervals(alpha, calibration_size=self.test_size) 
+        if self.quantile_model is not None and self.quantile_alpha == alpha: 
+            self.quantile_intervals.xgb_model = self.quantile_model 
+            self.quantile_intervals.xgb_correction = self.quantile_correction 
+        else: 
+            self.quantile_intervals.fit_xgb(X_train, y_train, self.model_params['xgb']) 
+            self.quantile_model = self.quantile_intervals.xgb_model 
+            self.quantile_correction = self.quantile_intervals.xgb_correction 
+            self.quantile_alpha = alpha 
+        xgb_lower, xgb_upper = self.quantile_intervals.xgb_bounds(future_rows) 
+        rf_lower, rf_upper = self.quantile_intervals.forest_bounds(self.models['rf'], future_rows) 
+         
+        # Coverage on data the intervals never saw 
+        self.interval_coverage = { 
+            'conformal': self.conformal.holdout_coverage(residuals), 
+            'xgb_quantile': coverage(y_test, *self.quantile_intervals.xgb_bounds(X_test)), 
+            'rf_quantile': coverage(y_test, *self.quantile_intervals.forest_bounds(self.models['rf'], X_test)) 
+        } 
+        print(f"  Target coverage: {1 - alpha:.0%}") 
+        for method, value in self.interval_coverage.items(): 
+            flag = "  ⚠️  below target" if value < 1 - alpha - 0.05 else "" 
+            print(f"  {method:<14} held-out coverage: {value:.1%}{flag}") 
+         
+        return { 
+            'lower_bound': lower, 
+            'upper_bound': upper, 
+            'xgb_lower': xgb_lower, 
+            'xgb_upper': xgb_upper, 
+            'rf_lower': rf_lower, 
+            'rf_upper': rf_upper 
+        } 
+     
+    @instrumented('forecast_future') 
     def forecast_future(self, periods=13*30):  # 13 months 
         """Generate future forecasts""" 
         print("\n\033[95m🔮 GENERATING 13-MONTH FORECAST...\033[0m") 
          
         # Prepare current features 
-        df = self.prepare_ml_features() 
-        feature_cols = [col for col in df.columns if col != 'volume'] 
-         
-        # Initialize forecast storage 
-        forecasts = { 
-            'linear': [], 
-            'rf': [], 
-            'xgb': [] 
-        } 
+        matrix = self.prepare_ml_features() 
+        observed = self.data['volume'].to_numpy(dtype=np.float64) 
          
-        # Use last known features as starting point 
-        last_features = df[feature_cols].iloc[-1:].copy() 
-         
-        # Generate forecasts iteratively 
-        for i in range(periods): 
-            # Update time-based features 
-            future_date = df.index[-1] + pd.Timedelta(days=i+1) 
-            last_features['day_of_week'] = future_date.dayofweek 
-            last_features['day_of_month'] = future_date.day 
-            last_features['month'] = future_date.month 
-            last_features['quarter'] = future_date.quarter 
-            last_features['is_weekend'] = int(future_date.dayofweek >= 5) 
-            last_features['is_month_end'] = int(future_date.day > 25) 
-            last_features['time_index'] = last_features['time_index'] + 1 
-             
-            # Make predictions 
-            for model_name, model in self.models.items(): 
-                pred = model.predict(last_features)[0] 
-                forecasts[model_name].append(pred) 
-             
-            # Update lag features with ensemble prediction 
-            ensemble_pred = np.mean([ 
-                forecasts['linear'][-1], 
-                forecasts['rf'][-1], 
-                forecasts['xgb'][-1] 
-            ]) 
-             
-            # Shift lag features 
-            for lag in range(30, 1, -1): 
-                if f'lag_{lag}' in last_features.columns: 
-                    last_features[f'lag_{lag}'] = last_features[f'lag_{lag-1}'].values 
-            last_features['lag_1'] = ensemble_pred 
+        # Generate forecasts iteratively from the end of the observed data 
+        forecasts, rows = self.recursive_forecast([len(observed)], periods) 
+        future_rows = rows[:, 0, :] 
          
-        # Create forecast DataFrame 
         future_dates = pd.date_range( 
-            start=df.index[-1] + pd.Timedelta(days=1), 
+            start=matrix.index[-1] + pd.Timedelta(days=1), 
             periods=periods, 
             freq='D' 
         ) 
          
+        # Create forecast DataFrame 
         self.forecast_df = pd.DataFrame({ 
             'date': future_dates, 
-            'linear': forecasts['linear'], 
-            'rf': forecasts['rf'], 
-            'xgb': forecasts['xgb'] 
+            'linear': forecasts['linear'][0], 
+            'rf': forecasts['rf'][0], 
+            'xgb': forecasts['xgb'][0] 
         }) 
          
         # Add ensemble forecast 
-        self.forecast_df['ensemble'] = self.forecast_df[['linear', 'rf', 'xgb']].mean(axis=1) 
+        ensemble = np.mean([forecasts[name][0] for name in ('linear', 'rf', 'xgb')], axis=0) 
+        self.forecast_df['ensemble'] = ensemble 
          
-        # Add confidence intervals (using std of models) 
-        self.forecast_df['lower_bound'] = self.forecast_df['ensemble'] - self.forecast_df[['linear', 'rf', 'xgb']].std(axis=1) * 1.96 
-        self.forecast_df['upper_bound'] = self.forecast_df['ensemble'] + self.forecast_df[['linear', 'rf', 'xgb']].std(axis=1) * 1.96 
+        # Add 95% prediction intervals (conformal bounds, quantile bounds alongside) 
+        for column, values in self.estimate_intervals(future_rows, ensemble).items(): 
+            self.forecast_df[column] = values 
          
         # Monthly aggregation 
-        self.monthly_forecast = self.forecast_df.set_index('date').resample('M').agg({ 
-            'ensemble': 'sum', 
-            'lower_bound': 'sum', 
-            'upper_bound': 'sum' 
-        }) 
+        self.forecast_result = ForecastResult(self.forecast_df) 
+        self.monthly_forecast = self.forecast_result.monthly(['ensemble', 'lower_bound', 'upper_bound']) 
          
         print(f"✓ Generated {periods} daily forecasts") 
         print(f"✓ Aggregated to {len(self.monthly_forecast)} monthly forecasts") 
-        return self.forecast_df 
+        return self.forecast_df
\ No newline at end of file
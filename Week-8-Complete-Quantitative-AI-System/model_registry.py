@@ -0,0 +1,104 @@
+# model_registry.py
+# Quantitative AI - Model Registry for the ML Forecaster
+import json
+import os
+import time
+import joblib
+import numpy as np
+import sklearn
+import xgboost as xgb
+from quant_forecast.hyperparameter_search import data_fingerprint
+
+
+class ModelRegistry:
+    """
+    Persists fitted ML models keyed by a fingerprint of their inputs
+    Linear and forest models use joblib (the forest is memory-mapped on
+    load), XGBoost models use the native binary format
+    """
+
+    def __init__(self, root='model_registry'):
+        """Initialize with the registry folder"""
+        self.root = root
+
+    def fingerprint(self, forecaster, test_size):
+        """Hash of training data, feature config, hyperparameters and library versions"""
+        volume = forecaster.data['volume'].to_numpy(dtype=np.float64)
+        dates = forecaster.data.index.asi8
+        settings = json.dumps({
+            'feature_config': forecaster.feature_config,
+            'model_params': forecaster.model_params,
+            'test_size': test_size,
+            'sklearn': sklearn.__version__,
+            'xgboost': xgb.__version__
+        }, sort_keys=True, default=str)
+        return data_fingerprint(volume, dates, np.frombuffer(settings.encode(), dtype=np.uint8))
+
+    def path(self, key):
+        """Folder holding one registered model set"""
+        return os.path.join(self.root, key)
+
+    def save(self, forecaster, test_size):
+        """Write every fitted model plus a manifest describing its inputs"""
+        key = self.fingerprint(forecaster, test_size)
+        folder = self.path(key)
+        os.makedirs(folder, exist_ok=True)
+
+        joblib.dump(forecaster.models['linear'], os.path.join(folder, 'linear.joblib'))
+        joblib.dump(forecaster.models['rf'], os.path.join(folder, 'rf.joblib'))
+        forecaster.models['xgb'].save_model(os.path.join(folder, 'xgb.ubj'))
+        if forecaster.quantile_model is not None:
+            forecaster.quantile_model.save_model(os.path.join(folder, 'xgb_quantile.ubj'))
+
+        manifest = {
+            'fingerprint': key,
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'test_size': test_size,
+            'feature_config': forecaster.feature_config,
+            'model_params': forecaster.model_params,
+            'quantile_alpha': forecaster.quantile_alpha,
+            'quantile_correction': forecaster.quantile_correction,
+            'columns': forecaster.prepare_ml_features().columns,
+            'metrics': forecaster.metrics
+        }
+        # Write the manifest last: its presence marks a complete entry
+        with open(os.path.join(folder, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2, default=float)
+        print(f"✓ Registered models under {folder}")
+        return key
+
+    def load(self, forecaster, test_size):
+        """
+        Restore fitted models into the forecaster when its inputs are unchanged
+        Returns True on a registry hit
+        """
+        key = self.fingerprint(forecaster, test_size)
+        folder = self.path(key)
+        manifest_path = os.path.join(folder, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return False
+
+        start = time.perf_counter()
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        forecaster.models['linear'] = joblib.load(os.path.join(folder, 'linear.joblib'))
+        forecaster.models['rf'] = joblib.load(os.path.join(folder, 'rf.joblib'), mmap_mode='r')
+        forecaster.models['xgb'] = xgb.XGBRegressor()
+        forecaster.models['xgb'].load_model(os.path.join(folder, 'xgb.ubj'))
+
+        quantile_path = os.path.join(folder, 'xgb_quantile.ubj')
+        # Entries from before the conformal correction refit the quantile model
+        if os.path.exists(quantile_path) and 'quantile_correction' in manifest:
+            forecaster.quantile_model = xgb.XGBRegressor()
+            forecaster.quantile_model.load_model(quantile_path)
+            forecaster.quantile_alpha = manifest['quantile_alpha']
+            forecaster.quantile_correction = manifest['quantile_correction']
+
+        forecaster.metrics = manifest['metrics']
+        forecaster.test_size = manifest['test_size']
+        load_ms = (time.perf_counter() - start) * 1000
+        fit_seconds = sum(m.get('fit_time', 0) for m in manifest['metrics'].values())
+        print(f"✓ Loaded models from {folder} in {load_ms:.1f} ms "
+              f"(training took {fit_seconds:.2f}s)")
+        return True
@@ -0,0 +1,124 @@
+# reconciliation.py
+# Quantitative AI - Hierarchical Forecast Reconciliation with Sparse Summing Matrices
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+METHODS = ('bottom_up', 'top_down', 'mint_shrink')
+
+
+class Hierarchy:
+    """
+    Aggregation structure as a sparse summing matrix S = [S_agg; I]
+    Nodes are ordered total, then each level's groups, then the bottom
+    series, so y_all = S @ y_bottom for any coherent forecast
+    """
+
+    def __init__(self, keys, levels=()):
+        """
+        keys: DataFrame indexed by bottom series with one column per level
+        (coarsest first, e.g. ['region', 'district']); a total node is always added
+        """
+        self.bottom = [str(label) for label in keys.index]
+        n_bottom = len(self.bottom)
+        labels = ['total']
+        rows = [sparse.csr_matrix(np.ones((1, n_bottom)))]
+        for level in levels:
+            codes, groups = pd.factorize(keys[level], sort=True)
+            labels += [f'{level}={group}' for group in groups]
+            rows.append(sparse.csr_matrix((np.ones(n_bottom), (codes, np.arange(n_bottom))),
+                                          shape=(len(groups), n_bottom)))
+        self.aggregate_labels = labels
+        self.S_agg = sparse.vstack(rows, format='csr')
+        self.S = sparse.vstack([self.S_agg, sparse.identity(n_bottom, format='csr')], format='csr')
+        self.labels = labels + self.bottom
+        self.n_aggregate = len(labels)
+        self.n_bottom = n_bottom
+
+    @classmethod
+    def temporal(cls, dates, freq='M'):
+        """Daily-to-period hierarchy: bottom nodes are days, aggregates are periods"""
+        dates = pd.DatetimeIndex(dates)
+        keys = pd.DataFrame({'period': dates.to_period(freq).astype(str)},
+                            index=dates.strftime('%Y-%m-%d'))
+        return cls(keys, levels=['period'])
+
+    def constraint_matrix(self):
+        """C = [I, -S_agg]: C @ y == 0 exactly when y is coherent"""
+        return sparse.hstack([sparse.identity(self.n_aggregate, format='csr'), -self.S_agg],
+                             format='csr')
+
+    def incoherence(self, forecasts):
+        """Largest absolute violation of the aggregation constraints"""
+        return float(np.abs(self.constraint_matrix() @ forecasts).max())
+
+    def stack(self, panel, value='weighted_ensemble', series='series', date='date'):
+        """(nodes x horizon) matrix in hierarchy order from a stacked panel frame"""
+        wide = panel.pivot(index=series, columns=date, values=value)
+        missing = set(self.labels) - set(wide.index.astype(str))
+        if missing:
+            raise ValueError(f"Panel has no forecasts for {len(missing)} nodes, e.g. {sorted(missing)[:3]}")
+        wide.index = wide.index.astype(str)
+        return wide.loc[self.labels].to_numpy(dtype=np.float64), wide.columns
+
+
+def shrinkage_covariance(residuals):
+    """
+    Schafer-Strimmer shrinkage of the residual covariance towards its diagonal
+    Returns (variances, centred residuals, lambda) so callers can apply
+    W = lambda * D + (1 - lambda) * E'E / T without forming the n x n matrix;
+    every sum over node pairs is taken through T x T products
+    """
+    E = residuals - residuals.mean(axis=0)
+    T = E.shape[0]
+    variances = (E ** 2).mean(axis=0)
+    X = E / np.sqrt(np.maximum(variances, 1e-12))
+
+    squares = X ** 2
+    # sum_{i != j} sum_t (x_ti x_tj)^2
+    w2_off = np.sum(squares.sum(axis=1) ** 2 - (squares ** 2).sum(axis=1))
+    # sum_{i != j} r_ij^2 with r = X'X / T, via the T x T Gram matrix
+    gram = X @ X.T
+    r2_off = np.sum(gram ** 2) / T ** 2 - np.sum(squares.mean(axis=0) ** 2)
+    var_off = (w2_off - T * r2_off) / (T * (T - 1))
+    lam = float(np.clip(var_off / r2_off, 0.0, 1.0)) if r2_off > 0 else 1.0
+    return variances, E, lam
+
+
+def reconcile(hierarchy, base, method='mint_shrink', residuals=None, proportions=None):
+    """
+    Coherent forecasts for every node from base forecasts (nodes x horizon)
+    bottom_up:   S @ bottom rows
+    top_down:    total split by proportions (default: from the base bottom rows)
+    mint_shrink: y - W C' (C W C')^-1 C y with W the shrunk residual
+                 covariance (residuals: T x nodes in-sample errors)
+    """
+    base = np.asarray(base, dtype=np.float64)
+    single = base.ndim == 1
+    if single:
+        base = base[:, None]
+    S = hierarchy.S
+    k = hierarchy.n_aggregate
+
+    if method == 'bottom_up':
+        reconciled = S @ base[k:]
+    elif method == 'top_down':
+        if proportions is None:
+            bottom = np.maximum(base[k:], 0)
+            proportions = bottom.sum(axis=1) / max(bottom.sum(), 1e-12)
+        reconciled = S @ (np.asarray(proportions)[:, None] * base[0])
+    elif method == 'mint_shrink':
+        if residuals is None:
+            raise ValueError("mint_shrink needs in-sample residuals for every node")
+        variances, E, lam = shrinkage_covariance(np.asarray(residuals, dtype=np.float64))
+        C = hierarchy.constraint_matrix()
+        T = E.shape[0]
+        # W C' = lam * D C' + (1 - lam) / T * E' (E C'), sparse plus low rank
+        ECt = (C @ E.T).T
+        WCt = lam * (C.multiply(variances)).T.toarray() + (1 - lam) / T * (E.T @ ECt)
+        CWCt = C @ WCt
+        reconciled = base - WCt @ np.linalg.solve(CWCt, C @ base)
+    else:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+
+    return reconciled[:, 0] if single else reconciled
@@ -0,0 +1,202 @@
+# report_rendering.py
+# Quantitative AI - Headless, Parallel Rendering of Forecast Report Charts
+import os
+import time
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # non-interactive: figures only ever go to files
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from quant_forecast.forecast_result import ForecastResult
+
+# American flag palette shared by every chart
+COLORS = {
+    'historical': '#3C3B6E',  # Blue
+    'forecast': '#B22234',    # Red
+    'confidence': '#E0E0E0'   # Light gray
+}
+MODEL_BARS = [('linear', 'Linear', '#FF6B6B'), ('rf', 'Random Forest', '#4ECDC4'),
+              ('xgb', 'XGBoost', '#45B7D1')]
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling to n_out points
+    Keeps the first and last point and, per bucket, the point forming the
+    largest triangle with the previous pick and the next bucket's mean
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return x, y
+    xf = x.astype('datetime64[ns]').astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) \
+        else np.asarray(x, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        nxt_lo, nxt_hi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = xf[nxt_lo:nxt_hi].mean()
+        avg_y = y[nxt_lo:nxt_hi].mean()
+        area = np.abs((xf[prev] - avg_x) * (y[lo:hi] - y[prev])
+                      - (xf[prev] - xf[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        picked[b + 1] = prev
+    return x[picked], y[picked]
+
+
+def precompute_aggregates(forecast, history=None, history_days=180):
+    """
+    Everything the forecast suite plots, computed once as NumPy arrays
+    Monthly rollups come from the ForecastResult (a raw daily frame is
+    wrapped); the result pickles cheaply to workers
+    """
+    result = ForecastResult.wrap(forecast)
+    forecast_df = result.frame
+    dates = forecast_df['date'].to_numpy()
+    ensemble = forecast_df['weighted_ensemble'].to_numpy(dtype=np.float64)
+    lower = forecast_df['lower_bound'].to_numpy(dtype=np.float64)
+    upper = forecast_df['upper_bound'].to_numpy(dtype=np.float64)
+
+    names = [name for name, _, _ in MODEL_BARS]
+    monthly_mean = result.monthly(names, how='mean')
+
+    aggregates = {
+        'dates': dates,
+        'ensemble': ensemble,
+        'lower': lower,
+        'upper': upper,
+        'month_labels': monthly_mean.index.strftime('%b %y').tolist(),
+        'monthly_mean': {name: monthly_mean[name].to_numpy() for name in names},
+        'monthly_total': result.monthly(['weighted_ensemble'])['weighted_ensemble'].to_numpy(),
+        'uncertainty': (upper - lower) / ensemble * 100,
+        'history_dates': None,
+        'history_volume': None
+    }
+    if history is not None:
+        recent = history.iloc[-history_days:]
+        aggregates['history_dates'] = recent.index.to_numpy()
+        aggregates['history_volume'] = recent.to_numpy(dtype=np.float64)
+    return aggregates
+
+
+def render_forecast_suite(aggregates, path, title='13 Month Outlook', dpi=150, max_points=None,
+                          tight_bbox=True):
+    """
+    Draw the four-panel forecast suite from precomputed aggregates and save it
+    tight_bbox=False skips the extra layout pass bbox_inches='tight' costs
+    """
+    def line(x, y):
+        return lttb(x, y, max_points) if max_points else (x, y)
+
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig.suptitle(f'🇺🇸 AI Volume Forecasting System - {title} 🇺🇸',
+                 fontsize=16, fontweight='bold')
+    dates = aggregates['dates']
+
+    # Plot 1: Historical + Forecast
+    if aggregates['history_dates'] is not None:
+        axes[0, 0].plot(*line(aggregates['history_dates'], aggregates['history_volume']),
+                        color=COLORS['historical'], label='Historical', linewidth=2)
+    axes[0, 0].plot(*line(dates, aggregates['ensemble']),
+                    color=COLORS['forecast'], label='Forecast', linewidth=2)
+    axes[0, 0].fill_between(dates, aggregates['lower'], aggregates['upper'],
+                            color=COLORS['confidence'], alpha=0.3, label='95% CI')
+    axes[0, 0].set_title('Historical Data & 13-Month Forecast')
+    axes[0, 0].set_xlabel('Date')
+    axes[0, 0].set_ylabel('Volume')
+    axes[0, 0].legend()
+    axes[0, 0].grid(True, alpha=0.3)
+
+    # Plot 2: Model Comparison
+    x = np.arange(len(aggregates['month_labels']))
+    width = 0.2
+    for offset, (name, label, color) in zip((-width, 0, width), MODEL_BARS):
+        axes[0, 1].bar(x + offset, aggregates['monthly_mean'][name], width, label=label, color=color)
+    axes[0, 1].set_title('Model Predictions by Month')
+    axes[0, 1].set_xlabel('Month')
+    axes[0, 1].set_ylabel('Average Daily Volume')
+    axes[0, 1].legend()
+    axes[0, 1].grid(True, alpha=0.3, axis='y')
+
+    # Plot 3: Monthly Totals
+    axes[1, 0].bar(x, aggregates['monthly_total'],
+                   color=COLORS['forecast'], edgecolor=COLORS['historical'], linewidth=2)
+    axes[1, 0].set_title('Monthly Volume Totals (13-Month Forecast)')
+    axes[1, 0].set_xlabel('Month')
+    axes[1, 0].set_ylabel('Total Volume')
+    axes[1, 0].set_xticks(x)
+    axes[1, 0].set_xticklabels(aggregates['month_labels'], rotation=45)
+    axes[1, 0].grid(True, alpha=0.3, axis='y')
+
+    # Plot 4: Uncertainty Analysis
+    axes[1, 1].plot(*line(dates, aggregates['uncertainty']), color=COLORS['forecast'], linewidth=2)
+    axes[1, 1].fill_between(dates, aggregates['uncertainty'], alpha=0.3, color=COLORS['forecast'])
+    axes[1, 1].set_title('Forecast Uncertainty Over Time')
+    axes[1, 1].set_xlabel('Date')
+    axes[1, 1].set_ylabel('Uncertainty (%)')
+    axes[1, 1].grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    fig.savefig(path, dpi=dpi, bbox_inches='tight' if tight_bbox else None)
+    return fig
+
+
+def _render_job(job):
+    """Worker entry point: render one series and free its figure"""
+    name, aggregates, path, dpi, max_points = job
+    fig = render_forecast_suite(aggregates, path, title=name, dpi=dpi, max_points=max_points,
+                                tight_bbox=False)
+    plt.close(fig)
+    return path
+
+
+def series_aggregates(panel_df, history_df=None, history_days=180):
+    """
+    Split a stacked forecast panel (with a 'series' column) into per-series
+    aggregates, using one sort and vectorized series boundaries
+    """
+    panel_df = panel_df.sort_values(['series', 'date'], kind='stable')
+    names, starts = np.unique(panel_df['series'].to_numpy(), return_index=True)
+    stops = np.r_[starts[1:], len(panel_df)]
+
+    histories = {}
+    if history_df is not None:
+        history_df = history_df.sort_values(['series', 'date'], kind='stable')
+        h_names, h_starts = np.unique(history_df['series'].to_numpy(), return_index=True)
+        h_stops = np.r_[h_starts[1:], len(history_df)]
+        for name, a, b in zip(h_names, h_starts, h_stops):
+            chunk = history_df.iloc[a:b]
+            histories[name] = pd.Series(chunk['volume'].to_numpy(), index=chunk['date'].to_numpy())
+
+    return {name: precompute_aggregates(panel_df.iloc[a:b], histories.get(name), history_days)
+            for name, a, b in zip(names, starts, stops)}
+
+
+def render_series_reports(panel_df, out_dir, history_df=None, history_days=180,
+                          n_workers=None, dpi=100, max_points=None):
+    """
+    Render one forecast suite per series in a process pool
+    Returns the chart paths and prints charts per second
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    aggregates = series_aggregates(panel_df, history_df, history_days)
+    jobs = [(name, agg, os.path.join(out_dir, f'{name}.png'), dpi, max_points)
+            for name, agg in aggregates.items()]
+    prepared = time.perf_counter() - start
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1:
+        paths = [_render_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            paths = list(pool.map(_render_job, jobs, chunksize=max(len(jobs) // (4 * n_workers), 1)))
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Rendered {len(paths)} charts in {elapsed:.1f}s "
+          f"({len(paths) / elapsed:.1f} charts/s, {n_workers} workers, "
+          f"aggregates {prepared:.2f}s)")
+    return paths
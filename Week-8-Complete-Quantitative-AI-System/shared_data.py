@@ -0,0 +1,33 @@
+# shared_data.py
+# Quantitative AI - Load the Volume Dataset Once and Share It Read-Only
+from importlib.resources import files
+import numpy as np
+import pandas as pd
+
+# Week 7's dataset, shipped as package data so installed scripts find it from any directory
+DEFAULT_DATA = str(files('quant_forecast.week7') / 'data' / 'historical_volumes.csv')
+
+
+def load_volume_data(data_path):
+    """
+    Parse the volume CSV a single time for every component
+    Volume is stored as float64 so the models' float64 views need no copy
+    """
+    return pd.read_csv(data_path, index_col='date', parse_dates=True,
+                       dtype={'volume': np.float64})
+
+
+def shared_view(data):
+    """
+    Shallow copy of a loaded frame: the column buffers are shared, columns
+    the holder adds stay local to it (components only ever add columns)
+    """
+    return data.copy(deep=False)
+
+
+def readonly_values(series, dtype=np.float64):
+    """NumPy view of a shared column that raises instead of writing through"""
+    values = series.to_numpy(dtype=dtype).view()
+    values.flags.writeable = False
+    return values
+
@@ -0,0 +1,67 @@
+# test_ensemble_weights.py
+# Quantitative AI - Stacked Ensemble Weights on Synthetic Backtests
+import numpy as np
+from quant_forecast.ensemble_weights import EnsembleWeights, simplex_weights
+
+NAMES = ['good', 'biased', 'noisy']
+
+
+def backtest(n_origins=40, horizon=30, seed=0):
+    """Backtest stack of three components around a known actual path"""
+    rng = np.random.default_rng(seed)
+    actual = 1000 + rng.normal(0, 50, (n_origins, horizon))
+    predictions = {
+        'good': actual + rng.normal(0, 5, actual.shape),
+        'biased': actual + 80,
+        'noisy': actual + rng.normal(0, 60, actual.shape),
+    }
+    return predictions, actual
+
+
+def test_simplex_weights_recover_a_convex_mix():
+    """An exact convex combination is found, non-negative and summing to one"""
+    rng = np.random.default_rng(1)
+    P = rng.normal(100, 10, (500, 3))
+    y = P @ np.array([0.6, 0.4, 0.0])
+    w = simplex_weights(P, y)
+    assert np.all(w >= 0)
+    assert abs(w.sum() - 1) < 1e-6
+    np.testing.assert_allclose(w, [0.6, 0.4, 0.0], atol=1e-3)
+
+
+def test_fit_prefers_the_accurate_component():
+    """Global and per-bucket weights favour the component closest to the actuals"""
+    predictions, actual = backtest()
+    model = EnsembleWeights(NAMES, horizon_buckets=(7, None)).fit(predictions, actual)
+    assert max(model.as_dict(), key=model.as_dict().get) == 'good'
+    assert model.bucket_weights.shape == (2, 3)
+    np.testing.assert_allclose(model.bucket_weights.sum(axis=1), 1, atol=1e-6)
+    assert model.metrics['good']['mae'] < model.metrics['noisy']['mae']
+
+
+def test_ensemble_metrics_are_cross_fitted():
+    """The ensemble is scored with weights fitted on other origins, flagged as such"""
+    predictions, actual = backtest()
+    model = EnsembleWeights(NAMES, horizon_buckets=None).fit(predictions, actual)
+    assert model.cross_fitted
+    # The in-sample weights minimize the squared error, held-out weights can't beat them
+    in_sample = model.stack(predictions) @ model.weights
+    in_sample_rmse = np.sqrt(((in_sample - actual) ** 2).mean())
+    assert model.metrics['ensemble']['rmse'] > in_sample_rmse
+
+    # One origin cannot be held out, so its score is in-sample
+    single = {name: p[:1] for name, p in predictions.items()}
+    assert not EnsembleWeights(NAMES).fit(single, actual[:1]).cross_fitted
+
+
+def test_horizon_weights_extend_the_last_bucket():
+    """Steps past the backtested horizon reuse the last bucket's weights"""
+    predictions, actual = backtest(horizon=30)
+    model = EnsembleWeights(NAMES, horizon_buckets=(7, None)).fit(predictions, actual)
+    assert model.horizon == 30
+    weights = model.horizon_weights(90)
+    np.testing.assert_array_equal(weights[:7], np.tile(model.bucket_weights[0], (7, 1)))
+    np.testing.assert_array_equal(weights[7:], np.tile(model.bucket_weights[1], (83, 1)))
+
+    components = {name: np.full(90, 100.0) for name in NAMES}
+    np.testing.assert_allclose(model.combine(components), 100.0)
@@ -0,0 +1,74 @@
+# test_forecast_result.py
+# Quantitative AI - Memoized Rollups Match resample() and Follow Revisions
+import numpy as np
+import pandas as pd
+import pytest
+from quant_forecast.forecast_result import ForecastResult
+
+RESAMPLE = {'W': 'W', 'M': 'ME', 'Q': 'QE'}
+
+
+def daily_forecast(days=400, seed=0):
+    """Daily frame starting mid-week and mid-month, so every edge is partial"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.date_range('2024-01-17', periods=days, freq='D'),
+        'weighted_ensemble': rng.normal(1500, 100, days),
+        'lower_bound': rng.normal(1300, 100, days),
+        'model': 'ensemble',
+    })
+
+
+def expected(frame, freq, how='sum'):
+    resampled = frame.set_index('date')[['weighted_ensemble', 'lower_bound']].resample(RESAMPLE[freq])
+    return resampled.sum() if how == 'sum' else resampled.mean()
+
+
+@pytest.mark.parametrize('freq', ['W', 'M', 'Q'])
+@pytest.mark.parametrize('how', ['sum', 'mean'])
+def test_rollups_match_resample(freq, how):
+    """Sums and daily means per week/month/quarter, labelled like resample()"""
+    frame = daily_forecast()
+    result = ForecastResult(frame).aggregate(freq, ['weighted_ensemble', 'lower_bound'], how)
+    # Period ends are day-resolution dates, resample keeps nanoseconds
+    pd.testing.assert_frame_equal(result, expected(frame, freq, how), check_freq=False,
+                                  check_index_type=False, rtol=1e-12)
+
+
+def test_non_numeric_columns_are_skipped():
+    result = ForecastResult(daily_forecast())
+    assert result.numeric == ['weighted_ensemble', 'lower_bound']
+    assert list(result.monthly().columns) == result.numeric
+
+
+def test_revise_patches_kept_rollups():
+    """A revised slice updates every memoized rollup like a fresh computation"""
+    frame = daily_forecast()
+    result = ForecastResult(frame)
+    for freq in ('W', 'M', 'Q'):
+        result.aggregate(freq)
+    new = np.linspace(1000, 2000, 45)
+    result.revise(30, {'weighted_ensemble': new})
+
+    revised = frame.copy()
+    revised.loc[30:74, 'weighted_ensemble'] = new
+    np.testing.assert_array_equal(result.frame['weighted_ensemble'], revised['weighted_ensemble'])
+    for freq in ('W', 'M', 'Q'):
+        np.testing.assert_allclose(result.aggregate(freq)['weighted_ensemble'],
+                                   expected(revised, freq)['weighted_ensemble'], rtol=1e-12)
+
+
+def test_revise_rejects_bad_input():
+    result = ForecastResult(daily_forecast(days=30))
+    with pytest.raises(ValueError, match='non-numeric'):
+        result.revise(0, {'model': ['x']})
+    with pytest.raises(ValueError, match='outside'):
+        result.revise(25, {'weighted_ensemble': np.zeros(10)})
+
+
+def test_unsorted_dates_and_unknown_frequency():
+    frame = daily_forecast(days=10)
+    with pytest.raises(ValueError, match='sorted'):
+        ForecastResult(frame.iloc[::-1].reset_index(drop=True))
+    with pytest.raises(ValueError, match='Unknown frequency'):
+        ForecastResult(frame).aggregate('Y')
@@ -0,0 +1,152 @@
+# test_forecast_service.py
+# Quantitative AI - Forecast Service Caching, Coalescing, Micro-Batching and Failures
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+import numpy as np
+import pandas as pd
+import pytest
+from quant_forecast.forecast_service import ForecastService, serve
+
+
+class StubService(ForecastService):
+    """Service over a synthetic history whose forecasts wait on a gate and can be made to fail"""
+
+    def __init__(self, **kwargs):
+        data = pd.DataFrame({'volume': np.arange(200, dtype=np.float64)},
+                            index=pd.date_range('2023-01-01', periods=200, freq='D'))
+        ml = SimpleNamespace(data=data, feature_builder=SimpleNamespace(min_history=30))
+        ensemble = SimpleNamespace(ml_forecaster=ml, create_ensemble_forecast=lambda: None)
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.error = None
+        super().__init__(ensemble, **kwargs)
+
+    def daily_paths(self, origins, periods):
+        self.calls.append((origins.tolist(), periods))
+        self.gate.wait()
+        if self.error:
+            raise self.error
+        forecast = origins[:, None] + np.arange(periods, dtype=np.float64)
+        return {'forecast': forecast, 'lower': forecast - 1, 'upper': forecast + 1}
+
+
+def concurrently(service, params, n):
+    """Call service.get from n threads at once; results (or exceptions) in thread order"""
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = service.get(params[i] if isinstance(params, list) else params)
+        except Exception as error:
+            results[i] = error
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_identical_requests_compute_once():
+    service = StubService()
+    service.gate.clear()
+    threads, results = concurrently(service, {'horizon': '30'}, 8)
+    wait_for(lambda: service.stats['coalesced'] == 7)
+    service.gate.set()
+    for thread in threads:
+        thread.join()
+    assert len(service.calls) == 1
+    assert service.stats['computed'] == 1
+    assert all(payload is results[0][0] for payload, cached in results)
+    # Served from the cache from now on
+    payload, cached = service.get({'horizon': '30'})
+    assert cached and payload is results[0][0] and len(service.calls) == 1
+
+
+def test_distinct_requests_share_a_batch():
+    service = StubService(batch_window=0.2)
+    params = [{'horizon': '7'}, {'horizon': '30', 'level': 'weekly'}, {'horizon': '14', 'as_of': '2023-05-01'}]
+    threads, results = concurrently(service, params, 3)
+    for thread in threads:
+        thread.join()
+    # One forecast for both origins, long enough for the longest horizon
+    assert service.calls == [([121, 200], 30)]
+    assert (service.stats['batches'], service.stats['batched_requests']) == (1, 3)
+    daily, weekly, as_of = (payload for payload, _ in results)
+    assert len(daily['forecast']) == 7 and daily['forecast'][0]['date'] == '2023-07-20'
+    assert weekly['level'] == 'weekly' and len(weekly['forecast']) == 5
+    assert as_of['as_of'] == '2023-05-01' and as_of['forecast'][0]['forecast'] == 121.0
+
+
+def test_cache_evicts_least_recently_used():
+    service = StubService(cache_size=2)
+    for horizon in ('1', '2', '1', '3'):
+        service.get({'horizon': horizon})
+    assert service.stats['cache_hits'] == 1
+    assert [key[2] for key in service.cache] == [1, 3]
+    assert service.get({'horizon': '1'})[1]
+    assert not service.get({'horizon': '2'})[1]
+
+
+def test_failure_reaches_every_waiter():
+    service = StubService()
+    service.gate.clear()
+    service.error = MemoryError('out of memory')
+    threads, results = concurrently(service, {'horizon': '30'}, 4)
+    wait_for(lambda: service.stats['coalesced'] == 3)
+    service.gate.set()
+    for thread in threads:
+        thread.join()
+    assert all(isinstance(r, RuntimeError) and 'forecast failed' in str(r) for r in results)
+    assert not service.in_flight and not service.cache
+    # The batcher survived and the same request succeeds once the error is gone
+    assert service.batcher.is_alive()
+    service.error = None
+    payload, cached = service.get({'horizon': '30'})
+    assert not cached and len(payload['forecast']) == 30
+
+
+@pytest.fixture
+def server():
+    service = StubService()
+    httpd = serve(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield service, f'http://127.0.0.1:{httpd.server_port}'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        return error.code, json.load(error)
+
+
+def test_http_status_codes(server):
+    service, base = server
+    status, body = fetch(f'{base}/forecast?horizon=5&level=monthly')
+    assert status == 200 and body['level'] == 'monthly' and not body['cached']
+    assert fetch(f'{base}/forecast?horizon=0')[0] == 400
+    assert fetch(f'{base}/forecast?level=hourly')[0] == 400
+    service.error = ValueError('bad model state')
+    # A failed forecast is the server's fault even when the cause is a ValueError
+    status, body = fetch(f'{base}/forecast?horizon=9')
+    assert status == 500 and body['error'].startswith('forecast failed')
+    assert fetch(f'{base}/nowhere')[0] == 404
+    assert fetch(f'{base}/stats')[1]['computed'] == 1
@@ -0,0 +1,39 @@
+# test_hyperparameter_search.py
+# Quantitative AI - Successive Halving and Hyperband on a Small Forest Search
+import numpy as np
+from quant_forecast.hyperparameter_search import HyperparameterSearch
+
+# Continuous parameters, so no two trials share a history key
+SPACE = {'rf': {'min_samples_leaf': ('randint', 1, 40), 'max_features': ('uniform', 0.2, 1.0)}}
+
+
+def search(**kwargs):
+    """Forest search on 240 noisy rows with budgets 5, 15 and 45 trees"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(240, 6))
+    y = X @ rng.normal(size=6) + rng.normal(0, 0.5, 240)
+    return HyperparameterSearch(X, y, n_splits=3, history_path=None, n_workers=2, min_budget=5,
+                                max_budget=45, search_space=SPACE, **kwargs)
+
+
+def test_halving_survivors_finish_at_max_budget():
+    """Rungs are spaced back from max_budget, even for a bracket that starts off the ladder"""
+    tuner = search()
+    tuner.successive_halving('rf', n_trials=4, min_budget=7)
+    budgets = sorted(t['budget'] for t in tuner.history.values())
+    # log3(45 / 7) rounds down to one step: 4 trials at 15, the best one at 45
+    assert budgets == [15, 15, 15, 15, 45]
+
+
+def test_hyperband_returns_best_final_rung_trial():
+    """Every bracket's winner reaches max_budget and the best of them is returned"""
+    tuner = search()
+    best = tuner.hyperband('rf', n_trials=13)
+    trials = list(tuner.history.values())
+    assert {t['budget'] for t in trials} == {5, 15, 45}
+    # Brackets of 8, 4 and 3 trials send 1, 1 and 3 configurations to the last rung
+    final = [t for t in trials if t['budget'] == 45]
+    assert len(final) == 5
+    assert best is min(final, key=lambda t: t['score'])
+    # Here the winner is a halving survivor, not one of the plain random trials at 45
+    assert any(t['params'] == best['params'] for t in trials if t['budget'] == 5)
@@ -0,0 +1,89 @@
+# test_reconciliation.py
+# Quantitative AI - Reconciled Forecasts Are Coherent and Match the Dense Formulas
+import numpy as np
+import pandas as pd
+import pytest
+from quant_forecast.reconciliation import Hierarchy, reconcile, shrinkage_covariance
+
+
+def store_hierarchy():
+    """Total -> 2 regions -> 6 stores"""
+    keys = pd.DataFrame({'region': ['north'] * 3 + ['south'] * 3},
+                        index=[f'store{i}' for i in range(6)])
+    return Hierarchy(keys, levels=['region'])
+
+
+def noisy_base(hierarchy, horizon=12, seed=0):
+    """Coherent forecasts plus independent noise on every node"""
+    rng = np.random.default_rng(seed)
+    bottom = rng.uniform(50, 150, (hierarchy.n_bottom, horizon))
+    return hierarchy.S @ bottom + rng.normal(0, 5, (len(hierarchy.labels), horizon))
+
+
+def test_summing_matrix():
+    hierarchy = store_hierarchy()
+    assert hierarchy.labels[:3] == ['total', 'region=north', 'region=south']
+    assert hierarchy.S.shape == (9, 6)
+    coherent = hierarchy.S @ np.arange(6.0)
+    assert hierarchy.incoherence(coherent) == 0
+    assert coherent[:3].tolist() == [15.0, 3.0, 12.0]
+
+
+@pytest.mark.parametrize('method', ['bottom_up', 'top_down', 'mint_shrink'])
+def test_every_method_is_coherent(method):
+    hierarchy = store_hierarchy()
+    base = noisy_base(hierarchy)
+    residuals = np.random.default_rng(1).normal(0, 5, (60, len(hierarchy.labels)))
+    assert hierarchy.incoherence(base) > 1
+    reconciled = reconcile(hierarchy, base, method, residuals)
+    assert reconciled.shape == base.shape
+    assert hierarchy.incoherence(reconciled) < 1e-8
+
+
+def test_bottom_up_and_top_down():
+    hierarchy = store_hierarchy()
+    base = noisy_base(hierarchy)
+    k = hierarchy.n_aggregate
+    np.testing.assert_array_equal(reconcile(hierarchy, base, 'bottom_up')[k:], base[k:])
+    shares = np.full(6, 1 / 6)
+    top_down = reconcile(hierarchy, base, 'top_down', proportions=shares)
+    np.testing.assert_allclose(top_down[0], base[0])
+    np.testing.assert_allclose(top_down[k:], np.tile(base[0] / 6, (6, 1)))
+
+
+def test_mint_shrink_matches_dense_solution():
+    """The sparse/low-rank solve equals y - W C'(C W C')^-1 C y with W formed densely"""
+    hierarchy = store_hierarchy()
+    base = noisy_base(hierarchy)
+    residuals = np.random.default_rng(2).normal(0, [1, 2, 2, 3, 3, 3, 4, 4, 4], (40, 9))
+    variances, E, lam = shrinkage_covariance(residuals)
+    W = lam * np.diag(variances) + (1 - lam) * E.T @ E / E.shape[0]
+    C = hierarchy.constraint_matrix().toarray()
+    dense = base - W @ C.T @ np.linalg.solve(C @ W @ C.T, C @ base)
+    np.testing.assert_allclose(reconcile(hierarchy, base, 'mint_shrink', residuals), dense,
+                               rtol=1e-10, atol=1e-8)
+
+
+def test_single_horizon_and_errors():
+    hierarchy = store_hierarchy()
+    base = noisy_base(hierarchy)[:, 0]
+    assert reconcile(hierarchy, base, 'bottom_up').shape == (9,)
+    with pytest.raises(ValueError, match='residuals'):
+        reconcile(hierarchy, base, 'mint_shrink')
+    with pytest.raises(ValueError, match='Unknown method'):
+        reconcile(hierarchy, base, 'ols')
+
+
+def test_temporal_hierarchy_and_stack():
+    """Days roll up into months; stack() orders a long panel like the hierarchy"""
+    dates = pd.date_range('2024-01-30', periods=4, freq='D')
+    hierarchy = Hierarchy.temporal(dates)
+    assert hierarchy.labels == ['total', 'period=2024-01', 'period=2024-02',
+                                '2024-01-30', '2024-01-31', '2024-02-01', '2024-02-02']
+    panel = pd.DataFrame({'series': hierarchy.labels[::-1],
+                          'date': '2025-01-01',
+                          'weighted_ensemble': np.arange(7.0)})
+    stacked, columns = hierarchy.stack(panel)
+    assert stacked[:, 0].tolist() == [6, 5, 4, 3, 2, 1, 0]
+    with pytest.raises(ValueError, match='no forecasts'):
+        hierarchy.stack(panel.iloc[1:])
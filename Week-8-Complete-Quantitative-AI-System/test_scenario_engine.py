@@ -0,0 +1,67 @@
+# test_scenario_engine.py
+# Quantitative AI - Vectorized Scenario Percentiles Match a Per-Path Loop
+import numpy as np
+import pandas as pd
+from quant_forecast.scenario_engine import PERCENTILES, ScenarioEngine, scenario_grid
+
+
+class TinyEngine(ScenarioEngine):
+    """Scenario engine over synthetic residuals instead of a fitted ensemble's backtest"""
+
+    def backtest_residuals(self):
+        rng = np.random.default_rng(3)
+        residuals = rng.normal(0, 40, (12, 20)) + np.linspace(0, 30, 20)
+        return residuals - residuals.mean(axis=0)
+
+
+def tiny_engine(days=75, n_paths=50):
+    """Forecast from mid-January over three months, longer than the 20-step backtest"""
+    rng = np.random.default_rng(0)
+    forecast = pd.DataFrame({'date': pd.date_range('2024-01-20', periods=days, freq='D'),
+                             'weighted_ensemble': rng.normal(1500, 100, days)})
+    return TinyEngine(ensemble=None, forecast=forecast, n_paths=n_paths)
+
+
+def brute_force(engine, scenario):
+    """Totals and monthly sums of every path, one day at a time"""
+    dates = engine.dates
+    start = pd.Timestamp(scenario['start']) if scenario.get('start') else dates[0]
+    totals, monthly = [], []
+    for error in engine.errors:
+        by_month = {}
+        for day, date in enumerate(dates):
+            multiplier = (1 + scenario.get('growth', 0.0)) ** (((date - dates[0]).days + 1) / 365.25)
+            if date >= start:
+                multiplier *= 1 + scenario.get('level', 0.0)
+            multiplier *= scenario.get('weekday', {}).get(date.dayofweek, 1.0)
+            multiplier *= scenario.get('month', {}).get(date.month, 1.0)
+            by_month[date.month] = by_month.get(date.month, 0.0) + multiplier * (engine.base[day] + error[day])
+        totals.append(sum(by_month.values()))
+        monthly.append(list(by_month.values()))
+    return (np.percentile(totals, PERCENTILES),
+            np.percentile(np.array(monthly), PERCENTILES, axis=0).T)
+
+
+def test_grid_matches_per_path_loop():
+    engine = tiny_engine()
+    scenarios = scenario_grid(growth=[0, 0.05], level=[-0.1, 0]) + [
+        {'name': 'shocked', 'level': 0.2, 'start': '2024-02-10',
+         'weekday': {5: 0.7, 6: 0.7}, 'month': {3: 1.2}}]
+    totals, monthly = engine.run(scenarios)
+    assert totals.index.tolist() == ['growth=0, level=-0.1', 'growth=0, level=0',
+                                     'growth=0.05, level=-0.1', 'growth=0.05, level=0', 'shocked']
+    for scenario in scenarios:
+        expected_totals, expected_monthly = brute_force(engine, scenario)
+        np.testing.assert_allclose(totals.loc[scenario['name'], ['p5', 'p50', 'p95']], expected_totals,
+                                   rtol=1e-10)
+        np.testing.assert_allclose(monthly.loc[scenario['name']].to_numpy(), expected_monthly, rtol=1e-10)
+
+    # The unshocked scenario's median matches the baseline it is compared with
+    assert abs(totals.loc['growth=0, level=0', 'median_change_pct']) < 1e-9
+
+
+def test_errors_cover_the_horizon():
+    """Bootstrapped paths extend past the backtest horizon, one error per day"""
+    engine = tiny_engine()
+    assert engine.errors.shape == (50, 75)
+    assert np.all(np.isfinite(engine.errors))
@@ -0,0 +1,42 @@
+# test_training_scheduler.py
+# Quantitative AI - Parallel and Sequential Training Give the Same Models
+import numpy as np
+from quant_forecast.ml_forecast import QuantitativeMLForecaster
+from quant_forecast.shared_data import DEFAULT_DATA, load_volume_data
+from quant_forecast.training_scheduler import split_core_budget
+
+
+def trained(parallel):
+    """Forecaster trained on the Week 7 data with a 4-core budget"""
+    forecaster = QuantitativeMLForecaster(load_volume_data(DEFAULT_DATA))
+    forecaster.train_models(parallel=parallel, n_cores=4)
+    return forecaster
+
+
+def test_split_core_budget():
+    """Every model gets a core, the rest follow the weights and add up to the budget"""
+    budget = split_core_budget(8, {'linear': 0, 'rf': 2, 'xgb': 1})
+    assert sum(budget.values()) == 8
+    assert min(budget.values()) >= 1
+    assert budget['rf'] > budget['xgb'] > budget['linear']
+    # Fewer cores than models: one each, the pool caps the concurrency
+    assert split_core_budget(2, {'linear': 1, 'rf': 1, 'xgb': 1}) == {'linear': 1, 'rf': 1, 'xgb': 1}
+
+
+def test_parallel_matches_sequential():
+    """
+    Concurrent fits with split threads build the same models as one-at-a-time
+    fits; only the forest's average may round differently, since its trees
+    are summed in n_jobs order
+    """
+    sequential, parallel = trained(False), trained(True)
+    assert not sequential.scheduler.parallel and parallel.scheduler.parallel
+    for name in ('linear', 'xgb'):
+        np.testing.assert_array_equal(parallel.test_predictions[name],
+                                      sequential.test_predictions[name])
+
+    X_test = sequential.prepare_ml_features().values[-sequential.test_size:]
+    for tree_p, tree_s in zip(parallel.models['rf'].estimators_, sequential.models['rf'].estimators_):
+        np.testing.assert_array_equal(tree_p.predict(X_test), tree_s.predict(X_test))
+    np.testing.assert_allclose(parallel.test_predictions['rf'], sequential.test_predictions['rf'],
+                               rtol=1e-12)
@@ -0,0 +1,109 @@
+# training_scheduler.py
+# Quantitative AI - Parallel Model Training Scheduler
+import os
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from quant_forecast.instrumentation import Instrumentation
+
+
+def split_core_budget(n_cores, weights):
+    """
+    Split a core budget between models
+    Every model gets one core, spare cores go out in proportion to weight
+    """
+    names = list(weights)
+    budget = {name: 1 for name in names}
+    spare = n_cores - len(names)
+    total_weight = sum(weights.values())
+    if spare <= 0 or total_weight <= 0:
+        return budget
+
+    # Largest-remainder split so the threads add up to exactly n_cores
+    shares = {name: spare * weights[name] / total_weight for name in names}
+    for name in names:
+        budget[name] += int(shares[name])
+    leftover = n_cores - sum(budget.values())
+    by_remainder = sorted(names, key=lambda n: shares[n] - int(shares[n]), reverse=True)
+    for name in by_remainder[:leftover]:
+        budget[name] += 1
+    return budget
+
+
+class TrainingScheduler:
+    """
+    Runs independent model fits concurrently under an explicit core budget
+    Tree libraries release the GIL while fitting, so threads are enough and
+    fitted models come back without pickling
+    """
+
+    def __init__(self, n_cores=None, parallel=True, instrumentation=None):
+        """Initialize with a core budget (defaults to every available core)"""
+        self.n_cores = n_cores or os.cpu_count() or 1
+        self.parallel = parallel
+        self.instrumentation = instrumentation or Instrumentation(enabled=False)
+        self.timings = {}
+
+    def allocate(self, specs):
+        """Threads per model for the given specs"""
+        return split_core_budget(self.n_cores, {name: spec['weight'] for name, spec in specs.items()})
+
+    def _fit_one(self, name, spec, n_threads, X_train, y_train, X_test, y_test):
+        """Fit and score a single model, timing the wall clock"""
+        start = time.perf_counter()
+        model = spec['factory'](n_threads)
+        with self.instrumentation.stage(f'fit.{name}'):
+            model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+        with self.instrumentation.stage(f'predict.{name}'):
+            predictions = model.predict(X_test)
+        return {
+            'model': model,
+            'predictions': predictions,
+            'mae': mean_absolute_error(y_test, predictions),
+            'rmse': np.sqrt(mean_squared_error(y_test, predictions)),
+            'r2': r2_score(y_test, predictions),
+            'threads': n_threads,
+            'fit_time': fit_time,
+            'wall_time': time.perf_counter() - start
+        }
+
+    def run(self, specs, X_train, y_train, X_test, y_test):
+        """
+        Fit every spec and collect models, test predictions and metrics
+        specs: {name: {'factory': callable(n_threads), 'weight': float}}
+        """
+        allocation = self.allocate(specs)
+        results = {}
+        start = time.perf_counter()
+
+        if self.parallel and len(specs) > 1:
+            # Never run more fits at once than there are cores in the budget
+            max_workers = min(len(specs), self.n_cores)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    name: pool.submit(self._fit_one, name, spec, allocation[name],
+                                      X_train, y_train, X_test, y_test)
+                    for name, spec in specs.items()
+                }
+                for name in specs:
+                    results[name] = futures[name].result()
+        else:
+            # Sequential path: one fit at a time, each with the whole budget
+            for name, spec in specs.items():
+                results[name] = self._fit_one(name, spec, self.n_cores,
+                                              X_train, y_train, X_test, y_test)
+
+        self.timings = {name: result['wall_time'] for name, result in results.items()}
+        self.timings['total'] = time.perf_counter() - start
+        return results
+
+    def print_timings(self):
+        """Print wall time per model and for the whole schedule"""
+        mode = 'parallel' if self.parallel else 'sequential'
+        print(f"\n\033[96m⏱️  TRAINING WALL TIME ({mode}, {self.n_cores} cores):\033[0m")
+        for name, seconds in self.timings.items():
+            if name != 'total':
+                print(f"  {name:<8} {seconds:7.2f}s")
+        print(f"  {'total':<8} {self.timings['total']:7.2f}s")
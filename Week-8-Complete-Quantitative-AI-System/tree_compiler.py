@@ -0,0 +1,163 @@
+# tree_compiler.py
+# Quantitative AI - Flattened Tree Ensembles for Low-Latency Inference
+import json
+import numpy as np
+
+
+class CompiledTrees:
+    """
+    A tree ensemble flattened into contiguous NumPy arrays
+    (feature, threshold, left, right, value) with every tree stored back to back.
+    Leaves point to themselves, so all rows walk all trees in lockstep for
+    max_depth steps with no per-node branching in Python
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 go_left_if_less=False, default_left=None, aggregate='mean', base_score=0.0):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.go_left_if_less = go_left_if_less
+        self.default_left = default_left
+        self.aggregate = aggregate
+        self.base_score = base_score
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def leaves(self, X):
+        """Leaf index reached in every tree, shape (rows, trees)"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots))).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            if self.go_left_if_less:
+                go_left = x < self.threshold[node]
+                if self.default_left is not None:
+                    missing = np.isnan(x)
+                    go_left = np.where(missing, self.default_left[node], go_left)
+            else:
+                go_left = x <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict(self, X):
+        """Ensemble prediction for every row of X"""
+        leaf_values = self.value[self.leaves(X)]
+        # Accumulate tree by tree in the library's own order and precision
+        if self.aggregate == 'sum':
+            start = np.full((len(leaf_values), 1), self.base_score, dtype=self.value.dtype)
+            leaf_values = np.concatenate([start, leaf_values], axis=1)
+            return leaf_values.cumsum(axis=1, dtype=self.value.dtype)[:, -1]
+        return leaf_values.cumsum(axis=1)[:, -1] / leaf_values.shape[1]
+
+
+def _self_looping(left, right, offset):
+    """Global child indices where leaves (-1) point back at themselves"""
+    nodes = np.arange(len(left)) + offset
+    is_leaf = left < 0
+    return (np.where(is_leaf, nodes, left + offset),
+            np.where(is_leaf, nodes, right + offset),
+            is_leaf)
+
+
+def compile_forest(forest):
+    """Flatten a fitted sklearn RandomForestRegressor"""
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        left, right, is_leaf = _self_looping(tree.children_left, tree.children_right, offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        # sklearn compares the float32 input against a float64 threshold
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(left)
+        rights.append(right)
+        values.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    return CompiledTrees(
+        np.concatenate(features).astype(np.intp),
+        np.concatenate(thresholds).astype(np.float64),
+        np.concatenate(lefts).astype(np.intp),
+        np.concatenate(rights).astype(np.intp),
+        np.concatenate(values).astype(np.float64),
+        np.array(roots, dtype=np.intp),
+        max_depth,
+        aggregate='mean'
+    )
+
+
+def compile_xgboost(model):
+    """Flatten a fitted XGBRegressor (squared-error objective) from its JSON dump"""
+    booster = model.get_booster()
+    dump = json.loads(booster.save_raw(raw_format='json'))
+    learner = dump['learner']
+    base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+
+    features, thresholds, lefts, rights, values, defaults, roots = [], [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in learner['gradient_booster']['model']['trees']:
+        left = np.array(tree['left_children'])
+        right = np.array(tree['right_children'])
+        conditions = np.array(tree['split_conditions'], dtype=np.float32)
+        left_global, right_global, is_leaf = _self_looping(left, right, offset)
+
+        # XGBoost keeps the leaf value in split_conditions for leaf nodes
+        features.append(np.where(is_leaf, 0, tree['split_indices']))
+        thresholds.append(np.where(is_leaf, np.float32(np.inf), conditions))
+        values.append(np.where(is_leaf, conditions, np.float32(0)))
+        defaults.append(np.array(tree['default_left'], dtype=bool))
+        lefts.append(left_global)
+        rights.append(right_global)
+        roots.append(offset)
+
+        # Depth of the deepest leaf, following parents up to the root
+        parents = np.array(tree['parents'])
+        depth = np.zeros(len(left), dtype=int)
+        for node in range(1, len(left)):
+            depth[node] = depth[parents[node]] + 1
+        max_depth = max(max_depth, int(depth.max()))
+        offset += len(left)
+
+    return CompiledTrees(
+        np.concatenate(features).astype(np.intp),
+        np.concatenate(thresholds).astype(np.float32),
+        np.concatenate(lefts).astype(np.intp),
+        np.concatenate(rights).astype(np.intp),
+        np.concatenate(values).astype(np.float32),
+        np.array(roots, dtype=np.intp),
+        max_depth,
+        go_left_if_less=True,
+        default_left=np.concatenate(defaults),
+        aggregate='sum',
+        base_score=base_score
+    )
+
+
+class CompiledLinear:
+    """LinearRegression as a plain matrix-vector product"""
+
+    def __init__(self, model):
+        # Keep the fitted dtype so results match model.predict bit for bit
+        self.coef = np.ascontiguousarray(model.coef_)
+        self.intercept = model.intercept_
+
+    def predict(self, X):
+        return X @ self.coef + self.intercept
+
+
+def compile_models(models):
+    """Compiled predictor for each fitted model in a forecaster's models dict"""
+    compilers = {'linear': CompiledLinear, 'rf': compile_forest, 'xgb': compile_xgboost}
+    return {name: compilers[name](model) for name, model in models.items()}
@@ -0,0 +1,139 @@
+# xgb_matrix_cache.py
+# Quantitative AI - Reusable XGBoost Matrices for Histogram Training
+import os
+import tempfile
+import numpy as np
+import xgboost as xgb
+
+# Share of available RAM the feature array may use before switching to external memory
+IN_MEMORY_FRACTION = 0.5
+
+
+def available_memory():
+    """Available physical memory in bytes (None when the platform cannot tell)"""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class RangeBatchIterator(xgb.DataIter):
+    """Feeds rows [start, stop) of the feature array to XGBoost in fixed-size batches"""
+
+    def __init__(self, X, y, start, stop, batch_rows, cache_prefix=None):
+        self.X = X
+        self.y = y
+        self.batches = [(s, min(s + batch_rows, stop)) for s in range(start, stop, batch_rows)]
+        self.position = 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        """Hand the next batch to XGBoost; False once all batches are consumed"""
+        if self.position == len(self.batches):
+            return False
+        s, e = self.batches[self.position]
+        input_data(data=self.X[s:e], label=self.y[s:e])
+        self.position += 1
+        return True
+
+    def reset(self):
+        self.position = 0
+
+
+class XGBMatrixCache:
+    """
+    Builds XGBoost matrices from the cached float32 feature array once
+    Each training row range sketches its histogram cuts from its own rows
+    only, and the evaluation ranges that validate it reuse those cuts, so
+    held-out rows never shape the bins; every matrix is kept for reuse by
+    later fits, folds and trials. When the array is larger than memory
+    allows, ranges stream through an external-memory iterator
+    """
+
+    def __init__(self, X, y, max_bin=256, n_threads=None, external_memory=None,
+                 batch_rows=100_000, cache_dir=None, train_rows=None):
+        """
+        Initialize with the feature array (ndarray or np.memmap) and target
+        train_rows: (start, stop) of the main training window, sketched up front
+        """
+        self.X = X
+        self.y = np.asarray(y, dtype=np.float32)
+        self.max_bin = max_bin
+        self.n_threads = n_threads
+        self.batch_rows = batch_rows
+        if external_memory is None:
+            budget = available_memory()
+            external_memory = budget is not None and X.nbytes > IN_MEMORY_FRACTION * budget
+        self.external_memory = external_memory
+        self.cache_dir = cache_dir
+        self.matrices = {}
+        self.reference = self.matrix(*train_rows) if train_rows is not None else None
+
+    def _build(self, start, stop, ref):
+        """QuantileDMatrix (in memory) or external-memory matrix for rows [start, stop)"""
+        if not self.external_memory:
+            # Slicing the array is a view, so no feature copy is made here
+            return xgb.QuantileDMatrix(self.X[start:stop], self.y[start:stop],
+                                       max_bin=self.max_bin, ref=ref, nthread=self.n_threads)
+        if self.cache_dir is None:
+            self.cache_dir = tempfile.mkdtemp(prefix='xgb_cache_')
+        prefix = os.path.join(self.cache_dir, f'rows_{start}_{stop}')
+        iterator = RangeBatchIterator(self.X, self.y, start, stop, self.batch_rows, prefix)
+        return xgb.ExtMemQuantileDMatrix(iterator, max_bin=self.max_bin, ref=ref,
+                                         nthread=self.n_threads)
+
+    def matrix(self, start, stop, train_rows=None):
+        """
+        Matrix for rows [start, stop), built on first use and kept
+        Evaluation sets pass the train_rows they validate, because XGBoost
+        wants the training matrix itself as their reference; training
+        ranges sketch their own cuts
+        """
+        key = (start, stop, train_rows)
+        if key not in self.matrices:
+            ref = self.matrix(*train_rows) if train_rows is not None else None
+            self.matrices[key] = self._build(start, stop, ref)
+        return self.matrices[key]
+
+
+class BoosterRegressor:
+    """
+    XGBoost trained with xgb.train on cached matrices, exposing the
+    predict/get_booster/save_model surface the forecaster uses
+    """
+
+    def __init__(self, params, cache=None, train_rows=None, n_threads=None):
+        self.params = dict(params)
+        self.cache = cache
+        self.train_rows = train_rows
+        self.n_threads = n_threads
+        self.booster = None
+
+    def train_params(self):
+        """Native parameters: histogram trees, fixed seed, thread budget"""
+        params = {k: v for k, v in self.params.items() if k != 'n_estimators'}
+        params.update({
+            'objective': 'reg:squarederror',
+            'tree_method': 'hist',
+            'max_bin': self.cache.max_bin,
+            'seed': 42
+        })
+        if self.n_threads:
+            params['nthread'] = self.n_threads
+        return params
+
+    def fit(self, X=None, y=None):
+        """Train on the cached rows (X and y are accepted for scheduler compatibility)"""
+        dtrain = self.cache.matrix(*self.train_rows)
+        self.booster = xgb.train(self.train_params(), dtrain,
+                                 num_boost_round=self.params.get('n_estimators', 100))
+        return self
+
+    def predict(self, X):
+        return self.booster.inplace_predict(X)
+
+    def get_booster(self):
+        return self.booster
+
+    def save_model(self, path):
+        self.booster.save_model(path)
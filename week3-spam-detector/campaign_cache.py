@@ -0,0 +1,210 @@
+# campaign_cache.py
+# Near-duplicate campaign cache (MinHash + banded LSH, LRU-bounded) in front of SpamDetector
+from collections import OrderedDict
+import numpy as np
+from email_features import EmailFeatureExtractor
+
+
+def lsh_bands(threshold, num_perm, recall=0.95):
+    """
+    (bands, rows) with bands x rows = num_perm: the most selective split
+    whose S-curve 1 - (1 - s**rows)**bands still makes pairs at the
+    threshold candidates with probability >= recall. Candidates are then
+    checked against the full signature, so a false candidate costs one
+    comparison while a missed one costs a full scoring
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands * rows == num_perm and 1 - (1 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles: num_perm multiply-shift hashes
+    ((a * h + b) mod 2**64, top 32 bits) of each shingle's hash, minimum
+    per hash function. Two signatures agree in a fraction of positions
+    that estimates the Jaccard similarity of the shingle sets
+    Token hashes use Python's hash(), so signatures are only comparable
+    within one process (the cache never leaves it)
+    """
+
+    def __init__(self, num_perm=64, shingle_size=3, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) << np.uint64(1) | np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self.mix = rng.integers(0, 1 << 63, shingle_size, dtype=np.uint64) | np.uint64(1)
+
+    def signatures(self, texts, chunk_size=64):
+        """
+        (texts x num_perm) signatures for a batch: the shingles of
+        chunk_size texts at a time are hashed together and reduced per
+        text with one minimum.reduceat
+        Tokens are case-folded, whitespace-separated words; texts shorter
+        than a shingle are padded
+        """
+        texts = list(texts)
+        out = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        k = self.shingle_size
+        for first in range(0, len(texts), chunk_size):
+            tokens, starts = [], []
+            for text in texts[first:first + chunk_size]:
+                words = text.casefold().split()
+                starts.append(len(tokens))
+                tokens.extend([hash(w) for w in words])
+                tokens.extend([0] * (k - len(words)))
+            tokens = np.array(tokens, dtype=np.int64).view(np.uint64)
+            starts = np.array(starts)
+            lengths = np.diff(np.r_[starts, len(tokens)])
+
+            # Hash of each run of k tokens, kept only if it stays inside its text
+            n = len(tokens) - k + 1
+            hashes = tokens[:n] * self.mix[0]
+            for i in range(1, k):
+                hashes = (hashes ^ (hashes >> np.uint64(29))) + tokens[i:i + n] * self.mix[i]
+            inside = np.arange(n) - np.repeat(starts, lengths)[:n] <= np.repeat(lengths - k, lengths)[:n]
+            # (num_perm x shingles), so each text's minimum runs over contiguous memory
+            values = np.multiply.outer(self.a, hashes[inside])
+            values += self.b[:, None]
+            values >>= np.uint64(32)
+            offsets = np.r_[0, np.cumsum(lengths - k + 1)[:-1]]
+            out[first:first + len(starts)] = np.minimum.reduceat(values, offsets, axis=1).T
+        return out
+
+    def signature(self, text):
+        return self.signatures([text])[0]
+
+
+class CampaignCache:
+    """
+    Verdicts keyed by MinHash signature: signatures are split into bands,
+    each band hashed into its own table, so a lookup only compares against
+    messages that share at least one band. A candidate is a hit when its
+    estimated similarity reaches the threshold. At most max_entries
+    messages are kept (signatures in one preallocated array); the least
+    recently used one is evicted first
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, max_entries=10_000, seed=2):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self.band_mix = np.random.default_rng(seed).integers(0, 1 << 63, self.rows, dtype=np.uint64)
+        self.tables = [{} for _ in range(self.bands)]
+        self.signatures = np.zeros((max_entries, num_perm), dtype=np.uint64)
+        self.free = list(range(max_entries - 1, -1, -1))
+        # slot -> [band keys, verdict], least recently used first
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def band_keys(self, signatures):
+        """(signatures x bands) integer keys, one hash per band of rows values"""
+        signatures = np.asarray(signatures).reshape(-1, self.bands, self.rows)
+        return (signatures * self.band_mix).sum(axis=2).tolist()
+
+    def lookup(self, signature, keys):
+        """Cached entry [keys, verdict] of the most similar message, or None"""
+        candidates = set()
+        for table, key in zip(self.tables, keys):
+            bucket = table.get(key)
+            if bucket:
+                candidates.update(bucket)
+        if candidates:
+            slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+            similarity = (self.signatures[slots] == signature).mean(axis=1)
+            best = int(similarity.argmax())
+            if similarity[best] >= self.threshold:
+                self.hits += 1
+                self.entries.move_to_end(slots[best])
+                return self.entries[slots[best]]
+        self.misses += 1
+        return None
+
+    def _remove(self, slot):
+        keys, _ = self.entries.pop(slot)
+        for table, key in zip(self.tables, keys):
+            bucket = table[key]
+            bucket.discard(slot)
+            if not bucket:
+                del table[key]
+        self.free.append(slot)
+
+    def insert(self, signature, keys, verdict=None):
+        """Add a message; returns its entry so a pending verdict can be filled in later"""
+        if not self.free:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+        slot = self.free.pop()
+        self.signatures[slot] = signature
+        entry = [keys, verdict]
+        self.entries[slot] = entry
+        for table, key in zip(self.tables, keys):
+            table.setdefault(key, set()).add(slot)
+        return entry
+
+    def discard_pending(self):
+        """Drop entries whose verdict was never filled in (their scoring failed)"""
+        for slot in [slot for slot, (_, verdict) in self.entries.items() if verdict is None]:
+            self._remove(slot)
+
+    @property
+    def hit_rate(self):
+        return self.hits / max(self.hits + self.misses, 1)
+
+
+class CachedSpamDetector:
+    """
+    A trained SpamDetector behind a campaign cache: near-duplicates of a
+    recently scored message reuse its verdict; only the rest go through
+    feature extraction and the model, as one batch per call
+    """
+
+    def __init__(self, detector, extractor=None, threshold=0.8, num_perm=64, max_entries=10_000):
+        self.detector = detector
+        self.extractor = extractor or EmailFeatureExtractor()
+        self.hasher = MinHasher(num_perm)
+        self.cache = CampaignCache(threshold, num_perm, max_entries)
+
+    def classify(self, texts):
+        """
+        Structured array with 'prediction', 'spam_probability' and 'cached'
+        for a list of message texts, in order
+        """
+        texts = list(texts)
+        scored = np.zeros(len(texts), dtype=[('prediction', np.int8), ('spam_probability', np.float64),
+                                             ('cached', bool)])
+        entries, misses = [], []
+        signatures = self.hasher.signatures(texts)
+        for i, (signature, keys) in enumerate(zip(signatures, self.cache.band_keys(signatures))):
+            entry = self.cache.lookup(signature, keys)
+            if entry is None:
+                # Later copies in this batch can hit the pending entry
+                entry = self.cache.insert(signature, keys)
+                misses.append(i)
+            else:
+                scored['cached'][i] = True
+            entries.append(entry)
+
+        if misses:
+            try:
+                features = self.extractor.extract([texts[i] for i in misses])
+                verdicts = self.detector.predict_batch(features)
+            except Exception:
+                # Don't leave verdict-less entries for later lookups to hit
+                self.cache.discard_pending()
+                raise
+            for i, verdict in zip(misses, verdicts):
+                entries[i][1] = (verdict['prediction'], verdict['spam_probability'])
+        for i, entry in enumerate(entries):
+            scored['prediction'][i], scored['spam_probability'][i] = entry[1]
+        return scored
+
+    def stats(self):
+        cache = self.cache
+        return {'hits': cache.hits, 'misses': cache.misses, 'hit_rate': round(cache.hit_rate, 4),
+                'entries': len(cache.entries), 'evictions': cache.evictions,
+                'bands': cache.bands, 'rows': cache.rows}
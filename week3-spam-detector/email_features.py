@@ -0,0 +1,175 @@
+# email_features.py
+# Stream raw emails (.eml, mbox or CSV) into SpamDetector feature batches
+import os
+import re
+import mailbox
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from email import policy
+from email.parser import BytesParser
+import pandas as pd
+from lexicon_matcher import LexiconMatcher, DEFAULT_LEXICON
+
+FEATURE_COLUMNS = ['word_count', 'exclamations', 'money_words', 'all_caps']
+
+HTML_TAG = re.compile(r'<[^>]+>')
+
+
+class EmailFeatureExtractor:
+    """
+    Computes the detector's four features from message text: counts of
+    compiled regexes applied to whole chunks (pandas .str methods) plus
+    lexicon hits per category (money_words, ...) from an Aho-Corasick pass
+    extras: {column: regex} of additional counted patterns
+    lexicon: LexiconMatcher, lexicon file path or None to skip
+    """
+
+    def __init__(self, extras=None, lexicon=DEFAULT_LEXICON):
+        self.patterns = {
+            'word_count': re.compile(r'\S+'),
+            'exclamations': re.compile(r'!'),
+            'all_caps': re.compile(r'\b[A-Z][A-Z0-9]+\b'),
+        }
+        for name, pattern in (extras or {}).items():
+            self.patterns[name] = re.compile(pattern)
+        if lexicon is not None and not isinstance(lexicon, LexiconMatcher):
+            lexicon = LexiconMatcher.from_file(lexicon)
+        self.lexicon = lexicon
+
+    @property
+    def columns(self):
+        return list(self.patterns) + (self.lexicon.categories if self.lexicon else [])
+
+    def extract(self, texts):
+        """Feature frame (one row per text) from a Series or list of texts"""
+        texts = pd.Series(texts, dtype=object).fillna('').astype(str)
+        features = pd.DataFrame({name: texts.str.count(pattern).to_numpy()
+                                 for name, pattern in self.patterns.items()})
+        if self.lexicon is not None:
+            hits = self.lexicon.count_many(texts)
+            for j, category in enumerate(self.lexicon.categories):
+                features[category] = hits[:, j]
+        return features
+
+
+def message_text(raw):
+    """Subject plus plain-text body (HTML tags stripped) of one raw message"""
+    message = BytesParser(policy=policy.default).parsebytes(raw)
+    body = message.get_body(preferencelist=('plain', 'html'))
+    content = ''
+    if body is not None:
+        try:
+            content = body.get_content()
+        except (LookupError, UnicodeError):
+            content = body.get_payload(decode=True).decode('latin-1')
+        if body.get_content_subtype() == 'html':
+            content = HTML_TAG.sub(' ', content)
+    return f"{message.get('subject', '')}\n{content}"
+
+
+def frame_text(frame):
+    """Subject and body (or a single text column) of CSV rows, joined"""
+    columns = [c for c in ('subject', 'body', 'text') if c in frame.columns]
+    if not columns:
+        raise ValueError(f"CSV needs a 'subject', 'body' or 'text' column, got {list(frame.columns)}")
+    texts = frame[columns[0]].fillna('').astype(str)
+    for column in columns[1:]:
+        texts = texts + '\n' + frame[column].fillna('').astype(str)
+    return texts
+
+
+def _raw_messages(path):
+    """(id, bytes) for each message of an .eml file, a folder of them or an mbox"""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.eml'):
+                with open(os.path.join(path, name), 'rb') as f:
+                    yield os.path.join(path, name), f.read()
+    elif path.endswith('.eml'):
+        with open(path, 'rb') as f:
+            yield path, f.read()
+    else:
+        box = mailbox.mbox(path, create=False)
+        for key in box.iterkeys():
+            yield f'{path}:{key}', box.get_bytes(key)
+
+
+def iter_sources(paths, chunk_size=1000):
+    """
+    Chunks of ('raw', ids, messages) or ('text', ids, frame) without
+    loading a whole corpus: messages are read one at a time, CSVs with
+    read_csv(chunksize=...)
+    """
+    raw_ids, raw = [], []
+    for path in [paths] if isinstance(paths, (str, os.PathLike)) else paths:
+        path = str(path)
+        if path.endswith('.csv'):
+            if raw:
+                yield 'raw', raw_ids, raw
+                raw_ids, raw = [], []
+            for frame in pd.read_csv(path, chunksize=chunk_size):
+                yield 'text', [f'{path}:{i}' for i in frame.index], frame
+            continue
+        for message_id, message in _raw_messages(path):
+            raw_ids.append(message_id)
+            raw.append(message)
+            if len(raw) == chunk_size:
+                yield 'raw', raw_ids, raw
+                raw_ids, raw = [], []
+    if raw:
+        yield 'raw', raw_ids, raw
+
+
+def _extract_chunk(kind, ids, items, extractor, keep_text=False):
+    """Worker entry point: features (plus any is_spam label) for one chunk"""
+    labels = None
+    if kind == 'raw':
+        texts = [message_text(raw) for raw in items]
+    else:
+        texts = frame_text(items)
+        if 'is_spam' in items.columns:
+            labels = items['is_spam'].to_numpy()
+    features = extractor.extract(texts)
+    features.insert(0, 'source', ids)
+    if keep_text:
+        features['text'] = list(texts)
+    if labels is not None:
+        features['is_spam'] = labels
+    return features
+
+
+def stream_features(paths, chunk_size=1000, n_workers=None, extractor=None, keep_text=False):
+    """
+    Yield feature DataFrames chunk by chunk, in input order
+    Chunks are extracted in a process pool with at most 2 x n_workers in
+    flight, so memory stays bounded by the chunk size, not the corpus
+    keep_text: also return each message's text (for models over tokens)
+    """
+    extractor = extractor or EmailFeatureExtractor()
+    n_workers = n_workers or os.cpu_count() or 1
+    chunks = iter_sources(paths, chunk_size)
+    if n_workers == 1:
+        for kind, ids, items in chunks:
+            yield _extract_chunk(kind, ids, items, extractor, keep_text)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pending = deque()
+        for kind, ids, items in chunks:
+            pending.append(pool.submit(_extract_chunk, kind, ids, items, extractor, keep_text))
+            if len(pending) >= 2 * n_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python email_features.py <.eml | folder | mbox | .csv> ...")
+        sys.exit(1)
+    total = 0
+    for batch in stream_features(sys.argv[1:]):
+        total += len(batch)
+        print(batch.head())
+    print(f"\n📧 Extracted features for {total} emails")
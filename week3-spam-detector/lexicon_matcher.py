@@ -0,0 +1,114 @@
+# lexicon_matcher.py
+# Aho-Corasick matcher counting lexicon hits per category in one pass
+import os
+import numpy as np
+
+DEFAULT_LEXICON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'spam_lexicon.txt')
+
+
+def is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def read_lexicon(path=DEFAULT_LEXICON):
+    """{category: [phrases]} from 'category: phrase' lines ('#' starts a comment)"""
+    lexicon = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            category, phrase = line.split(':', 1)
+            lexicon.setdefault(category.strip(), []).append(phrase.strip())
+    return lexicon
+
+
+class LexiconMatcher:
+    """
+    Aho-Corasick automaton over a case-folded lexicon
+    The automaton is built once as a full transition table (failure links
+    folded in), so matching is one dict lookup per character; a hit only
+    counts when it starts and ends on a word boundary (phrases that begin
+    or end with a symbol such as '$' match anywhere). A run of an all-symbol
+    phrase counts once, so '$$$' is one money word, as the regex '\\$+' was
+    """
+
+    def __init__(self, lexicon):
+        """lexicon: {category: [words or phrases]} or a lexicon file path"""
+        if isinstance(lexicon, (str, os.PathLike)):
+            lexicon = read_lexicon(lexicon)
+        self.categories = list(lexicon)
+
+        # Trie of case-folded phrases
+        goto, outputs = [{}], [[]]
+        for c, category in enumerate(self.categories):
+            for phrase in lexicon[category]:
+                phrase = phrase.casefold()
+                node = 0
+                for ch in phrase:
+                    if ch not in goto[node]:
+                        goto.append({})
+                        outputs.append([])
+                        goto[node][ch] = len(goto) - 1
+                    node = goto[node][ch]
+                left, right = is_word_char(phrase[0]), is_word_char(phrase[-1])
+                # All-symbol phrases keep their text to spot an immediate repeat
+                outputs[node].append((c, len(phrase), left, right,
+                                      None if left or right else phrase))
+
+        # Failure links breadth-first, merging outputs and completing the
+        # transition table from each node's failure state
+        alphabet = set(ch for edges in goto for ch in edges)
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for node in queue:
+            outputs[node] = outputs[node] + outputs[fail[node]]
+            table = {}
+            for ch in alphabet:
+                if ch in goto[node]:
+                    child = goto[node][ch]
+                    fail[child] = delta[fail[node]].get(ch, 0) if node else 0
+                    queue.append(child)
+                    table[ch] = child
+                else:
+                    target = delta[fail[node]].get(ch, 0)
+                    if target:
+                        table[ch] = target
+            delta[node] = table
+        self.delta = delta
+        self.outputs = [tuple(out) for out in outputs]
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_LEXICON):
+        return cls(read_lexicon(path))
+
+    def count(self, text):
+        """Hits per category (list, in self.categories order) for one text"""
+        text = text.casefold()
+        counts = [0] * len(self.categories)
+        delta, outputs = self.delta, self.outputs
+        end = len(text) - 1
+        state = 0
+        # End of the last hit of each all-symbol phrase; touching hits form a run
+        run_end = {}
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for category, length, left, right, symbols in outputs[state]:
+                    start = i - length + 1
+                    if left and start > 0 and is_word_char(text[start - 1]):
+                        continue
+                    if right and i < end and is_word_char(text[i + 1]):
+                        continue
+                    if symbols:
+                        in_run = run_end.get(symbols, -2) >= start - 1
+                        run_end[symbols] = i
+                        if in_run:
+                            continue
+                    counts[category] += 1
+        return counts
+
+    def count_many(self, texts):
+        """(texts x categories) hit counts"""
+        return np.array([self.count(text) for text in texts], dtype=np.int64).reshape(-1, len(self.categories))
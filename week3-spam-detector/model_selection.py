@@ -0,0 +1,159 @@
+# model_selection.py
+# Parallel repeated stratified k-fold model selection for the spam detector
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, precision_score, recall_score
+from sklearn.model_selection import RepeatedStratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+from email_features import FEATURE_COLUMNS
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'email_data.csv')
+CACHE_DIR = '.cv_cache'
+
+# Simplest first, so equally good candidates resolve to the simpler model
+CANDIDATES = {
+    'tree (max_depth=2)': DecisionTreeClassifier(max_depth=2, random_state=42),
+    'tree (max_depth=3)': DecisionTreeClassifier(max_depth=3, random_state=42),
+    'tree (max_depth=5)': DecisionTreeClassifier(max_depth=5, random_state=42),
+    'tree (unlimited)': DecisionTreeClassifier(random_state=42),
+    'logistic regression': make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000)),
+    'random forest': RandomForestClassifier(n_estimators=100, random_state=42),
+    'gradient boosting': GradientBoostingClassifier(random_state=42),
+}
+METRICS = ['accuracy', 'precision', 'recall', 'fit_ms', 'predict_ms']
+
+
+def fold_masks(y, folds=5, repeats=10, seed=42):
+    """(splits x rows) boolean test masks of repeated stratified k-fold"""
+    splitter = RepeatedStratifiedKFold(n_splits=folds, n_repeats=repeats, random_state=seed)
+    test = np.zeros((folds * repeats, len(y)), dtype=bool)
+    for i, (_, test_index) in enumerate(splitter.split(np.zeros(len(y)), y)):
+        test[i, test_index] = True
+    return test
+
+
+def load_cached(path=DATA, folds=5, repeats=10, seed=42, cache_dir=CACHE_DIR):
+    """
+    Feature matrix, labels and fold masks for a CSV, stored in cache_dir
+    under a key of the file's path, size and modification time plus the
+    split settings, so reruns skip both the CSV parse and the splitting
+    Returns (X, y, test masks, loaded from cache)
+    """
+    stat = os.stat(path)
+    key = hashlib.sha1(f'{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|'
+                       f'{FEATURE_COLUMNS}|{folds}|{repeats}|{seed}'.encode()).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f'cv_{key}.npz')
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as cached:
+            return cached['X'], cached['y'], cached['test'], True
+
+    data = pd.read_csv(path)
+    X = data[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+    y = data['is_spam'].to_numpy()
+    test = fold_masks(y, folds, repeats, seed)
+    os.makedirs(cache_dir, exist_ok=True)
+    np.savez(cache_path, X=X, y=y, test=test)
+    return X, y, test, False
+
+
+# Worker state, set once per process by _init_worker instead of pickled per task
+_shared = {}
+
+
+def _init_worker(X, y, test, candidates):
+    _shared.update(X=X, y=y, test=test, candidates=candidates)
+
+
+def _run_fold(task):
+    """Fit and score one candidate on one split"""
+    name, split = task
+    X, y, test = _shared['X'], _shared['y'], _shared['test'][split]
+    model = clone(_shared['candidates'][name])
+    start = time.perf_counter()
+    model.fit(X[~test], y[~test])
+    fitted = time.perf_counter()
+    predicted = model.predict(X[test])
+    done = time.perf_counter()
+    return {'candidate': name, 'split': split,
+            'accuracy': accuracy_score(y[test], predicted),
+            'precision': precision_score(y[test], predicted, zero_division=0),
+            'recall': recall_score(y[test], predicted, zero_division=0),
+            'fit_ms': (fitted - start) * 1000, 'predict_ms': (done - fitted) * 1000}
+
+
+def cross_validate(X, y, test, candidates=None, n_workers=None):
+    """
+    Per-split scores of every candidate (DataFrame, one row per split)
+    (candidate, split) tasks run in a process pool; the data and masks
+    are sent to each worker once
+    """
+    candidates = candidates or CANDIDATES
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+    tasks = [(name, split) for name in candidates for split in range(len(test))]
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1:
+        _init_worker(X, y, test, candidates)
+        return pd.DataFrame([_run_fold(task) for task in tasks])
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(X, y, test, candidates)) as pool:
+        chunk = max(len(tasks) // (4 * n_workers), 1)
+        return pd.DataFrame(list(pool.map(_run_fold, tasks, chunksize=chunk)))
+
+
+def summarize(results):
+    """
+    Mean and std of every metric per candidate, best accuracy first; ties
+    go to the steadier candidate, then to the earlier (simpler) one
+    """
+    summary = results.groupby('candidate', sort=False)[METRICS].agg(['mean', 'std'])
+    summary.columns = [f'{metric}_{stat}' for metric, stat in summary.columns]
+    return summary.sort_values(['accuracy_mean', 'accuracy_std'], ascending=[False, True], kind='stable')
+
+
+def print_summary(summary):
+    print(f"\n  {'Candidate':<22}{'accuracy':>15}{'precision':>15}{'recall':>15}{'fit ms':>9}{'pred ms':>9}")
+    for name, row in summary.iterrows():
+        scores = ''.join(f"{row[f'{m}_mean']:>9.1%} ±{row[f'{m}_std']:>4.0%}"
+                         for m in ('accuracy', 'precision', 'recall'))
+        print(f"  {name:<22}{scores}{row['fit_ms_mean']:>9.2f}{row['predict_ms_mean']:>9.2f}")
+
+
+def main(path=DATA, folds=5, repeats=10, n_workers=None):
+    print("="*60)
+    print("🏁 SPAM MODEL SELECTION")
+    print("="*60)
+
+    start = time.perf_counter()
+    X, y, test, cached = load_cached(path, folds, repeats)
+    print(f"\n{len(y)} emails, {folds}-fold x {repeats} repeats = {len(test)} splits "
+          f"({'cached' if cached else 'computed'} in {time.perf_counter() - start:.3f}s)")
+
+    start = time.perf_counter()
+    results = cross_validate(X, y, test, n_workers=n_workers)
+    print(f"{len(CANDIDATES)} candidates x {len(test)} splits in {time.perf_counter() - start:.1f}s")
+
+    summary = summarize(results)
+    print_summary(summary)
+    print(f"\n🏆 Best: {summary.index[0]}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validate candidate spam models")
+    parser.add_argument('--data', default=DATA, help="labelled feature CSV")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+    main(args.data, args.folds, args.repeats, args.workers)
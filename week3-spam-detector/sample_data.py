@@ -0,0 +1,69 @@
+# sample_data.py
+# Trained detector and synthetic emails shared by the tests and the benchmarks
+import os
+import numpy as np
+import pandas as pd
+from lexicon_matcher import read_lexicon
+from spam_detector import SpamDetector
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'email_data.csv')
+
+
+def trained_detector(path=DATA):
+    """Detector fitted on the sample emails (created if missing)"""
+    detector = SpamDetector()
+    if os.path.exists(path):
+        detector.data = pd.read_csv(path)
+    else:
+        from prepare_data import create_sample_emails
+        detector.data = create_sample_emails()
+    detector.prepare_features()
+    detector.split_data()
+    detector.model.fit(detector.X_train, detector.y_train)
+    detector.is_trained = True
+    return detector
+
+
+def synthetic_features(n, seed=0):
+    """(n, 4) feature rows spanning the ranges of the sample data"""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.integers(5, 300, n), rng.integers(0, 8, n),
+                            rng.integers(0, 8, n), rng.integers(0, 10, n)]).astype(np.float64)
+
+
+HAM_WORDS = ['meeting', 'project', 'update', 'thanks', 'team', 'report', 'schedule', 'tomorrow',
+             'review', 'notes', 'attached', 'please', 'call', 'lunch', 'budget', 'class', 'homework',
+             'shipping', 'invoice', 'weekend', 'family', 'photos', 'agenda', 'draft']
+NAMES = ['alex', 'sam', 'jordan', 'taylor', 'morgan', 'casey', 'riley', 'jamie', 'drew', 'quinn']
+
+
+def campaign_stream(n_emails, n_campaigns=50, campaign_share=0.8, edit_rate=0.01, seed=0):
+    """
+    Messages where campaign_share are copies of n_campaigns templates (each
+    copy with its own recipient name, amount and edit_rate of words
+    swapped) and the rest are unique normal messages
+    Returns (texts, campaign id per message, -1 for unique mail)
+    """
+    rng = np.random.default_rng(seed)
+    lexicon = [p for phrases in read_lexicon().values() for p in phrases]
+    vocabulary = HAM_WORDS + lexicon
+    templates = []
+    for _ in range(n_campaigns):
+        words = rng.choice(vocabulary, int(rng.integers(40, 150))).tolist()
+        templates.append(['{name}', 'ACT', 'NOW!!'] + words + ['${amount}'])
+
+    texts, campaigns = [], []
+    for _ in range(n_emails):
+        if rng.random() < campaign_share:
+            c = int(rng.integers(n_campaigns))
+            words = list(templates[c])
+            for j in np.flatnonzero(rng.random(len(words)) < edit_rate):
+                words[j] = vocabulary[rng.integers(len(vocabulary))]
+            text = ' '.join(words).format(name=NAMES[rng.integers(len(NAMES))],
+                                          amount=int(rng.integers(100, 10_000)))
+        else:
+            c = -1
+            text = ' '.join(rng.choice(HAM_WORDS, int(rng.integers(30, 150))))
+        texts.append(text)
+        campaigns.append(c)
+    return texts, np.array(campaigns)
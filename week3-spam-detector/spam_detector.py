@@ -1,4 +1,5 @@
 # spam_detector.py 
+import warnings 
 import pandas as pd 
 import numpy as np 
 from sklearn.model_selection import train_test_split 
@@ -12,6 +13,9 @@ class SpamDetector:
     Demonstrates concepts from Chapter 18 
     """ 
      
+    # Features (things we measure about emails), in model column order 
+    feature_columns = ['word_count', 'exclamations', 'money_words', 'all_caps'] 
+     
     def __init__(self): 
         self.model = DecisionTreeClassifier(max_depth=3) 
         self.is_trained = False 
@@ -29,7 +33,7 @@ class SpamDetector:
         Labels: what we're trying to predict 
         """ 
         # Features (things we measure about emails) 
-        feature_columns = ['word_count', 'exclamations', 'money_words', 'all_caps'] 
+        feature_columns = self.feature_columns 
         self.X = self.data[feature_columns] 
          
         # Labels (spam or not spam) 
@@ -84,18 +88,39 @@ class SpamDetector:
          
         return test_accuracy 
      
+    def select_model(self, folds=5, repeats=10, n_workers=None, keep_best=False): 
+        """ 
+        Compare candidate models with repeated stratified k-fold 
+        cross-validation on all the data (one split of a small dataset 
+        is mostly noise). keep_best=True swaps in the winner; train() it 
+        Returns the summary table (see model_selection.py) 
+        """ 
+        from sklearn.base import clone 
+        from model_selection import CANDIDATES, fold_masks, cross_validate, summarize, print_summary 
+         
+        print(f"\n🏁 Cross-validating {len(CANDIDATES)} candidate models...") 
+        test = fold_masks(self.y, folds, repeats) 
+        summary = summarize(cross_validate(self.X, self.y, test, n_workers=n_workers)) 
+        print_summary(summary) 
+         
+        if keep_best: 
+            self.model = clone(CANDIDATES[summary.index[0]]) 
+            self.is_trained = False 
+            print(f"Using {summary.index[0]} - call train() to fit it") 
+        return summary 
+     
     def predict_email(self, word_count, exclamations, money_words, all_caps): 
         """Predict if a single email is spam""" 
         if not self.is_trained: 
             print("Model not trained yet!") 
             return 
          
-        features = [[word_count, exclamations, money_words, all_caps]] 
-        prediction = self.model.predict(features)[0] 
-        probability = self.model.predict_proba(features)[0] 
+        scored = self.predict_batch([[word_count, exclamations, money_words, all_caps]])[0] 
+        prediction = int(scored['prediction']) 
+        spam_probability = scored['spam_probability'] 
          
         result = "SPAM" if prediction == 1 else "NORMAL" 
-        confidence = max(probability) * 100 
+        confidence = max(spam_probability, 1 - spam_probability) * 100 
          
         print(f"\n📧 Email Analysis:") 
         print(f"  Word count: {word_count}") 
@@ -107,6 +132,70 @@ class SpamDetector:
          
         return prediction 
      
+    def predict_batch(self, X, chunk_size=65536): 
+        """ 
+        Score any number of emails without printing 
+        X: DataFrame with the feature columns, or an (n, 4) array/list in 
+        feature column order (one row may be given flat); any other shape 
+        raises ValueError. Probabilities are computed once per chunk of 
+        chunk_size rows and labels derived from them 
+        Returns a structured array with 'prediction' and 'spam_probability' 
+        """ 
+        if not self.is_trained: 
+            raise RuntimeError("Model not trained yet!") 
+         
+        if isinstance(X, pd.DataFrame): 
+            X = X[self.feature_columns].to_numpy(dtype=np.float64) 
+        X = np.asarray(X, dtype=np.float64) 
+        if X.ndim == 1: 
+            X = X[np.newaxis, :]   # a single email 
+        if X.ndim != 2 or X.shape[1] != len(self.feature_columns): 
+            raise ValueError(f"Expected rows of {len(self.feature_columns)} features " 
+                             f"({', '.join(self.feature_columns)}), got shape {X.shape}") 
+         
+        scored = np.empty(len(X), dtype=[('prediction', np.int8), ('spam_probability', np.float64)]) 
+        # Trained on ham only, the model has no spam column: spam probability is 0 
+        classes = list(self.model.classes_) 
+        spam_column = classes.index(1) if 1 in classes else None 
+        with warnings.catch_warnings(): 
+            # Columns are already in feature_columns order, the names the model was fitted with 
+            warnings.filterwarnings('ignore', message='X does not have valid feature names') 
+            for start in range(0, len(X), chunk_size): 
+                probability = self.model.predict_proba(X[start:start + chunk_size]) 
+                scored['spam_probability'][start:start + chunk_size] = ( 
+                    probability[:, spam_column] if spam_column is not None else 0.0) 
+                scored['prediction'][start:start + chunk_size] = self.model.classes_[probability.argmax(axis=1)] 
+        return scored 
+     
+    def compile_tree(self): 
+        """ 
+        Export the trained tree as flat NumPy arrays for fast scoring 
+        Returns a tree_compiler.CompiledTree (save() it for a mail gateway) 
+        Raises TypeError if select_model swapped in a model that is not a tree 
+        """ 
+        if not self.is_trained: 
+            raise RuntimeError("Model not trained yet!") 
+         
+        from tree_compiler import CompiledTree 
+        return CompiledTree.from_model(self.model, self.feature_columns) 
+     
+    def score_emails(self, paths, chunk_size=1000, n_workers=None, extractor=None): 
+        """ 
+        Score raw mail (.eml files or folders, mbox files or a CSV of 
+        subject/body text) batch by batch, without loading the whole corpus 
+        Yields DataFrames of source, features, prediction and spam_probability 
+        """ 
+        if not self.is_trained: 
+            print("Model not trained yet!") 
+            return 
+         
+        from email_features import stream_features 
+        for batch in stream_features(paths, chunk_size, n_workers, extractor): 
+            scored = self.predict_batch(batch) 
+            batch['prediction'] = scored['prediction'] 
+            batch['spam_probability'] = scored['spam_probability'] 
+            yield batch 
+     
     def visualize_data(self): 
         """Create visualizations to understand the data""" 
         fig, axes = plt.subplots(2, 2, figsize=(12, 10)) 
@@ -135,7 +224,7 @@ class SpamDetector:
         axes[1,0].set_title('Money Word Usage') 
          
         # Plot 4: Feature importance 
-        if self.is_trained: 
+        if self.is_trained and hasattr(self.model, 'feature_importances_'): 
             importance = self.model.feature_importances_ 
             features = ['Word Count', 'Exclamations', 'Money Words', 'All Caps'] 
             axes[1,1].bar(features, importance) 
@@ -0,0 +1,69 @@
+# test_campaign_cache.py
+# Near-duplicates reuse a cached verdict; unrelated mail and failures don't
+import numpy as np
+import pytest
+from campaign_cache import CachedSpamDetector, CampaignCache, MinHasher, lsh_bands
+from email_features import EmailFeatureExtractor
+from sample_data import campaign_stream, trained_detector
+
+
+def test_lsh_bands():
+    bands, rows = lsh_bands(0.8, 64)
+    assert bands * rows == 64
+    assert 1 - (1 - 0.8 ** rows) ** bands >= 0.95
+
+
+def test_minhash_estimates_jaccard():
+    hasher = MinHasher(num_perm=256)
+    words = [f'w{i}' for i in range(200)]
+    edited = words[:180] + [f'x{i}' for i in range(20)]
+    a, b, c = hasher.signatures([' '.join(words), ' '.join(edited), 'something else entirely'])
+    # 3-word shingles: 198 per text, 178 shared
+    assert abs((a == b).mean() - 178 / 218) < 0.1
+    assert (a == c).mean() < 0.05
+    assert np.array_equal(hasher.signature(' '.join(words)), a)
+    assert hasher.signatures(['', 'one']).shape == (2, 256)
+
+
+def test_cache_evicts_least_recently_used():
+    hasher, cache = MinHasher(), CampaignCache(max_entries=2)
+    texts = [f'message number {i} about topic {i} with words {i}' for i in range(3)]
+    signatures = hasher.signatures(texts)
+    keys = cache.band_keys(signatures)
+    for signature, key, verdict in zip(signatures[:2], keys[:2], ['a', 'b']):
+        cache.insert(signature, key, verdict)
+    assert cache.lookup(signatures[0], keys[0])[1] == 'a'   # 'a' is now most recent
+    cache.insert(signatures[2], keys[2], 'c')
+    assert cache.evictions == 1
+    assert cache.lookup(signatures[1], keys[1]) is None
+    assert cache.lookup(signatures[2], keys[2])[1] == 'c'
+
+
+def test_cached_verdicts_match_direct_scoring():
+    detector = trained_detector()
+    extractor = EmailFeatureExtractor()
+    texts, campaigns = campaign_stream(1_500, seed=3)
+    direct = detector.predict_batch(extractor.extract(texts))
+    cached = CachedSpamDetector(detector, extractor, threshold=0.8, max_entries=500)
+    scored = np.concatenate([cached.classify(texts[i:i + 250]) for i in range(0, len(texts), 250)])
+    assert cached.cache.hit_rate > 0.5
+    assert (scored['prediction'] == direct['prediction']).mean() > 0.97
+    assert not scored['cached'][campaigns < 0].any()
+    assert not scored['cached'][:1].any()
+
+
+def test_failed_scoring_leaves_no_pending_entries():
+    detector = trained_detector()
+    cached = CachedSpamDetector(detector)
+    texts, _ = campaign_stream(50, seed=4)
+
+    def fail(features):
+        raise RuntimeError('model unavailable')
+
+    detector.predict_batch, score = fail, detector.predict_batch
+    with pytest.raises(RuntimeError):
+        cached.classify(texts)
+    assert len(cached.cache.entries) == 0 and all(not table for table in cached.cache.tables)
+
+    detector.predict_batch = score
+    assert len(cached.classify(texts)) == 50
@@ -0,0 +1,69 @@
+# test_email_features.py
+# Raw emails (.eml, mbox, CSV) stream into the detector's feature columns
+import mailbox
+from email.message import EmailMessage
+import pandas as pd
+import pytest
+from email_features import EmailFeatureExtractor, FEATURE_COLUMNS, frame_text, message_text, stream_features
+
+
+def email(subject, body, html=False):
+    message = EmailMessage()
+    message['Subject'] = subject
+    message['From'] = 'sender@example.com'
+    if html:
+        message.set_content(f'<html><body><p>{body}</p></body></html>', subtype='html')
+    else:
+        message.set_content(body)
+    return message
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Two .eml files, a 3-message mbox and a labelled CSV"""
+    folder = tmp_path / 'eml'
+    folder.mkdir()
+    (folder / 'a.eml').write_bytes(bytes(email('Meeting notes', 'See you at the meeting.')))
+    (folder / 'b.eml').write_bytes(bytes(email('WIN CASH NOW', 'Claim your FREE prize $$$!!', html=True)))
+    box = mailbox.mbox(tmp_path / 'mail.mbox')
+    for i in range(3):
+        box.add(email(f'Report {i}', 'Quarterly numbers attached.'))
+    box.flush()
+    csv = tmp_path / 'labelled.csv'
+    pd.DataFrame({'subject': ['Hi', 'FREE money!!!'], 'body': ['Lunch today?', None],
+                  'is_spam': [0, 1]}).to_csv(csv, index=False)
+    return [folder, tmp_path / 'mail.mbox', csv]
+
+
+def test_extract_counts():
+    features = EmailFeatureExtractor().extract(['WIN FREE CASH now!! $$$ prize', 'hello there', None])
+    assert list(features.columns[:4]) == ['word_count', 'exclamations', 'all_caps', 'money_words']
+    assert features.loc[0, ['word_count', 'exclamations', 'all_caps', 'money_words']].tolist() == [6, 2, 3, 5]
+    assert features.loc[1].tolist()[:4] == [2, 0, 0, 0]
+    assert features.loc[2, 'word_count'] == 0
+    assert set(FEATURE_COLUMNS) <= set(features.columns)
+
+
+def test_message_text_strips_html(corpus):
+    text = message_text((corpus[0] / 'b.eml').read_bytes())
+    assert text.startswith('WIN CASH NOW\n')
+    assert '<p>' not in text and 'Claim your FREE prize' in text
+
+
+def test_frame_text():
+    frame = pd.DataFrame({'subject': ['a', None], 'body': ['b', 'c']})
+    assert frame_text(frame).tolist() == ['a\nb', '\nc']
+    with pytest.raises(ValueError, match="'subject', 'body' or 'text'"):
+        frame_text(pd.DataFrame({'word_count': [1]}))
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_stream_features_in_order(corpus, n_workers):
+    batches = list(stream_features(corpus, chunk_size=2, n_workers=n_workers))
+    features = pd.concat(batches, ignore_index=True)
+    assert len(features) == 7
+    assert features['source'].iloc[0].endswith('a.eml') and features['source'].iloc[-1].endswith('labelled.csv:1')
+    assert features['is_spam'].iloc[-2:].tolist() == [0, 1]
+    spam = features.iloc[1]
+    # win, cash, claim, free, prize and one run of '$'
+    assert spam['money_words'] == 6 and spam['exclamations'] == 2
@@ -0,0 +1,57 @@
+# test_lexicon_matcher.py
+# Aho-Corasick lexicon counts agree with the word-boundary regexes they replaced
+import re
+import numpy as np
+import pytest
+from lexicon_matcher import LexiconMatcher, read_lexicon, DEFAULT_LEXICON
+
+
+def regex_count(phrases, text):
+    """What the regex extractor counted: whole-word phrases, '$' runs once"""
+    total = 0
+    for phrase in phrases:
+        if phrase == '$':
+            total += len(re.findall(r'\$+', text))
+        else:
+            total += len(re.findall(r'\b' + re.escape(phrase) + r'\b', text, re.IGNORECASE))
+    return total
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('FREE money', 2),
+    ('freedom and cashew', 0),         # no partial words
+    ('Win! win, WIN.', 3),
+    ('$$$ cash', 2),                   # a run of '$' counts once
+    ('$5 and $10 and $', 3),
+    ('prices, price', 2),              # overlapping phrases both count
+    ('', 0),
+])
+def test_money_words(text, expected):
+    matcher = LexiconMatcher.from_file()
+    assert matcher.count(text)[matcher.categories.index('money_words')] == expected
+
+
+def test_phrases_and_categories():
+    matcher = LexiconMatcher({'urgency': ['act now', "don't miss"], 'spam': ['click here', '100% free']})
+    assert matcher.count("ACT NOW and click here! Don't miss 100% FREE") == [2, 2]
+    assert matcher.count('react nowhere') == [0, 0]
+    assert matcher.count_many(['act now', 'click here', 'nothing']).tolist() == [[1, 0], [0, 1], [0, 0]]
+    assert matcher.count_many([]).shape == (0, 2)
+
+
+def test_symbol_runs():
+    """Touching or overlapping hits of an all-symbol phrase are one run"""
+    matcher = LexiconMatcher({'bangs': ['!!']})
+    assert [matcher.count(t)[0] for t in ('!', '!!', '!!!', '!!!!', 'a!! b!!')] == [0, 1, 1, 1, 2]
+
+
+def test_matches_regex_counts_on_generated_text():
+    lexicon = read_lexicon(DEFAULT_LEXICON)
+    matcher = LexiconMatcher(lexicon)
+    rng = np.random.default_rng(0)
+    vocabulary = [p for phrases in lexicon.values() for p in phrases] + [
+        'hello', 'meeting', 'Cash', 'FREE', 'freebie', '$$', 'deal!', 'win-win', 'report']
+    for _ in range(300):
+        text = ' '.join(rng.choice(vocabulary, int(rng.integers(0, 30))))
+        expected = [regex_count(lexicon[category], text) for category in matcher.categories]
+        assert matcher.count(text) == expected, text
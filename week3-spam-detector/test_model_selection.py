@@ -0,0 +1,57 @@
+# test_model_selection.py
+# Cross-validation splits, caching, the parallel pool and SpamDetector.select_model
+import numpy as np
+import pandas as pd
+from sklearn.tree import DecisionTreeClassifier
+from sample_data import trained_detector
+from model_selection import CANDIDATES, DATA, cross_validate, fold_masks, load_cached, summarize
+
+SMALL = {name: CANDIDATES[name] for name in ('tree (max_depth=2)', 'tree (max_depth=3)', 'logistic regression')}
+
+
+def test_fold_masks_are_stratified_partitions():
+    y = np.array([0] * 30 + [1] * 20)
+    test = fold_masks(y, folds=5, repeats=3)
+    assert test.shape == (15, 50)
+    for repeat in test.reshape(3, 5, 50):
+        assert np.array_equal(repeat.sum(axis=0), np.ones(50))   # every row tested once per repeat
+    assert np.all(test[:, y == 1].sum(axis=1) == 4)
+
+
+def test_load_cached_round_trip(tmp_path):
+    X, y, test, cached = load_cached(DATA, folds=4, repeats=2, cache_dir=tmp_path)
+    assert not cached and test.shape == (8, len(y))
+    X2, y2, test2, cached = load_cached(DATA, folds=4, repeats=2, cache_dir=tmp_path)
+    assert cached
+    assert np.array_equal(X, X2) and np.array_equal(y, y2) and np.array_equal(test, test2)
+
+
+def test_pool_matches_inline_run():
+    """Process-pool and single-process runs give the same scores in the same order"""
+    X, y = np.random.default_rng(0).normal(size=(80, 4)), np.repeat([0, 1], 40)
+    test = fold_masks(y, folds=4, repeats=2)
+    inline = cross_validate(X, y, test, SMALL, n_workers=1)
+    pooled = cross_validate(X, y, test, SMALL, n_workers=2)
+    columns = ['candidate', 'split', 'accuracy', 'precision', 'recall']
+    pd.testing.assert_frame_equal(inline[columns], pooled[columns])
+
+
+def test_summary_breaks_ties_by_std_then_order():
+    results = pd.DataFrame({
+        'candidate': ['simple', 'simple', 'steady', 'steady', 'complex', 'complex'],
+        'split': [0, 1] * 3,
+        'accuracy': [0.8, 1.0, 0.9, 0.9, 0.8, 1.0],
+        'precision': 1.0, 'recall': 1.0, 'fit_ms': 1.0, 'predict_ms': 1.0,
+    })
+    assert summarize(results).index.tolist() == ['steady', 'simple', 'complex']
+
+
+def test_select_model_keep_best():
+    detector = trained_detector()
+    summary = detector.select_model(folds=3, repeats=2, n_workers=1, keep_best=True)
+    assert summary.index[0] in CANDIDATES and len(summary) == len(CANDIDATES)
+    assert not detector.is_trained
+    assert type(detector.model) is type(CANDIDATES[summary.index[0]])
+    if isinstance(detector.model, DecisionTreeClassifier):
+        detector.train()
+        assert detector.compile_tree().n_features == 4
@@ -0,0 +1,59 @@
+# test_online_detector.py
+# The online model learns from mini-batches and survives a snapshot round trip
+import numpy as np
+import pandas as pd
+import pytest
+from email_features import EmailFeatureExtractor
+from online_detector import OnlineSpamDetector
+
+SPAM = ['WIN FREE CASH now!!', 'Claim your prize $$$', 'Cheap loan offer, act now!', 'You won a FREE bonus!!!']
+HAM = ['Meeting moved to 3pm', 'Notes from the design review', 'Lunch on Friday?', 'Draft report attached']
+
+
+def labelled(n, seed=0):
+    """n labelled emails (text, features, is_spam) drawn from the templates"""
+    rng = np.random.default_rng(seed)
+    is_spam = rng.integers(0, 2, n)
+    texts = [rng.choice(SPAM if s else HAM) + f' ref {i}' for i, s in enumerate(is_spam)]
+    frame = EmailFeatureExtractor().extract(texts)
+    frame['text'] = texts
+    frame['is_spam'] = is_spam
+    return frame
+
+
+@pytest.mark.parametrize('model', ['sgd', 'nb'])
+def test_learns_from_batches(model):
+    detector = OnlineSpamDetector(model, n_features=2**12)
+    for start in range(0, 400, 100):
+        detector.learn(labelled(400).iloc[start:start + 100])
+    assert (detector.n_seen, detector.n_batches) == (400, 4)
+    test = labelled(200, seed=1)
+    scored = detector.predict_batch(test)
+    assert (scored['prediction'] == test['is_spam']).mean() > 0.95
+    assert np.all((scored['spam_probability'] >= 0) & (scored['spam_probability'] <= 1))
+
+
+def test_untrained_raises():
+    with pytest.raises(RuntimeError, match='not trained'):
+        OnlineSpamDetector().predict_batch(labelled(5))
+
+
+def test_snapshots(tmp_path):
+    detector = OnlineSpamDetector(n_features=2**12, snapshot_dir=tmp_path, snapshot_every=2)
+    data = labelled(200)
+    for start in range(0, 200, 50):
+        detector.learn(data.iloc[start:start + 50])
+    snapshots = sorted(tmp_path.glob('*.pkl'))
+    assert [p.name for p in snapshots] == ['online_sgd_000000100.pkl', 'online_sgd_000000200.pkl']
+    restored = OnlineSpamDetector.load(snapshots[-1])
+    assert np.array_equal(restored.predict_batch(data), detector.predict_batch(data))
+
+
+def test_fit_stream_scores_before_learning(tmp_path):
+    path = tmp_path / 'labelled.csv'
+    data = labelled(300)
+    pd.DataFrame({'text': data['text'], 'is_spam': data['is_spam']}).to_csv(path, index=False)
+    history = OnlineSpamDetector(n_features=2**12).fit_stream([path], chunk_size=100)
+    assert history['emails_seen'].tolist() == [100, 200, 300]
+    assert np.isnan(history['accuracy'].iloc[0])
+    assert history['accuracy'].iloc[-1] > 0.9
@@ -0,0 +1,48 @@
+# test_spam_detector.py
+# SpamDetector.predict_batch scores like the model it wraps
+import numpy as np
+import pandas as pd
+import pytest
+from sample_data import synthetic_features, trained_detector
+from spam_detector import SpamDetector
+
+
+def test_predict_batch_matches_model():
+    detector = trained_detector()
+    X = synthetic_features(10_000)
+    frame = pd.DataFrame(X, columns=detector.feature_columns)
+    scored = detector.predict_batch(X, chunk_size=999)
+    assert scored.dtype.names == ('prediction', 'spam_probability')
+    assert np.array_equal(scored['prediction'], detector.model.predict(frame))
+    assert np.array_equal(scored['spam_probability'], detector.model.predict_proba(frame)[:, 1])
+    # Same result from a DataFrame with shuffled columns
+    assert np.array_equal(detector.predict_batch(frame[frame.columns[::-1]]), scored)
+
+
+def test_predict_batch_single_row_and_empty():
+    detector = trained_detector()
+    assert len(detector.predict_batch([120, 0, 0, 0])) == 1
+    assert len(detector.predict_batch(np.empty((0, 4)))) == 0
+
+
+@pytest.mark.parametrize('shape', [(4, 5), (5, 3), (20,), (2, 2, 4)])
+def test_predict_batch_rejects_wrong_width(shape):
+    """Rows that are not 4 features wide are refused, not reshaped into other rows"""
+    detector = trained_detector()
+    with pytest.raises(ValueError, match='Expected rows of 4 features'):
+        detector.predict_batch(np.ones(shape))
+
+
+def test_model_without_spam_class():
+    """Trained on normal mail only, every email is normal with spam probability 0"""
+    detector = trained_detector()
+    ham = detector.y_train == 0
+    detector.model.fit(detector.X_train[ham], detector.y_train[ham])
+    scored = detector.predict_batch(synthetic_features(100))
+    assert np.all(scored['prediction'] == 0)
+    assert np.all(scored['spam_probability'] == 0)
+
+
+def test_untrained_detector_raises():
+    with pytest.raises(RuntimeError, match='not trained'):
+        SpamDetector().predict_batch([[100, 0, 0, 0]])
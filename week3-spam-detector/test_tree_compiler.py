@@ -0,0 +1,60 @@
+# test_tree_compiler.py
+# The compiled tree scores like the fitted DecisionTreeClassifier
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+from sample_data import synthetic_features, trained_detector
+from tree_compiler import CompiledTree, check_equivalence
+
+
+def random_tree(max_depth=None):
+    """3-class tree on random data, deeper than the detector's"""
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(5_000, 6))
+    y = (X[:, 0] + X[:, 1] * X[:, 2] > 0).astype(int) + (X[:, 3] > 1)
+    return DecisionTreeClassifier(max_depth=max_depth, random_state=0).fit(X, y)
+
+
+def test_detector_tree_matches_sklearn():
+    detector = trained_detector()
+    compiled = detector.compile_tree()
+    assert compiled.feature_names == detector.feature_columns
+    X = synthetic_features(20_000)
+    assert np.array_equal(compiled.predict(X), detector.predict_batch(X)['prediction'])
+    np.testing.assert_allclose(compiled.predict_proba(X)[:, 1],
+                               detector.predict_batch(X)['spam_probability'], rtol=1e-12)
+    assert check_equivalence(detector.model, n=50_000) == (True, True)
+
+
+@pytest.mark.parametrize('max_depth', [8, None])
+def test_multiclass_trees_match_sklearn(max_depth):
+    """Labels exactly, probabilities within a tight tolerance, thresholds included"""
+    assert check_equivalence(random_tree(max_depth), n=50_000) == (True, True)
+
+
+def test_generated_python_and_save_round_trip(tmp_path):
+    compiled = CompiledTree.from_model(random_tree(max_depth=4))
+    score = compiled.compile_python(class_index=2)
+    X = np.round(np.abs(synthetic_features(500)[:, :4]))
+    X = np.column_stack([X, X[:, :2]])
+    assert np.allclose([score(*row) for row in X.tolist()], compiled.predict_proba(X)[:, 2])
+
+    path = tmp_path / 'tree.npz'
+    compiled.save(path)
+    restored = CompiledTree.load(path)
+    assert (restored.depth, restored.n_features) == (compiled.depth, 6)
+    assert np.array_equal(restored.predict_proba(X), compiled.predict_proba(X))
+
+
+@pytest.mark.parametrize('width', [5, 7])
+def test_wrong_width_raises(width):
+    compiled = CompiledTree.from_model(random_tree(max_depth=4))
+    with pytest.raises(ValueError, match=r'\(n, 6\)'):
+        compiled.predict(np.zeros((10, width)))
+
+
+def test_only_trees_compile():
+    model = LogisticRegression().fit([[0.0], [1.0]], [0, 1])
+    with pytest.raises(TypeError, match='LogisticRegression'):
+        CompiledTree.from_model(model)
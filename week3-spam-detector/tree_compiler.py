@@ -0,0 +1,160 @@
+# tree_compiler.py
+# Compile a fitted decision tree into flat NumPy arrays (and optionally straight-line Python)
+import numpy as np
+
+
+class CompiledTree:
+    """
+    A fitted DecisionTreeClassifier as flat arrays: per node the split
+    feature and threshold, the two children and the leaf's class
+    probabilities. Leaves point to themselves, so scoring is max_depth
+    rounds of gather-compare-gather over a whole batch with no per-row
+    branches; a width check stands in for sklearn's input validation
+    Inputs are rounded to float32 first, as sklearn does, so every row
+    reaches the same leaf as in the model; leaf probabilities can differ
+    from model.predict_proba in the last bit (see check_equivalence)
+    The gain is on shallow trees like the detector's: at max_depth around 8
+    the gather rounds cost as much or more than sklearn's own predict
+    """
+
+    def __init__(self, feature, threshold, children, probability, classes, feature_names=None,
+                 n_features=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.probability = probability
+        self.classes = classes
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        if n_features is None:
+            n_features = len(self.feature_names) if self.feature_names else int(feature.max()) + 1
+        self.n_features = n_features
+        self.depth = self._depth()
+        self.labels = classes[probability.argmax(axis=1)]
+
+    @classmethod
+    def from_model(cls, model, feature_names=None):
+        """Compile a fitted binary or multiclass DecisionTreeClassifier"""
+        if not hasattr(model, 'tree_'):
+            raise TypeError(f"Only a single fitted decision tree can be compiled, "
+                            f"not {type(model).__name__}")
+        tree = model.tree_
+        leaf = tree.children_left < 0
+        nodes = np.arange(tree.node_count)
+        children = np.column_stack([np.where(leaf, nodes, tree.children_left),
+                                    np.where(leaf, nodes, tree.children_right)]).astype(np.intp)
+        # Normalized leaf counts, as predict_proba computes them
+        value = tree.value[:, 0, :].astype(np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        if feature_names is None and hasattr(model, 'feature_names_in_'):
+            feature_names = model.feature_names_in_
+        return cls(np.where(leaf, 0, tree.feature).astype(np.intp),
+                   np.where(leaf, np.inf, tree.threshold).astype(np.float64),
+                   children, value / normalizer, np.asarray(model.classes_), feature_names,
+                   model.n_features_in_)
+
+    def _depth(self):
+        depth, frontier = 0, np.array([0])
+        while True:
+            nxt = self.children[frontier].ravel()
+            nxt = nxt[nxt != np.repeat(frontier, 2)]
+            if not len(nxt):
+                return depth
+            depth, frontier = depth + 1, nxt
+
+    def leaves(self, X, chunk_size=8192):
+        """Leaf index reached by every row of an (n, features) array or DataFrame"""
+        if hasattr(X, 'columns') and self.feature_names is not None:
+            X = X[self.feature_names]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        # Rows are read from the flattened chunk, so a wrong width would read other rows
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected an (n, {self.n_features}) array of features, got shape {X.shape}")
+        n_columns = self.n_features
+        children = self.children.ravel()
+        out = np.empty(len(X), dtype=np.intp)
+        # Chunks small enough that the working arrays stay in cache
+        for start in range(0, len(X), chunk_size):
+            chunk = X[start:start + chunk_size].ravel()
+            row = np.arange(0, len(chunk), n_columns)
+            node = np.zeros(len(row), dtype=np.intp)
+            for _ in range(self.depth):
+                node = children[2 * node + (chunk[row + self.feature[node]] > self.threshold[node])]
+            out[start:start + chunk_size] = node
+        return out
+
+    def predict_proba(self, X, chunk_size=8192):
+        return self.probability[self.leaves(X, chunk_size)]
+
+    def predict(self, X, chunk_size=8192):
+        return self.labels[self.leaves(X, chunk_size)]
+
+    def to_python(self, name='spam_probability', class_index=-1):
+        """
+        Source of a function of one email's features returning one class's
+        probability (by default the last class, spam) as nested conditional
+        expressions: no loops, lookups or NumPy. It compares inputs as
+        given, which matches the arrays for whole-number counts below 2**24
+        """
+        names = self.feature_names or [f'x{i}' for i in range(self.n_features)]
+        args = [n if n.isidentifier() else f'x{i}' for i, n in enumerate(names)]
+
+        def expression(node, indent):
+            if self.children[node, 0] == node:
+                return repr(float(self.probability[node, class_index]))
+            pad = ' ' * indent
+            return (f"(\n{pad}    {expression(self.children[node, 0], indent + 4)}\n"
+                    f"{pad}    if {args[self.feature[node]]} <= {float(self.threshold[node])!r} else\n"
+                    f"{pad}    {expression(self.children[node, 1], indent + 4)}\n{pad})")
+
+        return f"def {name}({', '.join(args)}):\n    return {expression(0, 4)}\n"
+
+    def compile_python(self, name='spam_probability', class_index=-1):
+        """The to_python function, ready to call"""
+        namespace = {}
+        exec(compile(self.to_python(name, class_index), f'<compiled tree {name}>', 'exec'), namespace)
+        return namespace[name]
+
+    def save(self, path):
+        """Write the arrays to an .npz file (no sklearn needed to load it)"""
+        np.savez(path, feature=self.feature, threshold=self.threshold, children=self.children,
+                 probability=self.probability, classes=self.classes, n_features=self.n_features,
+                 feature_names=np.array(self.feature_names or [], dtype=str))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            names = arrays['feature_names'].tolist() or None
+            n_features = int(arrays['n_features']) if 'n_features' in arrays else None
+            return cls(arrays['feature'], arrays['threshold'], arrays['children'],
+                       arrays['probability'], arrays['classes'], names, n_features)
+
+
+def check_equivalence(model, n=1_000_000, seed=0, rtol=1e-12):
+    """
+    Compare a compiled tree with model.predict_proba / predict on random
+    inputs, a third of them sitting exactly on or next to split thresholds
+    Labels must match exactly; probabilities to within rtol, since leaf
+    normalization can round differently from sklearn's by one ULP
+    Returns (arrays match, generated Python matches on integer inputs)
+    """
+    import pandas as pd
+    compiled = CompiledTree.from_model(model)
+    rng = np.random.default_rng(seed)
+    n_features = model.n_features_in_
+    X = rng.uniform(-1, 2, (n, n_features)) * np.maximum(np.abs(model.tree_.threshold).max(), 1)
+    splits = model.tree_.children_left >= 0
+    if splits.any():
+        node = rng.choice(np.flatnonzero(splits), n // 3)
+        edge = model.tree_.threshold[node] + rng.choice([-1e-7, 0, 1e-7], n // 3)
+        X[np.arange(n // 3), model.tree_.feature[node]] = edge
+    frame = pd.DataFrame(X, columns=compiled.feature_names) if compiled.feature_names else X
+    arrays_match = (np.allclose(compiled.predict_proba(X), model.predict_proba(frame), rtol=rtol, atol=0)
+                    and np.array_equal(compiled.predict(X), model.predict(frame)))
+
+    counts = np.round(np.abs(X[:min(n, 20_000)]))
+    score = compiled.compile_python()
+    frame = pd.DataFrame(counts, columns=compiled.feature_names) if compiled.feature_names else counts
+    python_match = np.allclose([score(*row) for row in counts.tolist()],
+                               model.predict_proba(frame)[:, -1], rtol=rtol, atol=0)
+    return arrays_match, python_match
@@ -1 +0,0 @@
-# week7_ai_volume_forecaster package